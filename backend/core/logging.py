@@ -1,18 +0,0 @@
-from functools import wraps
-import logging
-
-
-def log_function_call(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        logger = logging.getLogger(func.__module__)
-        logger.info(f"Calling {func.__name__}")
-        try:
-            result = func(*args, **kwargs)
-            logger.info(f"Completed {func.__name__}")
-            return result
-        except Exception as e:
-            logger.error(f"Error in {func.__name__}: {str(e)}")
-            raise
-
-    return wrapper
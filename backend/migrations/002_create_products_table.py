@@ -0,0 +1,23 @@
+from yoyo import step
+
+__depends__ = {}
+
+steps = [
+    step(
+        """
+        CREATE TABLE IF NOT EXISTS products (
+            id BIGSERIAL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            price NUMERIC(12, 2) NOT NULL CHECK (price >= 0),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_products_updated_at ON products(updated_at);
+    """,
+        """
+        DROP TABLE IF EXISTS products;
+    """,
+    )
+]
@@ -0,0 +1,27 @@
+from yoyo import step
+
+__depends__ = {"002_create_products_table"}
+
+steps = [
+    step(
+        """
+        ALTER TABLE products
+            ADD COLUMN IF NOT EXISTS stock INTEGER NOT NULL DEFAULT 0
+            CHECK (stock >= 0);
+
+        CREATE OR REPLACE FUNCTION adjust_product_stock(p_product_id BIGINT, p_delta INTEGER)
+        RETURNS INTEGER
+        LANGUAGE sql
+        AS $$
+            UPDATE products
+            SET stock = stock + p_delta, updated_at = now()
+            WHERE id = p_product_id AND stock + p_delta >= 0
+            RETURNING stock;
+        $$;
+    """,
+        """
+        DROP FUNCTION IF EXISTS adjust_product_stock(BIGINT, INTEGER);
+        ALTER TABLE products DROP COLUMN IF EXISTS stock;
+    """,
+    )
+]
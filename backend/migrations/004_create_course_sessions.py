@@ -0,0 +1,31 @@
+from yoyo import step
+
+__depends__ = {}
+
+steps = [
+    step(
+        """
+        CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+        CREATE TABLE IF NOT EXISTS course_sessions (
+            id BIGSERIAL PRIMARY KEY,
+            course_id BIGINT NOT NULL,
+            instructor_id BIGINT NOT NULL,
+            starts_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            ends_at TIMESTAMP WITH TIME ZONE NOT NULL CHECK (ends_at > starts_at),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT course_sessions_no_overlap EXCLUDE USING gist (
+                instructor_id WITH =,
+                tstzrange(starts_at, ends_at) WITH &&
+            )
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_course_sessions_updated_at
+            ON course_sessions(updated_at);
+    """,
+        """
+        DROP TABLE IF EXISTS course_sessions;
+    """,
+    )
+]
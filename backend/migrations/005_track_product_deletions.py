@@ -0,0 +1,37 @@
+from yoyo import step
+
+__depends__ = {"002_create_products_table"}
+
+steps = [
+    step(
+        """
+        CREATE TABLE IF NOT EXISTS product_deletions (
+            id BIGINT PRIMARY KEY,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_product_deletions_updated_at
+            ON product_deletions(updated_at);
+
+        CREATE OR REPLACE FUNCTION record_product_deletion()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            INSERT INTO product_deletions (id) VALUES (OLD.id)
+            ON CONFLICT (id) DO UPDATE SET updated_at = now();
+            RETURN OLD;
+        END;
+        $$;
+
+        CREATE TRIGGER products_record_deletion
+            AFTER DELETE ON products
+            FOR EACH ROW EXECUTE FUNCTION record_product_deletion();
+    """,
+        """
+        DROP TRIGGER IF EXISTS products_record_deletion ON products;
+        DROP FUNCTION IF EXISTS record_product_deletion();
+        DROP TABLE IF EXISTS product_deletions;
+    """,
+    )
+]
@@ -0,0 +1,227 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import orjson
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, validator
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp, Message, Scope
+
+from app.core.apps import AppRegistry
+from app.core.auth import authenticated_session, get_current_session
+from app.core.concurrency import EXEMPT, concurrency_limiter, route_priorities
+from app.core.config import settings
+from app.core.deadlines import Deadline, current_deadline, remaining
+from app.core.logger import get_logger
+from app.middleware.app_context import resolve_app_id
+from app.services.auth.sessions import SessionEntry
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+BATCH_PATH = "/api/batch"
+METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+# Outer headers sub-requests do not inherit; they describe the batch itself
+BATCH_ONLY_HEADERS = {b"content-length", b"content-type", b"idempotency-key"}
+# Sub-requests always act as the batch's caller
+AUTH_HEADERS = {"authorization", "x-session-id"}
+# Scope keys describing the connection, shared by every sub-request
+CONNECTION_KEYS = ("asgi", "http_version", "scheme", "server", "client", "app")
+
+
+class BatchItem(BaseModel):
+    method: str = "GET"
+    path: str = Field(..., description="Path and query, e.g. /api/app1/products?q=x")
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+    @validator("method")
+    def check_method(cls, method: str) -> str:
+        method = method.upper()
+        if method not in METHODS:
+            raise ValueError(f"Unsupported method {method}")
+        return method
+
+    @validator("path")
+    def check_path(cls, path: str) -> str:
+        if not path.startswith("/") or path.startswith("//"):
+            raise ValueError("Path must be absolute, e.g. /api/app1/products")
+        if urlsplit(path).path.rstrip("/") == BATCH_PATH:
+            raise ValueError("Batches cannot be nested")
+        return path
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., min_items=1)
+
+    @validator("requests")
+    def check_size(cls, requests: List[BatchItem]) -> List[BatchItem]:
+        if len(requests) > settings.BATCH_MAX_REQUESTS:
+            raise ValueError(f"At most {settings.BATCH_MAX_REQUESTS} requests")
+        return requests
+
+
+class UnbatchableResponse(Exception):
+    """Raised when a sub-request starts a streaming response"""
+
+
+class _Collector:
+    """ASGI receive/send pair buffering one sub-request's response"""
+
+    __slots__ = ("body", "status", "headers", "chunks", "_sent_body")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.status = 500
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.chunks: List[bytes] = []
+        self._sent_body = False
+
+    async def receive(self) -> Message:
+        if not self._sent_body:
+            self._sent_body = True
+            return {"type": "http.request", "body": self.body, "more_body": False}
+        # Like an open connection: nothing more until the request is done
+        await asyncio.get_running_loop().create_future()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.headers = list(message.get("headers", []))
+            for name, value in self.headers:
+                if name.lower() == b"content-type" and value.startswith(
+                    b"text/event-stream"
+                ):
+                    raise UnbatchableResponse("Streaming responses cannot be batched")
+        elif message["type"] == "http.response.body":
+            self.chunks.append(message.get("body", b""))
+
+    def result(self) -> Dict[str, Any]:
+        headers = {}
+        content_type = b""
+        for name, value in self.headers:
+            name = name.lower()
+            if name == b"content-length":
+                continue
+            if name == b"content-type":
+                content_type = value
+            headers[name.decode("latin-1")] = value.decode("latin-1")
+        body = b"".join(self.chunks)
+        if not body:
+            content: Any = None
+        elif content_type.startswith(b"application/json"):
+            content = orjson.Fragment(body)  # Spliced in as-is, not re-encoded
+        else:
+            content = body.decode("utf-8", "replace")
+        return {"status": self.status, "headers": headers, "body": content}
+
+
+def _error(status: int, detail: str) -> Dict[str, Any]:
+    return {
+        "status": status,
+        "headers": {"content-type": "application/json"},
+        "body": {"detail": detail},
+    }
+
+
+def _overloaded() -> Dict[str, Any]:
+    response = _error(503, "Server is overloaded, retry later")
+    response["headers"]["retry-after"] = str(concurrency_limiter.retry_after())
+    return response
+
+
+def _scope(outer: Scope, item: BatchItem, body: bytes) -> Scope:
+    url = urlsplit(item.path)
+    overrides = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in item.headers.items()
+        if name.lower() not in AUTH_HEADERS
+    ]
+    replaced = BATCH_ONLY_HEADERS.union(name for name, _ in overrides)
+    headers = [header for header in outer["headers"] if header[0] not in replaced]
+    headers.extend(overrides)
+    if item.body is not None:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+    scope = {key: outer[key] for key in CONNECTION_KEYS if key in outer}
+    scope.update(
+        type="http",
+        method=item.method,
+        root_path="",
+        path=unquote(url.path),
+        raw_path=url.path.encode(),
+        query_string=url.query.encode(),
+        headers=headers,
+    )
+    return scope
+
+
+async def _run(
+    app: ASGIApp, outer: Scope, item: BatchItem, limit: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Dispatch one sub-request in its own context and buffer its response"""
+    body = b"" if item.body is None else orjson.dumps(item.body)
+    scope = _scope(outer, item, body)
+    host = next((v for k, v in scope["headers"] if k == b"host"), b"")
+    AppRegistry.set_current_app(resolve_app_id(scope["path"], host.decode()))
+    # Routes may shorten their own budget, never extend the batch's
+    left = remaining()
+    current_deadline.set(Deadline(left, requested=left))
+
+    collector = _Collector(body)
+    # Admitted like a direct request to the same route
+    priority = route_priorities.classify(item.method, scope["path"])
+    async with limit:
+        if priority != EXEMPT and not await concurrency_limiter.acquire(priority):
+            return _overloaded()
+        started = time.perf_counter()
+        try:
+            async with AsyncExitStack() as stack:
+                scope["fastapi_astack"] = stack
+                await app(scope, collector.receive, collector.send)
+        except UnbatchableResponse as e:
+            return _error(400, str(e))
+        except Exception:
+            logger.exception(f"Batched request failed: {item.method} {item.path}")
+            return _error(500, "Internal Server Error")
+        finally:
+            if priority != EXEMPT:
+                concurrency_limiter.release(time.perf_counter() - started)
+    return collector.result()
+
+
+@router.post("/batch")
+async def batch(
+    payload: BatchRequest,
+    request: Request,
+    session: SessionEntry = Depends(get_current_session),
+):
+    """Run several API requests concurrently in one round trip
+
+    The batch is authenticated once and each sub-request acts as the same
+    caller. Sub-requests skip the HTTP middleware and go straight to the
+    routes, but each is admitted through the concurrency limiter at its
+    route's priority, so shed sub-requests answer 503 on their own; results
+    come back in request order, each with its own status.
+    """
+    # Same exception handling the app applies outside its middleware stack
+    app = ExceptionMiddleware(
+        request.app.router, handlers=request.app.exception_handlers
+    )
+    limit = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    token = authenticated_session.set(session)
+    try:
+        responses = await asyncio.gather(
+            *(_run(app, request.scope, item, limit) for item in payload.requests)
+        )
+    finally:
+        authenticated_session.reset(token)
+    return Response(
+        orjson.dumps({"responses": responses}), media_type="application/json"
+    )
@@ -1,20 +1,175 @@
+import argparse
+import gzip
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
+from app.core.apps import AppRegistry
 from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
 
+FULL = "openapi"
 
-def custom_openapi(app):
-    if app.openapi_schema:
+
+def custom_openapi(app: FastAPI, prefix: str = "") -> Dict[str, Any]:
+    """Schema for every route, or only those under ``prefix``"""
+    if app.openapi_schema and not prefix:
         return app.openapi_schema
 
+    routes = [
+        route
+        for route in app.routes
+        if not prefix or getattr(route, "path", "").startswith(prefix)
+    ]
     openapi_schema = get_openapi(
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
         description=settings.DESCRIPTION,
-        routes=app.routes,
+        routes=routes,
     )
 
     # Custom documentation settings
     openapi_schema["info"]["x-logo"] = {"url": "https://your-domain.com/logo.png"}
 
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
+    if not prefix:
+        app.openapi_schema = openapi_schema
+    return openapi_schema
+
+
+class OpenAPIDocument:
+    """Serialized schema with its gzip encoding and ETag, computed once"""
+
+    __slots__ = ("body", "gzipped", "etag")
+
+    def __init__(self, body: bytes, gzipped: Optional[bytes] = None):
+        self.body = body
+        self.gzipped = gzipped or gzip.compress(body, compresslevel=9, mtime=0)
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    @classmethod
+    def from_schema(cls, schema: Dict[str, Any]) -> "OpenAPIDocument":
+        # Sorted keys keep the bytes, and so the ETag, stable across workers
+        return cls(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS))
+
+    def response(self, request: Request) -> Response:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if self.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            body = self.gzipped
+        else:
+            body = self.body
+        return Response(body, media_type="application/json", headers=headers)
+
+
+class OpenAPICache:
+    """OpenAPI documents per app, built on first use or loaded from disk
+
+    ``prebuilt_dir`` holds files written by ``write`` at build time; when a
+    document is found there the worker never generates it.
+    """
+
+    def __init__(self, app: FastAPI, prebuilt_dir: Optional[str] = None):
+        self.app = app
+        self.prebuilt_dir = Path(prebuilt_dir) if prebuilt_dir else None
+        self._documents: Dict[str, OpenAPIDocument] = {}
+
+    def _prefix(self, name: str) -> str:
+        if name == FULL:
+            return ""
+        if AppRegistry.get_app(name) is None:
+            raise KeyError(name)
+        return f"/api/{name}"
+
+    def _load(self, name: str) -> Optional[OpenAPIDocument]:
+        if self.prebuilt_dir is None:
+            return None
+        path = self.prebuilt_dir / f"{name}.json"
+        if not path.exists():
+            return None
+        gz_path = path.with_name(path.name + ".gz")
+        gzipped = gz_path.read_bytes() if gz_path.exists() else None
+        return OpenAPIDocument(path.read_bytes(), gzipped)
+
+    def get(self, name: str = FULL) -> OpenAPIDocument:
+        document = self._documents.get(name)
+        if document is None:
+            document = self._load(name)
+            if document is None:
+                schema = custom_openapi(self.app, self._prefix(name))
+                document = OpenAPIDocument.from_schema(schema)
+            self._documents[name] = document
+        return document
+
+    def names(self) -> List[str]:
+        return [FULL, *(config.id for config in AppRegistry.list_apps())]
+
+    def write(self, directory: str) -> None:
+        """Emit every document (plain and gzipped) for serving as-is"""
+        out = Path(directory)
+        out.mkdir(parents=True, exist_ok=True)
+        for name in self.names():
+            document = self.get(name)
+            (out / f"{name}.json").write_bytes(document.body)
+            (out / f"{name}.json.gz").write_bytes(document.gzipped)
+            logger.info(f"Wrote {name}.json ({len(document.body)} bytes)")
+
+
+def install_openapi(
+    app: FastAPI, prebuilt_dir: Optional[str] = None
+) -> OpenAPICache:
+    """Serve schema and docs from an ``OpenAPICache`` instead of FastAPI's
+
+    The app must be created with ``openapi_url=None`` (and no docs URLs) so
+    FastAPI does not register its own per-request-encoding routes.
+    """
+    cache = OpenAPICache(app, prebuilt_dir)
+    app.openapi = lambda: custom_openapi(app)
+    app.state.openapi = cache
+
+    @app.get("/openapi.json", include_in_schema=False)
+    async def openapi_json(request: Request) -> Response:
+        return cache.get().response(request)
+
+    @app.get("/openapi/{app_id}.json", include_in_schema=False)
+    async def app_openapi_json(app_id: str, request: Request) -> Response:
+        try:
+            document = cache.get(app_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Application not found")
+        return document.response(request)
+
+    @app.get("/docs", include_in_schema=False)
+    async def swagger_ui():
+        return get_swagger_ui_html(
+            openapi_url="/openapi.json", title=f"{settings.PROJECT_NAME} - Docs"
+        )
+
+    @app.get("/redoc", include_in_schema=False)
+    async def redoc():
+        return get_redoc_html(
+            openapi_url="/openapi.json", title=f"{settings.PROJECT_NAME} - ReDoc"
+        )
+
+    return cache
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the OpenAPI documents")
+    parser.add_argument("--out", default="build/openapi", help="Output directory")
+    args = parser.parse_args()
+
+    from app.main import app as main_app
+
+    main_app.state.openapi.write(args.out)
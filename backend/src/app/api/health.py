@@ -0,0 +1,48 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from app.core.concurrency import concurrency_limiter
+from app.core.config import settings
+from app.core.container import Container
+from app.core.deps import get_container
+from app.core.instrumentation import SpanRegistry
+from app.db.stats import QueryRegistry
+
+router = APIRouter()
+
+
+def debug_only() -> None:
+    """Hide per-worker internals unless DEBUG is switched on"""
+    if not settings.DEBUG:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/live")
+async def live():
+    """Process is up and serving the event loop"""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def ready(container: Container = Depends(get_container)):
+    """Cached readiness of backing services, refreshed by the prober"""
+    status = container.health.status()
+    return JSONResponse(status, status_code=200 if container.health.ready else 503)
+
+
+@router.get("/queries", dependencies=[Depends(debug_only)])
+async def query_stats(limit: Optional[int] = Query(None, ge=1)):
+    """Per-query call counts and latency for this worker (debug only)"""
+    return {"queries": QueryRegistry.stats(limit)}
+
+
+@router.get("/spans", dependencies=[Depends(debug_only)])
+async def span_stats(limit: Optional[int] = Query(None, ge=1)):
+    """Per-function call counts and latency for this worker (debug only)"""
+    return {"spans": SpanRegistry.stats(limit)}
+
+
+@router.get("/concurrency", dependencies=[Depends(debug_only)])
+async def concurrency_stats():
+    """Adaptive concurrency limit and load shedding for this worker (debug only)"""
+    return concurrency_limiter.stats()
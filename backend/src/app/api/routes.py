@@ -1,9 +1,15 @@
 from fastapi import APIRouter
+from app.api.batch import router as batch_router
 from app.domains.auth.routes import router as auth_router
 from app.domains.dhg_baseline.routes import router as baseline_router
+from app.domains.dhg_baseline.app1.routes import router as app1_router
+from app.domains.app2.routes import router as app2_router
 
 api_router = APIRouter()
 
 # This will make routes available at /api/v1/auth/signin
 api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(baseline_router, prefix="/baseline", tags=["baseline"])
+api_router.include_router(app1_router, tags=["app1"])
+api_router.include_router(app2_router, tags=["app2"])
+api_router.include_router(batch_router, tags=["batch"])
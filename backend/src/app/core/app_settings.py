@@ -12,6 +12,9 @@ class AppSettings(BaseModel):
     max_users: int
     storage_limit: int
 
+    class Config:
+        frozen = True
+
 
 APP_SETTINGS: Dict[str, AppSettings] = {
     "app1": AppSettings(
@@ -1,3 +1,4 @@
+from contextvars import ContextVar
 from enum import Enum
 from typing import Dict, List, Optional
 from pydantic import BaseModel
@@ -21,10 +22,16 @@ class AppConfig(BaseModel):
 
 
 class AppRegistry:
-    """Registry for managing multiple applications"""
+    """Registry for managing multiple applications
+
+    The current app is tracked per request context, so concurrent requests
+    (or sub-requests of a batch) for different apps do not see each other's.
+    """
 
     _apps: Dict[str, AppConfig] = {}
-    _current_app: Optional[AppConfig] = None
+    _current_app: ContextVar[Optional[AppConfig]] = ContextVar(
+        "current_app", default=None
+    )
 
     @classmethod
     def register_app(cls, config: AppConfig) -> None:
@@ -34,16 +41,21 @@ class AppRegistry:
     def get_app(cls, app_id: str) -> Optional[AppConfig]:
         return cls._apps.get(app_id)
 
+    @classmethod
+    def list_apps(cls) -> List[AppConfig]:
+        return list(cls._apps.values())
+
     @classmethod
     def set_current_app(cls, app_id: str) -> None:
-        cls._current_app = cls.get_app(app_id)
+        cls._current_app.set(cls.get_app(app_id))
 
     @classmethod
     def get_current_app(cls) -> Optional[AppConfig]:
-        return cls._current_app
+        return cls._current_app.get()
 
     @classmethod
     def has_feature(cls, feature: AppFeature) -> bool:
-        if not cls._current_app:
+        app = cls._current_app.get()
+        if not app:
             return False
-        return feature in cls._current_app.features
+        return feature in app.features
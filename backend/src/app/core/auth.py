@@ -1,19 +1,71 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from fastapi import Depends, Header, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.core.deadlines import DeadlineExceeded, within_deadline
 from app.db.base import SupabaseDB
+from app.services.auth.sessions import SessionEntry, session_store, to_plain
 
-security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
+# Session already authenticated for this context, e.g. by a batch request
+# on behalf of its sub-requests
+authenticated_session: ContextVar[Optional[SessionEntry]] = ContextVar(
+    "authenticated_session", default=None
+)
 
-async def get_current_user(token: str = Depends(security)):
+
+def _unauthorized() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_current_session(
+    x_session_id: Optional[str] = Header(None),
+    token: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> SessionEntry:
+    """Resolve the caller's session from the server-side session store"""
+    entry = authenticated_session.get()
+    if entry is not None:
+        return entry
+    if x_session_id:
+        entry = await session_store.get(x_session_id)
+    elif token is not None:
+        entry = await session_store.get_by_token(token.credentials)
+    if entry is None:
+        raise _unauthorized()
+    return entry
+
+
+async def get_current_user(
+    x_session_id: Optional[str] = Header(None),
+    token: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> Dict[str, Any]:
+    """The caller's user as plain data, from their session or a Supabase token"""
+    entry = authenticated_session.get()
+    if entry is None and x_session_id:
+        entry = await session_store.get(x_session_id)
+    elif entry is None and token is not None:
+        # Tokens of server-side sessions resolve locally without a round trip
+        entry = await session_store.get_by_token(token.credentials)
+    if entry is not None:
+        return entry.user
+    if token is None:
+        raise _unauthorized()
     try:
         # Verify token with Supabase
         client = SupabaseDB.get_client()
-        user = client.auth.get_user(token.credentials)
-        return user
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+        response = await within_deadline(
+            asyncio.to_thread(client.auth.get_user, token.credentials)
         )
+    except DeadlineExceeded:
+        raise  # Answered with 504, not as a bad token
+    except Exception:
+        raise _unauthorized()
+    if response is None or response.user is None:
+        raise _unauthorized()
+    return to_plain(response.user)
@@ -7,7 +7,9 @@ T = TypeVar("T")
 class BaseService(Generic[T], metaclass=MixinMeta):
     """Base service class that supports mixin composition"""
 
-    def __init__(self, repository):
+    __slots__ = ("repository",)
+
+    def __init__(self, repository=None):
         self.repository = repository
 
     async def get(self, id: str) -> T:
@@ -0,0 +1,149 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # Redis tier is optional
+    aioredis = None
+
+logger = get_logger(__name__)
+
+
+class MemoryCache:
+    """Process-local LRU cache with per-key expiry"""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get_nowait(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at and expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set_nowait(self, key: str, value: Any, expire: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + expire if expire else 0.0
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete_nowait(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.get_nowait(key)
+
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> None:
+        self.set_nowait(key, value, expire)
+
+    async def delete(self, key: str) -> None:
+        self.delete_nowait(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCache:
+    """Two-tier cache: in-memory LRU in front of an optional shared Redis
+
+    Values written to Redis are JSON-encoded, so only JSON-compatible values
+    are shared between workers. Without ``REDIS_URL`` (or the ``redis``
+    package) the cache degrades to the local tier only.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        prefix: str = "dhg",
+        max_entries: int = 10_000,
+        local_ttl: int = 30,
+    ):
+        self.url = url if url is not None else settings.REDIS_URL
+        self.prefix = prefix
+        self.local_ttl = local_ttl
+        self.local = MemoryCache(max_entries=max_entries)
+        self._redis = None
+        if self.url and aioredis is not None:
+            self._redis = aioredis.from_url(self.url)
+        elif self.url:
+            logger.warning("REDIS_URL is set but the redis package is not installed")
+
+    @property
+    def has_redis(self) -> bool:
+        return self._redis is not None
+
+    @property
+    def client(self):
+        """The Redis client, for stores needing more than get/set; or None"""
+        return self._redis
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.local.get_nowait(key)
+        if value is not None or self._redis is None:
+            return value
+        try:
+            raw = await self._redis.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"Redis get failed for {key}: {str(e)}")
+            return None
+        if raw is None:
+            return None
+        value = orjson.loads(raw)
+        self.local.set_nowait(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, expire: Optional[int] = 3600) -> None:
+        self.local.set_nowait(key, value, min(expire or self.local_ttl, self.local_ttl))
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                self._key(key), orjson.dumps(value, default=str), ex=expire
+            )
+        except Exception as e:
+            logger.warning(f"Redis set failed for {key}: {str(e)}")
+
+    async def delete(self, key: str) -> None:
+        self.local.delete_nowait(key)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Redis delete failed for {key}: {str(e)}")
+
+    async def ping(self) -> bool:
+        if self._redis is None:
+            return False
+        return bool(await self._redis.ping())
+
+    async def close(self) -> None:
+        self.local.clear()
+        if self._redis is not None:
+            await self._redis.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"local_entries": len(self.local), "redis": self.has_redis}
+
+
+# Owns the process's shared Redis connection; closed by the container
+redis_cache = RedisCache()
@@ -0,0 +1,180 @@
+import asyncio
+import heapq
+import itertools
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+
+class Priority(NamedTuple):
+    rank: int  # Lower is served first
+    share: float  # Fraction of the limit this class may fill
+    max_wait: float  # Seconds to queue before being shed
+
+
+PRIORITIES: Dict[str, Priority] = {
+    "critical": Priority(0, 1.0, 1.0),
+    "normal": Priority(1, 0.8, 0.25),
+    "bulk": Priority(2, 0.5, 0.05),
+}
+EXEMPT = "exempt"
+
+
+class RoutePriorities:
+    """Maps requests to a priority name by method and path prefix
+
+    Keys are path prefixes, optionally preceded by a method
+    (``"GET /api/app1/products"``), and the longest matching key wins.
+    ``exempt`` routes (health checks, streams) bypass the limiter;
+    unmatched routes are ``normal``.
+    """
+
+    def __init__(self, priorities: Dict[str, str]):
+        rules: List[Tuple[Optional[str], str, str]] = []
+        for key, name in priorities.items():
+            if name != EXEMPT and name not in PRIORITIES:
+                raise ValueError(f"Unknown priority {name} for {key}")
+            method, _, prefix = key.rpartition(" ")
+            rules.append((method.upper() or None, prefix, name))
+        self.rules = sorted(
+            rules, key=lambda rule: (len(rule[1]), rule[0] is not None), reverse=True
+        )
+
+    def classify(self, method: str, path: str) -> str:
+        for rule_method, prefix, name in self.rules:
+            if path.startswith(prefix) and rule_method in (None, method):
+                return name
+        return "normal"
+
+
+class AdaptiveLimiter:
+    """In-flight request limit that follows measured latency
+
+    The limit is adjusted after every request from the ratio of long-term
+    to short-term latency (the gradient approach of Netflix's
+    concurrency-limits): while latency holds at its baseline the limit
+    grows by about its square root, and once requests start queueing
+    inside the server and latency rises, it shrinks proportionally. Excess
+    requests wait briefly in a priority queue; lower priorities may only
+    fill part of the limit and give up sooner, so critical routes keep
+    capacity while bulk traffic is shed first.
+    """
+
+    def __init__(
+        self,
+        initial: int = settings.CONCURRENCY_LIMIT_INITIAL,
+        min_limit: int = settings.CONCURRENCY_LIMIT_MIN,
+        max_limit: int = settings.CONCURRENCY_LIMIT_MAX,
+        max_queue: int = settings.CONCURRENCY_MAX_QUEUE,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        long_window: int = 600,
+        short_window: int = 10,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.long_window = long_window
+        self.short_window = short_window
+        self.in_flight = 0
+        self.queued = 0
+        self.shed = 0
+        self.long_rtt: Optional[float] = None
+        self.short_rtt: Optional[float] = None
+        self._waiters: List[Tuple[int, int, asyncio.Future, Priority]] = []
+        self._seq = itertools.count()
+
+    def _admits(self, priority: Priority) -> bool:
+        return self.in_flight < max(1.0, self.limit * priority.share)
+
+    def _head(self) -> Optional[Tuple[int, int, asyncio.Future, Priority]]:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        return self._waiters[0] if self._waiters else None
+
+    async def acquire(self, name: str) -> bool:
+        """Take a slot, queueing up to the priority's wait; False if shed"""
+        priority = PRIORITIES[name]
+        head = self._head()
+        if (head is None or head[0] > priority.rank) and self._admits(priority):
+            self.in_flight += 1
+            return True
+        if self.queued >= self.max_queue:
+            self.shed += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        entry = (priority.rank, next(self._seq), future, priority)
+        heapq.heappush(self._waiters, entry)
+        self.queued += 1
+        timer = loop.call_later(
+            priority.max_wait, lambda: future.done() or future.set_result(False)
+        )
+        try:
+            granted = await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.result():
+                self.release()  # Granted just as we were cancelled
+            raise
+        finally:
+            self.queued -= 1
+            timer.cancel()
+        if not granted:
+            self.shed += 1
+        return granted
+
+    def release(self, elapsed: Optional[float] = None) -> None:
+        """Free a slot, feeding the request's latency into the limit"""
+        self.in_flight -= 1
+        if elapsed is not None:
+            self._update(elapsed)
+        self._grant()
+
+    def _grant(self) -> None:
+        while True:
+            head = self._head()
+            if head is None or not self._admits(head[3]):
+                return
+            heapq.heappop(self._waiters)
+            self.in_flight += 1
+            head[2].set_result(True)
+
+    def _update(self, rtt: float) -> None:
+        if self.long_rtt is None or self.short_rtt is None:
+            self.long_rtt = self.short_rtt = rtt
+            return
+        self.short_rtt += (rtt - self.short_rtt) / self.short_window
+        self.long_rtt += (rtt - self.long_rtt) / self.long_window
+        if self.long_rtt > self.short_rtt * 2:
+            # Latency dropped a lot (e.g. after an incident); catch up faster
+            self.long_rtt *= 0.95
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / self.short_rtt))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        limit = self.limit * (1 - self.smoothing) + target * self.smoothing
+        if limit > self.limit and self.in_flight < self.limit / 2:
+            return  # Not using the limit, so no evidence it should grow
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+
+    def retry_after(self) -> int:
+        """Whole seconds after which a shed client could expect a slot"""
+        rtt = self.short_rtt or 0.0
+        return max(1, math.ceil(rtt * (1 + self.queued / max(self.limit, 1.0))))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 1),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "shed": self.shed,
+            "short_rtt_ms": round((self.short_rtt or 0.0) * 1000, 3),
+            "long_rtt_ms": round((self.long_rtt or 0.0) * 1000, 3),
+        }
+
+
+concurrency_limiter = AdaptiveLimiter()
+route_priorities = RoutePriorities(settings.CONCURRENCY_PRIORITIES)
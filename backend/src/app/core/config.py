@@ -34,7 +34,7 @@ class Settings(BaseSettings):
 
     # Environment
     ENV: str = "development"
-    DEBUG: bool = True
+    DEBUG: bool = False  # Also exposes the /health debug routes
 
     # Supabase - with better error messages
     SUPABASE_URL: str
@@ -79,6 +79,111 @@ class Settings(BaseSettings):
             raise ValueError("SECRET_KEY must be at least 32 characters long")
         return v
 
+    # Cache / Sessions
+    REDIS_URL: Optional[str] = None
+    SESSION_TTL_SECONDS: int = 60 * 60 * 24  # 1 day
+    SESSION_REFRESH_MARGIN_SECONDS: int = 120
+    SESSION_REFRESH_INTERVAL_SECONDS: int = 15
+
+    # Request deadlines; clients may ask for less (or more, up to the max)
+    REQUEST_TIMEOUT_SECONDS: float = 30.0
+    REQUEST_TIMEOUT_MAX_SECONDS: float = 120.0
+    REQUEST_TIMEOUT_HEADER: str = "X-Request-Timeout"
+
+    # Adaptive concurrency limit per worker, and route priorities for it
+    # ("critical", "normal", "bulk" or "exempt"; unmatched routes are normal)
+    CONCURRENCY_LIMIT_INITIAL: int = 32
+    CONCURRENCY_LIMIT_MIN: int = 4
+    CONCURRENCY_LIMIT_MAX: int = 512
+    CONCURRENCY_MAX_QUEUE: int = 256
+    CONCURRENCY_PRIORITIES: Dict[str, str] = {
+        "/health": "exempt",
+        "GET /api/app2/courses/events": "exempt",
+        # Each batched sub-request is admitted at its own route's priority
+        "POST /api/batch": "exempt",
+        "/auth/": "critical",
+        "/api/auth/": "critical",
+        "POST /api/app1/checkout": "critical",
+        "GET /api/app1/products": "bulk",
+        "GET /api/app1/reports": "bulk",
+        "GET /api/app2/courses": "bulk",
+        "/openapi": "bulk",
+        "/docs": "bulk",
+        "/redoc": "bulk",
+    }
+
+    # Batch requests
+    BATCH_MAX_REQUESTS: int = 20
+    BATCH_CONCURRENCY: int = 8
+
+    # Server-sent events
+    EVENTS_BUFFER_SIZE: int = 64
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # Connection pools
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    SHUTDOWN_GRACE_SECONDS: float = 10.0
+
+    # Health probing
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 10.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+
+    # Local state (e.g. the job store); defaults to backend/data
+    DATA_DIR: str = str(current_dir.parent.parent.parent / "data")
+
+    # Background jobs
+    JOB_STORE_PATH: str = "jobs.sqlite3"  # Relative to DATA_DIR
+    JOB_QUEUE_CONCURRENCY: Dict[str, int] = {"default": 4, "audit": 2}
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 1.0
+    JOB_RETRY_MAX_SECONDS: float = 300.0
+    JOB_LEASE_SECONDS: float = 60.0
+
+    @validator("JOB_STORE_PATH")
+    def anchor_job_store(cls, v: str, values: Dict) -> str:
+        # Not the working directory, which differs between launchers
+        return str(Path(values.get("DATA_DIR", ".")) / v)
+
+    # Inventory
+    INVENTORY_FLUSH_WINDOW_SECONDS: float = 0.02
+    INVENTORY_RECONCILE_INTERVAL_SECONDS: float = 30.0
+    INVENTORY_LEDGER_IDLE_SECONDS: float = 600.0
+
+    # Scheduling
+    COURSE_SESSION_SYNC_SECONDS: float = 5.0
+
+    # Idempotency keys
+    IDEMPOTENCY_TTL_SECONDS: int = 60 * 60 * 24
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+
+    # Query statistics
+    SLOW_QUERY_MS: float = 200.0
+    # Encode one result in N per query to estimate bytes transferred
+    QUERY_SIZE_SAMPLE_EVERY: int = 10
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = False
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 512
+
+    # Function instrumentation
+    INSTRUMENT_SAMPLE_RATE: float = 0.1
+    SLOW_SPAN_MS: float = 250.0
+
+    # Quotas
+    QUOTA_RECONCILE_INTERVAL_SECONDS: float = 300.0
+    QUOTA_SYNC_HEADROOM: float = 0.9
+
+    # Runtime configuration overrides, reloaded without a restart
+    APP_CONFIG_FILE: Optional[str] = None
+    CONFIG_WATCH_INTERVAL_SECONDS: float = 5.0
+
+    # OpenAPI documents written at build time by app.api.docs.openapi
+    OPENAPI_PREBUILT_DIR: Optional[str] = None
+
     class Config:
         env_file = ".env.dev"
         case_sensitive = True
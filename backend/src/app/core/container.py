@@ -0,0 +1,151 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from fastapi import FastAPI
+
+from app.core.cache import redis_cache
+from app.core.config import settings
+from app.core.events import event_hub
+from app.core.health import HealthProber
+from app.core.idempotency import idempotency_store
+from app.core.jobs import job_queue
+from app.core.logger import get_logger
+from app.core.quotas import quota_manager
+from app.core.runtime_config import config_store
+from app.db.base import SupabaseDB
+from app.db.connection import PostgresDB
+from app.services.auth.sessions import session_store
+
+logger = get_logger(__name__)
+
+
+Hook = Callable[["Container"], Awaitable[None]]
+
+
+class Container:
+    """Process-wide resources built and warmed once per worker"""
+
+    startup_hooks: List[Hook] = []
+    shutdown_hooks: List[Hook] = []
+
+    @classmethod
+    def on_startup(cls, hook: Hook) -> Hook:
+        """Register a domain hook run after the shared resources are warm"""
+        cls.startup_hooks.append(hook)
+        return hook
+
+    @classmethod
+    def on_shutdown(cls, hook: Hook) -> Hook:
+        cls.shutdown_hooks.append(hook)
+        return hook
+
+    def __init__(self):
+        self.db: Optional[PostgresDB] = None
+        self.cache = redis_cache
+        self.sessions = session_store
+        self.health = HealthProber()
+        self.jobs = job_queue
+        self.idempotency = idempotency_store
+        self.config = config_store
+        self.quotas = quota_manager
+        self.events = event_hub
+
+    async def _start_db(self) -> None:
+        if not settings.DATABASE_URL:
+            return
+        db = PostgresDB(
+            settings.DATABASE_URL,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+        )
+        await db.connect()
+        # Only a connected pool is handed out; until then get_db answers 503
+        self.db = db
+        await db.warmup()
+        logger.info(f"Postgres pool ready ({settings.DB_POOL_MIN_SIZE} warm)")
+
+    async def _start_supabase(self) -> None:
+        # Pay DNS and TLS handshakes now rather than on the first user request
+        await self._check_supabase()
+
+    async def _start_cache(self) -> None:
+        if self.cache.has_redis:
+            await self.cache.ping()
+
+    async def _check_supabase(self) -> None:
+        # Through the client services use, which also keeps its pool warm
+        client = await asyncio.to_thread(SupabaseDB.get_client)
+        response = await asyncio.to_thread(client.postgrest.session.head, "/")
+        if response.status_code >= 500:
+            raise RuntimeError(f"Supabase returned {response.status_code}")
+
+    async def _check_postgres(self) -> None:
+        if self.db is None or self.db.pool is None:
+            # Startup could not reach Postgres; keep trying from the prober
+            await self._start_db()
+        async with self.db.pool.acquire() as conn:
+            await conn.execute("SELECT 1")
+
+    def _register_health_checks(self) -> None:
+        self.health.add_check("supabase", self._check_supabase)
+        if settings.DATABASE_URL:
+            self.health.add_check("postgres", self._check_postgres)
+        if self.cache.has_redis:
+            self.health.add_check("redis", self.cache.ping)
+
+    async def startup(self) -> None:
+        results = await asyncio.gather(
+            self._start_db(),
+            self._start_supabase(),
+            self._start_cache(),
+            return_exceptions=True,
+        )
+        for name, result in zip(["postgres", "supabase", "cache"], results):
+            if isinstance(result, Exception):
+                # A cold dependency must not keep the worker from serving
+                logger.warning(f"Warmup of {name} failed: {str(result)}")
+        self._register_health_checks()
+        await self.config.start()
+        await self.quotas.start(self.db)
+        await self.health.start()
+        await self.sessions.start()
+        await self.jobs.start()
+        await self.events.start()
+        results = await asyncio.gather(
+            *(hook(self) for hook in self.startup_hooks), return_exceptions=True
+        )
+        for hook, result in zip(self.startup_hooks, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Startup hook {hook.__qualname__} failed: {result}")
+
+    async def shutdown(self) -> None:
+        for hook in self.shutdown_hooks:
+            try:
+                await hook(self)
+            except Exception as e:
+                logger.warning(f"Shutdown hook {hook.__qualname__} failed: {e}")
+        await self.events.stop()
+        await self.config.stop()
+        await self.quotas.stop()
+        await self.sessions.stop()
+        await self.health.stop()
+        grace = settings.SHUTDOWN_GRACE_SECONDS
+        await self.jobs.stop(timeout=grace)
+        if self.db is not None:
+            await self.db.close(timeout=grace)
+        await self.cache.close()
+        await self.idempotency.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    container = Container()
+    app.state.container = container
+    await container.startup()
+    logger.info("Application container started")
+    try:
+        yield
+    finally:
+        await container.shutdown()
+        logger.info("Application container stopped")
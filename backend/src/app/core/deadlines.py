@@ -0,0 +1,117 @@
+import asyncio
+from contextvars import Context, ContextVar, copy_context
+from typing import Any, Awaitable, Callable, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the current request has no time left for more work"""
+
+
+class Deadline:
+    """Time budget of one request, shared by everything it runs
+
+    ``requested`` is the client's own budget (its timeout header), which a
+    route default can shorten but never extend. ``at`` is None for requests
+    without a budget, such as event streams.
+    """
+
+    __slots__ = ("started", "requested", "at", "changed")
+
+    def __init__(self, budget: Optional[float], requested: Optional[float] = None):
+        self.started = asyncio.get_running_loop().time()
+        self.requested = requested
+        self.at: Optional[float] = None
+        self.changed = asyncio.Event()
+        self.set_budget(budget)
+
+    def set_budget(self, seconds: Optional[float]) -> None:
+        """Budget counted from the start of the request"""
+        if self.requested is not None and (seconds is None or seconds > self.requested):
+            seconds = self.requested
+        self.at = None if seconds is None else self.started + seconds
+        self.changed.set()
+
+    def remaining(self) -> Optional[float]:
+        if self.at is None:
+            return None
+        return self.at - asyncio.get_running_loop().time()
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None if unbounded"""
+    deadline = current_deadline.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable``, giving up when the request's budget runs out
+
+    Work started in a thread (``asyncio.to_thread``) keeps running until it
+    returns; only the waiting request is released.
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Request deadline exceeded")
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded") from None
+
+
+def without_deadline() -> Context:
+    """Copy of the current context without the request's deadline"""
+    context = copy_context()
+    context.run(current_deadline.set, None)
+    return context
+
+
+def detach(coro: Coroutine[Any, Any, T]) -> "asyncio.Task[T]":
+    """Run ``coro`` as a task not bound by the current request's deadline
+
+    For work shared by several requests, where one caller running out of
+    time must not fail it for the others.
+    """
+    return without_deadline().run(asyncio.ensure_future, coro)
+
+
+async def run_to_completion(coro: Coroutine[Any, Any, T]) -> T:
+    """Await ``coro`` within the deadline, but never abandon it halfway
+
+    If the request gives up, ``coro`` still finishes in the background, so
+    writes that cannot be cancelled (e.g. in a thread) keep the state they
+    depend on, such as a quota reservation, until they are done.
+    """
+    return await within_deadline(asyncio.shield(detach(coro)))
+
+
+def request_budget(seconds: Optional[float]) -> Callable[[], Awaitable[None]]:
+    """Route dependency replacing the default budget; None for no deadline"""
+
+    async def apply() -> None:
+        deadline = current_deadline.get()
+        if deadline is not None:
+            deadline.set_budget(seconds)
+
+    return apply
+
+
+def budget_from_header(value: Any, maximum: float) -> Optional[float]:
+    """Parse a timeout header in seconds; invalid values are ignored"""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    if seconds != seconds or seconds <= 0:  # NaN or non-positive
+        return None
+    return min(seconds, maximum)
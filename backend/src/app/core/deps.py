@@ -1,5 +1,9 @@
-from fastapi import Depends, HTTPException
+from typing import Callable
+from fastapi import Depends, HTTPException, Request
 from app.core.apps import AppRegistry, AppConfig
+from app.core.cache import RedisCache
+from app.core.container import Container
+from app.db.connection import PostgresDB
 
 
 async def get_current_app() -> AppConfig:
@@ -9,9 +13,29 @@ async def get_current_app() -> AppConfig:
     return app
 
 
-async def require_feature(feature: str, app: AppConfig = Depends(get_current_app)):
-    if not AppRegistry.has_feature(feature):
-        raise HTTPException(
-            status_code=403,
-            detail=f"Feature {feature} not available in this application",
-        )
+def require_feature(feature: str) -> Callable:
+    """Creates a dependency that checks the current app has ``feature``"""
+
+    async def check_feature(app: AppConfig = Depends(get_current_app)) -> bool:
+        if not AppRegistry.has_feature(feature):
+            raise HTTPException(
+                status_code=403,
+                detail=f"Feature {feature} not available in this application",
+            )
+        return True
+
+    return check_feature
+
+
+def get_container(request: Request) -> Container:
+    return request.app.state.container
+
+
+async def get_db(container: Container = Depends(get_container)) -> PostgresDB:
+    if container.db is None:
+        raise HTTPException(status_code=503, detail="Database not configured")
+    return container.db
+
+
+async def get_cache(container: Container = Depends(get_container)) -> RedisCache:
+    return container.cache
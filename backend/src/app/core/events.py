@@ -0,0 +1,211 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+import orjson
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+HEARTBEAT = b": ping\n\n"
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+class Subscription:
+    """Pending events of one client, bounded and coalesced by key
+
+    A newer event with the same key replaces the pending one, so a burst of
+    updates to one course reaches a slow client once. If the client falls
+    ``maxsize`` keys behind, its backlog is replaced by a single ``resync``
+    event telling it to refetch.
+    """
+
+    __slots__ = (
+        "topics",
+        "maxsize",
+        "pending",
+        "overflowed",
+        "ping",
+        "closed",
+        "_wakeup",
+    )
+
+    def __init__(self, topics: Iterable[str], maxsize: int):
+        self.topics = tuple(topics)
+        self.maxsize = maxsize
+        self.pending: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self.overflowed = False
+        self.ping = False
+        self.closed = False
+        self._wakeup = asyncio.Event()
+
+    def push(self, key: Hashable, frame: bytes) -> None:
+        if key in self.pending:
+            self.pending[key] = frame
+        elif len(self.pending) >= self.maxsize:
+            self.pending.clear()
+            self.overflowed = True
+        else:
+            self.pending[key] = frame
+        self._wakeup.set()
+
+    def wake(self, ping: bool = False) -> None:
+        self.ping = self.ping or ping
+        self._wakeup.set()
+
+    async def next_chunk(self) -> Optional[bytes]:
+        """Everything pending as one write; None once closed"""
+        while not (self.pending or self.overflowed or self.ping or self.closed):
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        if self.closed:
+            return None
+        parts = [RESYNC] if self.overflowed else []
+        parts.extend(self.pending.values())
+        if not parts:
+            parts.append(HEARTBEAT)
+        self.pending.clear()
+        self.overflowed = self.ping = False
+        return b"".join(parts)
+
+
+class EventHub:
+    """In-process fan-out of server-sent events to topic subscribers
+
+    Each event is encoded once and the same bytes are queued for every
+    subscriber; idle subscribers cost a small object and an Event, with
+    one shared heartbeat task instead of a timer per connection.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = settings.EVENTS_BUFFER_SIZE,
+        heartbeat: float = settings.EVENTS_HEARTBEAT_SECONDS,
+    ):
+        self.buffer_size = buffer_size
+        self.heartbeat = heartbeat
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._subscriptions: Set[Subscription] = set()
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics, self.buffer_size)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.closed = True
+        self._subscriptions.discard(subscription)
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def publish(
+        self,
+        topics: Iterable[str],
+        event: str,
+        data: Any,
+        key: Optional[Hashable] = None,
+    ) -> int:
+        """Queue an event for every subscriber of ``topics``
+
+        Events with the same ``key`` coalesce while pending; without one,
+        each event is delivered. Returns the number of subscribers reached.
+        """
+        groups = [self._topics[t] for t in topics if t in self._topics]
+        if not groups:
+            return 0
+        self._seq += 1
+        frame = b"id: %d\nevent: %s\ndata: %s\n\n" % (
+            self._seq,
+            event.encode(),
+            orjson.dumps(data, default=str),
+        )
+        coalesce_key = (event, key) if key is not None else self._seq
+        reached = 0
+        for subscribers in groups:
+            for subscription in subscribers:
+                # The shared key also dedupes clients subscribed to several topics
+                subscription.push(coalesce_key, frame)
+                reached += 1
+        return reached
+
+    def close_all(self) -> None:
+        """End every open stream, e.g. before a graceful shutdown"""
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+            subscription.wake()
+
+    def stats(self) -> Dict[str, int]:
+        return {"subscriptions": len(self._subscriptions), "topics": len(self._topics)}
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            for subscription in self._subscriptions:
+                subscription.wake(ping=True)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self.close_all()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class EventStreamResponse(Response):
+    """Stream a subscription as ``text/event-stream`` until it is closed
+
+    A client disconnect ends the stream through request cancellation (see
+    DeadlineMiddleware); the subscription is always released.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(self, hub: EventHub, subscription: Subscription, retry_ms: int = 5000):
+        self.hub = hub
+        self.subscription = subscription
+        self.retry_ms = retry_ms
+        self.status_code = 200
+        self.background = None
+        self.init_headers({"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": b"retry: %d\n\n" % self.retry_ms,
+                    "more_body": True,
+                }
+            )
+            while True:
+                chunk = await self.subscription.next_chunk()
+                if chunk is None:
+                    break
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            self.hub.unsubscribe(self.subscription)
+
+
+event_hub = EventHub()
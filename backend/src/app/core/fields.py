@@ -0,0 +1,125 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import orjson
+from fastapi import HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+Rows = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a fieldset names fields the response model does not have"""
+
+    def __init__(self, unknown: Sequence[str], allowed: Sequence[str]):
+        self.unknown = list(unknown)
+        self.allowed = list(allowed)
+        super().__init__(
+            f"Unknown fields: {', '.join(self.unknown)} "
+            f"(allowed: {', '.join(self.allowed)})"
+        )
+
+
+class FieldSet:
+    """Subset of a response model's fields to fetch and return
+
+    Renders as a PostgREST ``select`` or an SQL column list, so the
+    database only sends the requested columns, and projects rows so
+    responses only carry them.
+    """
+
+    __slots__ = ("model", "names")
+
+    def __init__(self, model: Type[BaseModel], names: Iterable[str]):
+        self.model = model
+        self.names: Tuple[str, ...] = tuple(dict.fromkeys(names))
+
+    @classmethod
+    def all(cls, model: Type[BaseModel]) -> "FieldSet":
+        return cls(model, model.__fields__)
+
+    @classmethod
+    def parse(
+        cls, model: Type[BaseModel], raw: Optional[str], required: Sequence[str] = ()
+    ) -> Optional["FieldSet"]:
+        """Fieldset for a comma-separated ``raw`` value; None if not given"""
+        if not raw:
+            return None
+        names = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = [name for name in names if name not in model.__fields__]
+        if unknown:
+            raise InvalidFieldsError(unknown, list(model.__fields__))
+        return cls(model, [*required, *names])
+
+    def select(self) -> str:
+        """PostgREST ``select`` value"""
+        return ",".join(self.names)
+
+    def sql(self, table: Optional[str] = None) -> str:
+        """Quoted SQL column list, optionally qualified by ``table``"""
+        prefix = f'"{table}".' if table else ""
+        return ", ".join(f'{prefix}"{name}"' for name in self.names)
+
+    def project(self, rows: Rows) -> Rows:
+        names = self.names
+        if isinstance(rows, dict):
+            return {name: rows.get(name) for name in names}
+        return [{name: row.get(name) for name in names} for row in rows]
+
+
+def select_for(model: Type[BaseModel], fields: Optional[FieldSet]) -> str:
+    """PostgREST ``select`` for ``fields``, or every field of ``model``"""
+    return (fields or FieldSet.all(model)).select()
+
+
+def sparse_fields(
+    model: Type[BaseModel], required: Sequence[str] = ("id",)
+) -> Callable[..., Optional[FieldSet]]:
+    """Route dependency reading ``?fields=a,b`` validated against ``model``
+
+    ``required`` fields (the id, by default) are always included.
+    """
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated subset of: {', '.join(model.__fields__)}",
+        )
+    ) -> Optional[FieldSet]:
+        try:
+            return FieldSet.parse(model, fields, required)
+        except InvalidFieldsError as e:
+            raise HTTPException(
+                status_code=400, detail={"message": str(e), "allowed": e.allowed}
+            )
+
+    return dependency
+
+
+def sparse_response(
+    data: Any, fields: Optional[FieldSet], key: Optional[str] = None
+) -> Any:
+    """Serialize only ``fields`` of ``data`` (or of ``data[key]``)
+
+    Without a fieldset ``data`` is returned unchanged for the route's
+    response model to handle; with one, the projected rows are encoded
+    directly, since they no longer satisfy that model.
+    """
+    if fields is None or data is None:
+        return data
+    if key is not None:
+        data = {**data, key: fields.project(data[key])}
+    else:
+        data = fields.project(data)
+    return Response(orjson.dumps(data, default=str), media_type="application/json")
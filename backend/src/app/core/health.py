@@ -0,0 +1,89 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CheckResult:
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    error: Optional[str] = None
+
+
+class HealthProber:
+    """Probes backing services on an interval and caches the outcome
+
+    Readiness requests read the cached snapshot, so load balancer checks
+    never touch Supabase, Postgres or Redis themselves.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.HEALTH_PROBE_INTERVAL_SECONDS,
+        timeout: float = settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self._checks: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._results: Dict[str, CheckResult] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add_check(self, name: str, check: Callable[[], Awaitable[Any]]) -> None:
+        self._checks[name] = check
+
+    async def _run_check(self, name: str) -> None:
+        start = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(self._checks[name](), self.timeout)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        self._results[name] = CheckResult(
+            ok=error is None,
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+            checked_at=time.time(),
+            error=error,
+        )
+        if error:
+            logger.warning(f"Health check {name} failed: {error}")
+
+    async def probe_once(self) -> None:
+        await asyncio.gather(*(self._run_check(name) for name in self._checks))
+
+    @property
+    def ready(self) -> bool:
+        return len(self._results) == len(self._checks) and all(
+            result.ok for result in self._results.values()
+        )
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "checks": {name: asdict(result) for name, result in self._results.items()},
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.probe_once()
+
+    async def start(self) -> None:
+        await self.probe_once()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.cache import MemoryCache, RedisCache, redis_cache
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Extend a pending marker's expiry only while it is still ours
+EXTEND_LOCK = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when a key is replayed with a different request"""
+
+
+class IdempotencyInProgressError(Exception):
+    """Raised when the original request is still running after the wait"""
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable digest of whatever identifies a request"""
+    return hashlib.sha256(orjson.dumps(parts, default=str)).hexdigest()
+
+
+class IdempotencyStore:
+    """Records the result of each idempotency key so retries replay it
+
+    The first request for a key claims it, runs and stores its result for
+    ``ttl`` seconds; duplicates arriving meanwhile wait for that result
+    instead of running again. Within a worker duplicates share one future;
+    across workers the claim is a Redis ``SET NX`` marker that others poll.
+    The marker expires after ``lock_ttl`` unless its owner, still running,
+    extends it, so only a crashed worker's claim can be taken over. Failed
+    runs are not recorded, so the key can be retried.
+    """
+
+    POLL_INITIAL = 0.02
+    POLL_MAX = 0.5
+
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        prefix: str = "idem",
+        ttl: int = settings.IDEMPOTENCY_TTL_SECONDS,
+        lock_ttl: int = settings.IDEMPOTENCY_LOCK_SECONDS,
+        wait: float = settings.IDEMPOTENCY_WAIT_SECONDS,
+        max_entries: int = 10_000,
+    ):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self.local = MemoryCache(max_entries=max_entries)
+        self._inflight: Dict[str, Tuple[str, asyncio.Future]] = {}
+        # The shared tier is optional; the cache owns the connection
+        self._redis = (cache or redis_cache).client
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    @staticmethod
+    def _marker(token: str) -> bytes:
+        return orjson.dumps({"state": "pending", "token": token})
+
+    @staticmethod
+    def _check(key: str, record: Dict[str, Any], request_hash: str) -> Any:
+        if record["fingerprint"] != request_hash:
+            raise IdempotencyKeyReusedError(
+                f"Idempotency key {key} was already used for a different request"
+            )
+        return record["result"]
+
+    async def _claim(self, key: str, request_hash: str) -> Tuple[Optional[str], Any]:
+        """Claim ``key`` in Redis; returns (token, None) or (None, record)"""
+        if self._redis is None:
+            return "local", None
+        token = uuid.uuid4().hex
+        try:
+            if await self._redis.set(
+                self._key(key), self._marker(token), nx=True, ex=self.lock_ttl
+            ):
+                return token, None
+            raw = await self._redis.get(self._key(key))
+        except Exception as e:
+            # Fall back to per-worker guarantees rather than failing the request
+            logger.warning(f"Idempotency claim for {key} failed: {str(e)}")
+            return "local", None
+        if raw is None:  # Released between SET and GET; try again
+            return await self._claim(key, request_hash)
+        return None, orjson.loads(raw)
+
+    async def _wait_remote(self, key: str, request_hash: str) -> Any:
+        deadline = time.monotonic() + self.wait
+        delay = self.POLL_INITIAL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.POLL_MAX)
+            raw = await self._redis.get(self._key(key))
+            if raw is None:
+                return None  # The original run failed; caller may claim it
+            record = orjson.loads(raw)
+            if record["state"] == "done":
+                self.local.set_nowait(key, record, self.ttl)
+                return record
+        raise IdempotencyInProgressError(f"Request with key {key} is still running")
+
+    async def _release(self, key: str, token: str) -> None:
+        if self._redis is None or token == "local":
+            return
+        try:
+            raw = await self._redis.get(self._key(key))
+            # Only drop our own marker; a lapsed lock may belong to someone else
+            if raw is not None and orjson.loads(raw).get("token") == token:
+                await self._redis.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Idempotency release for {key} failed: {str(e)}")
+
+    async def _hold(self, key: str, token: str) -> None:
+        """Keep extending our claim on ``key`` while its handler runs"""
+        marker = self._marker(token)
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            try:
+                held = await self._redis.eval(
+                    EXTEND_LOCK, 1, self._key(key), marker, self.lock_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Idempotency lock renewal for {key} failed: {str(e)}")
+                continue
+            if not held:
+                logger.warning(f"Idempotency lock for {key} was lost")
+                return
+
+    async def _store(self, key: str, record: Dict[str, Any]) -> None:
+        self.local.set_nowait(key, record, self.ttl)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                self._key(key), orjson.dumps(record, default=str), ex=self.ttl
+            )
+        except Exception as e:
+            logger.warning(f"Idempotency store for {key} failed: {str(e)}")
+
+    async def _execute(
+        self, key: str, request_hash: str, func: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        while True:
+            token, record = await self._claim(key, request_hash)
+            if token is not None:
+                break
+            if record["state"] == "done":
+                self.local.set_nowait(key, record, self.ttl)
+                return self._check(key, record, request_hash), True
+            record = await self._wait_remote(key, request_hash)
+            if record is not None:
+                return self._check(key, record, request_hash), True
+
+        holder = None
+        if token != "local":
+            holder = asyncio.create_task(self._hold(key, token))
+        try:
+            result = jsonable_encoder(await func())
+        except BaseException:
+            await self._release(key, token)
+            raise
+        finally:
+            if holder is not None:
+                holder.cancel()
+        await self._store(
+            key, {"state": "done", "fingerprint": request_hash, "result": result}
+        )
+        return result, False
+
+    async def run(
+        self, key: str, request_hash: str, func: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Run ``func`` once per key; returns (result, replayed)"""
+        record = self.local.get_nowait(key)
+        if record is not None:
+            return self._check(key, record, request_hash), True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            inflight_hash, future = inflight
+            if inflight_hash != request_hash:
+                raise IdempotencyKeyReusedError(
+                    f"Idempotency key {key} is in use by a different request"
+                )
+            try:
+                result, _ = await asyncio.wait_for(asyncio.shield(future), self.wait)
+            except asyncio.TimeoutError:
+                raise IdempotencyInProgressError(
+                    f"Request with key {key} is still running"
+                )
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The original was cancelled before finishing; take over
+                return await self.run(key, request_hash, func)
+            return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (request_hash, future)
+        try:
+            outcome = await self._execute(key, request_hash, func)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; nobody else is obliged to look at it
+            future.exception()
+            raise
+        else:
+            future.set_result(outcome)
+            return outcome
+        finally:
+            self._inflight.pop(key, None)
+
+    async def close(self) -> None:
+        self.local.clear()
+
+
+idempotency_store = IdempotencyStore()
+
+
+async def idempotent_response(
+    request: Request,
+    key: Optional[str],
+    handler: Callable[[], Awaitable[Any]],
+    scope: str = "",
+) -> Any:
+    """Run a route handler at most once per ``Idempotency-Key`` header
+
+    Replays carry an ``Idempotent-Replayed: true`` header.
+    """
+    if not key:
+        return await handler()
+    request_hash = fingerprint(request.method, request.url.path, await request.body())
+    try:
+        result, replayed = await idempotency_store.run(
+            f"{scope or request.url.path}:{key}", request_hash, handler
+        )
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return JSONResponse(
+        content=result, headers={REPLAYED_HEADER: "true" if replayed else "false"}
+    )
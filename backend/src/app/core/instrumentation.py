@@ -0,0 +1,204 @@
+import inspect
+import time
+from bisect import bisect_left
+from functools import wraps
+from random import random
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.db.stats import BUCKET_BOUNDS_MS
+
+span_logger = get_logger("span")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class SpanStats:
+    """Call counts for every call, latency histogram for sampled calls"""
+
+    __slots__ = ("calls", "errors", "sampled", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.sampled = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def record(self, elapsed_ms: float, error: bool, sample_rate: float) -> None:
+        self.calls += 1
+        if error:
+            self.errors += 1
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        if sample_rate >= 1 or random() < sample_rate:
+            self.sampled += 1
+            self.total_ms += elapsed_ms
+            self.buckets[bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile of samples"""
+        if not self.sampled:
+            return 0.0
+        rank = q / 100 * self.sampled
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "sampled": self.sampled,
+            "mean_ms": round(self.total_ms / self.sampled, 3) if self.sampled else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class SpanRegistry:
+    """Per-name timing of instrumented functions in this worker
+
+    Every call is timed and counted (two ``perf_counter`` reads); only a
+    ``sample_rate`` fraction of calls goes into the latency histogram, and
+    only calls slower than ``slow_ms`` are logged, as one structured span
+    record each. That keeps the decorator cheap enough to leave on hot
+    service and repository methods.
+    """
+
+    _stats: Dict[str, SpanStats] = {}
+    sample_rate: float = settings.INSTRUMENT_SAMPLE_RATE
+    slow_ms: float = settings.SLOW_SPAN_MS
+
+    @classmethod
+    def get(cls, name: str) -> SpanStats:
+        stats = cls._stats.get(name)
+        if stats is None:
+            stats = cls._stats[name] = SpanStats()
+        return stats
+
+    @classmethod
+    def slow_span(
+        cls, name: str, elapsed_ms: float, error: Optional[BaseException]
+    ) -> None:
+        span = {
+            "name": name,
+            "start": time.time() - elapsed_ms / 1000,
+            "duration_ms": round(elapsed_ms, 3),
+            "status": "error" if error is not None else "ok",
+        }
+        if error is not None:
+            span["error"] = type(error).__name__
+        span_logger.warning(
+            f"Slow span {name}: {elapsed_ms:.1f}ms", extra={"span": span}
+        )
+
+    @classmethod
+    def stats(cls, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per-name counters, most calls first"""
+        ranked = sorted(cls._stats.items(), key=lambda kv: kv[1].calls, reverse=True)
+        return [{"name": name, **stats.to_dict()} for name, stats in ranked[:limit]]
+
+    @classmethod
+    def reset(cls) -> None:
+        # Decorated functions hold on to their stats; zero them in place
+        for stats in cls._stats.values():
+            stats.reset()
+
+
+def instrument(
+    func: Optional[F] = None,
+    *,
+    name: Optional[str] = None,
+    slow_ms: Optional[float] = None,
+    sample_rate: Optional[float] = None,
+) -> Any:
+    """Time a sync, async or async generator function into SpanRegistry
+
+    Use bare (``@instrument``) or with overrides
+    (``@instrument(name="users.create", slow_ms=50)``). Generators are
+    timed for the time spent inside them, not while the consumer holds them.
+    """
+    if func is None:
+        return lambda f: instrument(
+            f, name=name, slow_ms=slow_ms, sample_rate=sample_rate
+        )
+
+    span_name = name or func.__qualname__
+    stats = SpanRegistry.get(span_name)
+
+    def finish(elapsed: float, error: Optional[BaseException]) -> None:
+        elapsed_ms = elapsed * 1000
+        stats.record(
+            elapsed_ms,
+            error is not None,
+            SpanRegistry.sample_rate if sample_rate is None else sample_rate,
+        )
+        if elapsed_ms >= (SpanRegistry.slow_ms if slow_ms is None else slow_ms):
+            SpanRegistry.slow_span(span_name, elapsed_ms, error)
+
+    if inspect.isasyncgenfunction(func):
+
+        @wraps(func)
+        async def agen_wrapper(*args, **kwargs):
+            elapsed = 0.0
+            error = None
+            agen = func(*args, **kwargs)
+            try:
+                while True:
+                    step = perf_counter()
+                    try:
+                        item = await agen.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        elapsed += perf_counter() - step
+                    yield item
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                await agen.aclose()
+                finish(elapsed, error)
+
+        return agen_wrapper
+
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            step = perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException as e:
+                finish(perf_counter() - step, e)
+                raise
+            finish(perf_counter() - step, None)
+            return result
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        step = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            finish(perf_counter() - step, e)
+            raise
+        finish(perf_counter() - step, None)
+        return result
+
+    return wrapper
@@ -0,0 +1,382 @@
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+@dataclass
+class Job:
+    name: str
+    queue: str
+    payload: Dict[str, Any]
+    max_attempts: int
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+    run_at: float = field(default_factory=time.time)
+
+
+JOB_COLUMNS = "id, name, queue, payload, attempts, max_attempts, run_at"
+
+
+def _job(row: tuple) -> Job:
+    return Job(
+        id=row[0],
+        name=row[1],
+        queue=row[2],
+        payload=json.loads(row[3]),
+        attempts=row[4],
+        max_attempts=row[5],
+        run_at=row[6],
+    )
+
+
+class JobStore:
+    """SQLite-backed record of jobs that have not completed yet
+
+    All access goes through one dedicated thread, so the event loop never
+    blocks on disk and the connection is never shared across threads.
+
+    Server workers share the file, so each pending job is leased to the
+    process running it: workers claim only unowned jobs or expired leases,
+    and renew their own leases while they are alive.
+    """
+
+    def __init__(self, path: str, lease: float = settings.JOB_LEASE_SECONDS):
+        self.path = path
+        self.lease = lease
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jobs")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._owner = ""
+        self._owner_pid = 0
+
+    @property
+    def owner(self) -> str:
+        """Lease owner id, unique per process even when created before a fork"""
+        pid = os.getpid()
+        if pid != self._owner_pid:
+            self._owner = f"{pid}-{uuid.uuid4().hex[:8]}"
+            self._owner_pid = pid
+        return self._owner
+
+    def _open(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                queue TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                max_attempts INTEGER NOT NULL,
+                run_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                last_error TEXT,
+                owner TEXT,
+                lease_until REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:  # Stores created before leases
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._conn.execute(
+                "ALTER TABLE jobs ADD COLUMN lease_until REAL NOT NULL DEFAULT 0"
+            )
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        if self._conn is None:
+            self._open()
+        rows = self._conn.execute(sql, params).fetchall()
+        self._conn.commit()
+        return rows
+
+    async def _run(self, sql: str, params: tuple = ()) -> List[tuple]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._execute, sql, params)
+
+    async def add(self, job: Job) -> None:
+        await self._run(
+            f"INSERT INTO jobs ({JOB_COLUMNS}, owner, lease_until)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job.id,
+                job.name,
+                job.queue,
+                json.dumps(job.payload),
+                job.attempts,
+                job.max_attempts,
+                job.run_at,
+                self.owner,
+                time.time() + self.lease,
+            ),
+        )
+
+    async def reschedule(self, job: Job, error: str) -> None:
+        await self._run(
+            "UPDATE jobs SET attempts = ?, run_at = ?, last_error = ? WHERE id = ?",
+            (job.attempts, job.run_at, error, job.id),
+        )
+
+    async def complete(self, job: Job) -> None:
+        await self._run("DELETE FROM jobs WHERE id = ?", (job.id,))
+
+    async def fail(self, job: Job, error: str) -> None:
+        await self._run(
+            "UPDATE jobs SET status = 'dead', attempts = ?, last_error = ? WHERE id = ?",
+            (job.attempts, error, job.id),
+        )
+
+    async def pending(self) -> List[Job]:
+        """Every pending job, whoever holds its lease"""
+        rows = await self._run(
+            f"SELECT {JOB_COLUMNS} FROM jobs WHERE status = 'pending' ORDER BY run_at"
+        )
+        return [_job(row) for row in rows]
+
+    async def claim(self, names: Iterable[str]) -> List[Job]:
+        """Atomically lease unowned or expired pending jobs called ``names``"""
+        names = list(names)
+        if not names:
+            return []
+        now = time.time()
+        owner = self.owner
+        rows = await self._run(
+            "UPDATE jobs SET owner = ?, lease_until = ?"
+            " WHERE status = 'pending' AND lease_until < ?"
+            " AND (owner IS NULL OR owner != ?)"
+            f" AND name IN ({', '.join('?' * len(names))})"
+            f" RETURNING {JOB_COLUMNS}",
+            (owner, now + self.lease, now, owner, *names),
+        )
+        return sorted((_job(row) for row in rows), key=lambda job: job.run_at)
+
+    async def renew(self) -> None:
+        await self._run(
+            "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = 'pending'",
+            (time.time() + self.lease, self.owner),
+        )
+
+    async def release(self) -> None:
+        """Hand this process's unfinished jobs to the other workers"""
+        await self._run(
+            "UPDATE jobs SET owner = NULL, lease_until = 0"
+            " WHERE owner = ? AND status = 'pending'",
+            (self.owner,),
+        )
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+
+
+class JobQueue:
+    """In-process async job runner with named queues and retries
+
+    Jobs are persisted before ``enqueue`` returns and removed once their
+    handler succeeds, so work interrupted by a restart is picked up again,
+    by this or another worker, once its lease is released or expires.
+    Failed jobs are retried with exponential backoff; after
+    ``max_attempts`` they are kept in the store as dead.
+    """
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        retry_base: float = settings.JOB_RETRY_BASE_SECONDS,
+        retry_max: float = settings.JOB_RETRY_MAX_SECONDS,
+    ):
+        self.store = store
+        self.concurrency = dict(concurrency or settings.JOB_QUEUE_CONCURRENCY)
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._handlers: Dict[str, Handler] = {}
+        self._default_queue: Dict[str, str] = {}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._timers: Set[asyncio.TimerHandle] = set()
+        self._lease_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    def task(self, name: str, queue: str = "default") -> Callable[[Handler], Handler]:
+        """Register ``handler`` for jobs called ``name``"""
+
+        def decorator(handler: Handler) -> Handler:
+            self._handlers[name] = handler
+            self._default_queue[name] = queue
+            return handler
+
+        return decorator
+
+    def _get_queue(self, name: str) -> asyncio.Queue:
+        queue = self._queues.get(name)
+        if queue is None:
+            queue = self._queues[name] = asyncio.Queue()
+            if self._running:
+                self._spawn_workers(name)
+        return queue
+
+    def _spawn_workers(self, name: str) -> None:
+        for _ in range(self.concurrency.get(name, self.concurrency.get("default", 1))):
+            self._workers.append(asyncio.create_task(self._worker(name)))
+
+    def _schedule(self, job: Job) -> None:
+        delay = job.run_at - time.time()
+        queue = self._get_queue(job.queue)
+        if delay <= 0:
+            queue.put_nowait(job)
+            return
+
+        def release() -> None:
+            self._timers.discard(timer)
+            queue.put_nowait(job)
+
+        timer = asyncio.get_running_loop().call_later(delay, release)
+        self._timers.add(timer)
+
+    async def enqueue(
+        self,
+        name: str,
+        payload: Optional[Dict[str, Any]] = None,
+        queue: Optional[str] = None,
+        delay: float = 0,
+        max_attempts: Optional[int] = None,
+    ) -> str:
+        if name not in self._handlers:
+            raise ValueError(f"No handler registered for job {name}")
+        job = Job(
+            name=name,
+            queue=queue or self._default_queue[name],
+            # Stored as JSON, so the first run sees what a recovered run sees
+            payload=json.loads(json.dumps(payload or {}, default=str)),
+            max_attempts=max_attempts or self.max_attempts,
+            run_at=time.time() + delay,
+        )
+        if self.store is not None:
+            await self.store.add(job)
+        self._schedule(job)
+        return job.id
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _execute(self, job: Job) -> None:
+        job.attempts += 1
+        try:
+            await self._handlers[job.name](**job.payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+            if job.attempts >= job.max_attempts:
+                logger.error(f"Job {job.name} ({job.id}) failed permanently: {error}")
+                if self.store is not None:
+                    await self.store.fail(job, error)
+                return
+            job.run_at = time.time() + self._backoff(job.attempts)
+            logger.warning(f"Job {job.name} ({job.id}) failed, retrying: {error}")
+            if self.store is not None:
+                await self.store.reschedule(job, error)
+            self._schedule(job)
+            return
+        if self.store is not None:
+            await self.store.complete(job)
+
+    async def _worker(self, queue_name: str) -> None:
+        queue = self._queues[queue_name]
+        while True:
+            job = await queue.get()
+            try:
+                await self._execute(job)
+            except Exception as e:
+                logger.error(f"Job worker error on {queue_name}: {str(e)}")
+            finally:
+                queue.task_done()
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        for name in self._queues:
+            self._spawn_workers(name)
+        if self.store is not None:
+            await self._claim()
+            self._lease_task = asyncio.create_task(self._maintain_leases())
+
+    async def _claim(self) -> None:
+        jobs = await self.store.claim(self._handlers)
+        if jobs:
+            logger.info(f"Resuming {len(jobs)} pending jobs")
+        for job in jobs:
+            self._schedule(job)
+
+    async def _maintain_leases(self) -> None:
+        """Keep this worker's leases alive and adopt jobs of dead workers"""
+        while True:
+            await asyncio.sleep(self.store.lease / 3)
+            try:
+                await self.store.renew()
+                await self._claim()
+            except Exception as e:
+                logger.error(f"Job lease maintenance failed: {str(e)}")
+
+    async def drain(self, timeout: float) -> None:
+        """Wait up to ``timeout`` for jobs that are already due"""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues.values())),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Job queue drain timed out; remaining jobs stay persisted")
+
+    async def stop(self, timeout: float = settings.SHUTDOWN_GRACE_SECONDS) -> None:
+        if not self._running:
+            return
+        await self.drain(timeout)
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+            self._lease_task = None
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+        self._running = False
+        if self.store is not None:
+            await self.store.release()
+            await self.store.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {name: queue.qsize() for name, queue in self._queues.items()}
+
+
+job_queue = JobQueue(store=JobStore(settings.JOB_STORE_PATH))
@@ -1,22 +1,185 @@
+import atexit
 import logging
+import os
+import queue
 import sys
-from typing import Optional
+import threading
+from logging.handlers import QueueHandler
+from typing import IO, List, Optional
 
+import orjson
 
-def get_logger(name: Optional[str] = None) -> logging.Logger:
-    """Get a configured logger instance"""
-    logger = logging.getLogger(name or __name__)
-
-    # Only configure if handlers haven't been set up
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+from app.core.config import settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line, including ``extra`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Enqueue without ever blocking; count records the full queue refuses"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Freeze the message now (args may be mutated later); formatting,
+        # tracebacks included, happens on the writer thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """Every log record goes through one queue to a single writer thread
+
+    Loggers hand records to a bounded in-memory queue and return at once, so
+    a slow sink (a container log pipe, a full disk) never blocks the event
+    loop. The writer thread drains the queue in batches and writes each
+    batch with one ``write`` and ``flush``. When the queue is full, records
+    are dropped and counted, and the writer reports the count. Forked
+    workers get a fresh queue and writer thread.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        json_format: bool = settings.LOG_JSON,
+        level: str = settings.LOG_LEVEL,
+        queue_size: int = settings.LOG_QUEUE_SIZE,
+        batch_size: int = settings.LOG_BATCH_SIZE,
+    ):
+        self.stream = stream
+        self.level = level.upper()
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.formatter = JsonFormatter() if json_format else logging.Formatter(
+            TEXT_FORMAT
         )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        self.handler: Optional[DroppingQueueHandler] = None
+        self._thread: Optional[threading.Thread] = None
+        self._reported = 0
 
-        # Set level based on environment
-        logger.setLevel(logging.INFO)
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped if self.handler else 0
 
-    return logger
+    def install(self) -> None:
+        """Route the root logger through the queue (idempotent)"""
+        if self.handler is not None:
+            return
+        self.handler = DroppingQueueHandler(queue.Queue(self.queue_size))
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(self.level)
+        self._start()
+        atexit.register(self.stop)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _after_fork(self) -> None:
+        # The parent's writer thread does not exist here and its queue lock
+        # may have been held at fork time; start over with fresh ones
+        self.handler.queue = queue.Queue(self.queue_size)
+        self.handler.dropped = 0
+        self._reported = 0
+        self._start()
+
+    def _format(self, record: logging.LogRecord) -> str:
+        try:
+            return self.formatter.format(record)
+        except Exception:
+            return f"Unformattable log record from {record.name}: {record.msg!r}"
+
+    def _write(self, lines: List[str]) -> None:
+        stream = self.stream or sys.stdout
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except Exception:
+            pass  # Nowhere left to report it
+
+    def _drop_notice(self, count: int) -> logging.LogRecord:
+        return logging.makeLogRecord(
+            {
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Log queue full: dropped {count} records",
+                "dropped": count,
+            }
+        )
+
+    def _run(self) -> None:
+        log_queue = self.handler.queue
+        while True:
+            record = log_queue.get()
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [self._format(r) for r in batch if r is not None]
+            dropped = self.handler.dropped
+            if dropped > self._reported:
+                lines.append(self._format(self._drop_notice(dropped - self._reported)))
+                self._reported = dropped
+            if lines:
+                self._write(lines)
+            if None in batch:
+                return
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush what is queued and stop the writer thread"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self.handler.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+
+log_pipeline = LogPipeline()
+
+
+def get_logger(name: Optional[str] = None) -> logging.Logger:
+    """Get a logger whose records go through the shared log pipeline"""
+    log_pipeline.install()
+    return logging.getLogger(name or __name__)
@@ -1,22 +1,21 @@
-from typing import TypeVar, Type, Any
+from typing import TypeVar, Type
 
 T = TypeVar("T")
 
 
 class MixinMeta(type):
-    """Metaclass for handling mixin composition"""
+    """Metaclass for handling mixin composition
+
+    Methods resolve through the normal MRO. Classes default to empty
+    ``__slots__`` so composed services stay stateless and cheap to share.
+    """
 
     def __new__(mcs, name: str, bases: tuple, namespace: dict) -> Type:
-        # Collect all mixin methods and properties
-        for base in bases:
-            for key, value in base.__dict__.items():
-                if not key.startswith("__"):
-                    if key not in namespace:
-                        namespace[key] = value
+        namespace.setdefault("__slots__", ())
         return super().__new__(mcs, name, bases, namespace)
 
 
 class BaseMixin:
     """Base class for all mixins"""
 
-    __metaclass__ = MixinMeta
+    __slots__ = ()
@@ -1,12 +1,14 @@
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 from app.core.cache import RedisCache
-from app.core.logging import logger
+from app.core.jobs import job_queue
+from app.core.logger import get_logger
 
 
 class CacheMixin:
     """Mixin for adding caching capabilities to services"""
 
+    __slots__ = ()
     _cache = RedisCache()
 
     async def get_cached(self, key: str) -> Optional[Any]:
@@ -22,13 +24,13 @@ class CacheMixin:
 class AuditMixin:
     """Mixin for adding audit logging to services"""
 
-    def __init__(self):
-        self.audit_logger = logger.get_audit_logger()
+    __slots__ = ()
+    audit_logger = get_logger("audit")
 
     async def log_action(
         self, action: str, user_id: str, details: Dict[str, Any], app_id: str
     ) -> None:
-        await self.audit_logger.info(
+        self.audit_logger.info(
             action,
             extra={
                 "user_id": user_id,
@@ -42,6 +44,8 @@ class AuditMixin:
 class ValidationMixin:
     """Mixin for adding validation capabilities"""
 
+    __slots__ = ()
+
     async def validate_entity(self, data: Dict[str, Any], schema: Any) -> None:
         try:
             schema(**data)
@@ -58,6 +62,8 @@ class ValidationMixin:
 class VersioningMixin:
     """Mixin for handling entity versioning"""
 
+    __slots__ = ()
+
     async def create_version(
         self,
         entity_type: str,
@@ -76,3 +82,15 @@ class VersioningMixin:
         }
         # Store version in database
         await self.versions_repository.create(version)
+
+
+class BackgroundJobMixin:
+    """Mixin for deferring side effects to the background job queue"""
+
+    __slots__ = ()
+    _jobs = job_queue
+
+    async def enqueue_job(
+        self, name: str, payload: Dict[str, Any], delay: float = 0
+    ) -> str:
+        return await self._jobs.enqueue(name, payload, delay=delay)
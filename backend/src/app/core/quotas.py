@@ -0,0 +1,218 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.core.cache import RedisCache, redis_cache
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.runtime_config import config_store
+from app.db.connection import PostgresDB
+from app.db.stats import run_query
+
+logger = get_logger(__name__)
+
+# Quota resource -> the AppSettings field holding its limit
+RESOURCE_LIMITS = {"users": "max_users", "storage": "storage_limit"}
+
+UsageSource = Callable[[str], Awaitable[Optional[int]]]
+
+
+class QuotaExceededError(Exception):
+    """Raised when a reservation would take an app past its limit"""
+
+    def __init__(self, app_id: str, resource: str, limit: int, used: int):
+        self.app_id = app_id
+        self.resource = resource
+        self.limit = limit
+        self.used = used
+        super().__init__(f"{app_id} has used {used} of {limit} {resource}")
+
+
+class QuotaManager:
+    """Per-app usage counters checked against the configured limits
+
+    Usage lives in a local dict, so checking a quota never leaves the
+    process. Reservations are mirrored to Redis with ``INCRBY`` so every
+    worker converges on the same totals: while usage is below ``headroom``
+    of the limit the Redis update runs in the background; closer to the
+    limit the shared counter decides and rejects what would overshoot. (A
+    simultaneous burst on several workers can still pass the limit before
+    their background updates land; keep ``headroom`` low for tight limits.)
+    Counters are periodically reset from the database through registered
+    usage sources, correcting any drift. Limits come from the current
+    configuration snapshot, so changing them needs no restart.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        prefix: str = "quota",
+        interval: float = settings.QUOTA_RECONCILE_INTERVAL_SECONDS,
+        headroom: float = settings.QUOTA_SYNC_HEADROOM,
+    ):
+        self.prefix = prefix
+        self.interval = interval
+        self.headroom = headroom
+        self.db: Optional[PostgresDB] = None
+        self.sources: Dict[str, UsageSource] = {"users": self._count_users}
+        self._usage: Dict[Tuple[str, str], int] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        # Shared counters are optional; the cache owns the connection
+        self._redis = (cache or redis_cache).client
+
+    def _key(self, app_id: str, resource: str) -> str:
+        return f"{self.prefix}:{app_id}:{resource}"
+
+    def source(self, resource: str) -> Callable[[UsageSource], UsageSource]:
+        """Register the database count used to reconcile ``resource``"""
+
+        def decorator(func: UsageSource) -> UsageSource:
+            self.sources[resource] = func
+            return func
+
+        return decorator
+
+    def limit(self, app_id: str, resource: str) -> Optional[int]:
+        app = config_store.snapshot.app(app_id)
+        if app is None:
+            return None
+        return getattr(app, RESOURCE_LIMITS[resource])
+
+    def usage(self, app_id: str, resource: str) -> int:
+        return self._usage.get((app_id, resource), 0)
+
+    def check(self, app_id: Optional[str], resource: str, amount: int = 1) -> None:
+        """Raise if ``amount`` more would exceed the limit"""
+        if not app_id:
+            return
+        limit = self.limit(app_id, resource)
+        used = self.usage(app_id, resource)
+        if limit is not None and used + amount > limit:
+            raise QuotaExceededError(app_id, resource, limit, used)
+
+    async def _incr(self, app_id: str, resource: str, amount: int) -> Optional[int]:
+        try:
+            total = await self._redis.incrby(self._key(app_id, resource), amount)
+        except Exception as e:
+            logger.warning(f"Quota update for {app_id}/{resource} failed: {str(e)}")
+            return None
+        self._usage[(app_id, resource)] = total
+        return total
+
+    def _incr_later(self, app_id: str, resource: str, amount: int) -> None:
+        task = asyncio.create_task(self._incr(app_id, resource, amount))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def reserve(
+        self, app_id: Optional[str], resource: str, amount: int = 1
+    ) -> None:
+        """Count ``amount`` against the app's quota or raise QuotaExceededError"""
+        self.check(app_id, resource, amount)
+        if not app_id:
+            return
+        limit = self.limit(app_id, resource)
+        if limit is None:
+            return
+        key = (app_id, resource)
+        used = self._usage.get(key, 0)
+        if self._redis is None or used + amount <= limit * self.headroom:
+            self._usage[key] = used + amount
+            if self._redis is not None:
+                self._incr_later(app_id, resource, amount)
+            return
+        total = await self._incr(app_id, resource, amount)
+        if total is None:
+            self._usage[key] = used + amount
+        elif total > limit:
+            await self._incr(app_id, resource, -amount)
+            raise QuotaExceededError(app_id, resource, limit, total - amount)
+
+    async def release(
+        self, app_id: Optional[str], resource: str, amount: int = 1
+    ) -> None:
+        """Give back usage, e.g. for a failed signup or a deleted file"""
+        if not app_id or self.limit(app_id, resource) is None:
+            return
+        key = (app_id, resource)
+        self._usage[key] = max(self._usage.get(key, 0) - amount, 0)
+        if self._redis is not None:
+            self._incr_later(app_id, resource, -amount)
+
+    @asynccontextmanager
+    async def reservation(
+        self, app_id: Optional[str], resource: str, amount: int = 1
+    ) -> AsyncIterator[None]:
+        """Reserve for the duration of the block; released if it raises"""
+        await self.reserve(app_id, resource, amount)
+        try:
+            yield
+        except BaseException:
+            await self.release(app_id, resource, amount)
+            raise
+
+    async def _count_users(self, app_id: str) -> Optional[int]:
+        # Signups are Supabase Auth users tagged with their app at signup
+        if self.db is None or self.db.pool is None:
+            return None
+        async with self.db.pool.acquire() as conn:
+            return await run_query(conn, "COUNT_APP_SIGNUPS", app_id, method="fetchval")
+
+    async def _load(self) -> None:
+        """Pick up the shared counters other workers have been keeping"""
+        keys = [
+            (app_id, resource)
+            for app_id in config_store.snapshot.apps
+            for resource in RESOURCE_LIMITS
+        ]
+        try:
+            values = await self._redis.mget([self._key(*key) for key in keys])
+        except Exception as e:
+            logger.warning(f"Loading quota counters failed: {str(e)}")
+            return
+        for key, value in zip(keys, values):
+            if value is not None:
+                self._usage[key] = int(value)
+
+    async def reconcile(self) -> None:
+        """Reset counters to what the database reports"""
+        for app_id in config_store.snapshot.apps:
+            for resource, count in self.sources.items():
+                try:
+                    used = await count(app_id)
+                except Exception as e:
+                    logger.warning(
+                        f"Quota reconcile for {app_id}/{resource} failed: {str(e)}"
+                    )
+                    continue
+                if used is None:
+                    continue
+                self._usage[(app_id, resource)] = used
+                if self._redis is not None:
+                    try:
+                        await self._redis.set(self._key(app_id, resource), used)
+                    except Exception as e:
+                        logger.warning(f"Quota counter write failed: {str(e)}")
+
+    async def _run(self) -> None:
+        while True:
+            await self.reconcile()
+            await asyncio.sleep(self.interval)
+
+    async def start(self, db: Optional[PostgresDB] = None) -> None:
+        self.db = db
+        if self._redis is not None:
+            await self._load()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+
+quota_manager = QuotaManager()
@@ -0,0 +1,52 @@
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+from app.core.apps import AppRegistry
+
+S = TypeVar("S")
+
+DEFAULT_APP = "default"
+
+
+class ServiceRegistry:
+    """Registry handing out long-lived service singletons per app
+
+    Services are built on first use and then reused for every request of the
+    same app, so request handlers never pay for construction or client setup.
+    """
+
+    _factories: Dict[type, Callable[[str], Any]] = {}
+    _instances: Dict[Tuple[str, type], Any] = {}
+    _providers: Dict[type, Callable[[], Any]] = {}
+
+    @classmethod
+    def register(cls, service_cls: Type[S], factory: Callable[[str], S]) -> None:
+        """Register a factory receiving the app id for ``service_cls``"""
+        cls._factories[service_cls] = factory
+        for key in [key for key in cls._instances if key[1] is service_cls]:
+            del cls._instances[key]
+
+    @classmethod
+    def get(cls, service_cls: Type[S], app_id: Optional[str] = None) -> S:
+        key = (app_id or DEFAULT_APP, service_cls)
+        instance = cls._instances.get(key)
+        if instance is None:
+            factory = cls._factories.get(service_cls)
+            instance = factory(key[0]) if factory else service_cls()
+            cls._instances[key] = instance
+        return instance
+
+    @classmethod
+    def provider(cls, service_cls: Type[S]) -> Callable[[], S]:
+        """FastAPI dependency resolving ``service_cls`` for the current app"""
+        provide = cls._providers.get(service_cls)
+        if provide is None:
+
+            async def provide() -> S:
+                app = AppRegistry.get_current_app()
+                return cls.get(service_cls, app.id if app else None)
+
+            cls._providers[service_cls] = provide
+        return provide
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._instances.clear()
@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import json
+import os
+import signal
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.core.app_settings import APP_SETTINGS, AppSettings
+from app.core.config import settings
+from app.core.env_validator import validate_environment
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+RELOAD_SIGNAL = getattr(signal, "SIGUSR1", None)
+
+
+class ConfigSnapshot:
+    """One validated, read-only view of the runtime configuration"""
+
+    __slots__ = ("version", "checksum", "loaded_at", "env", "apps")
+
+    def __init__(
+        self,
+        version: int,
+        checksum: Optional[str],
+        env: Mapping[str, Any],
+        apps: Mapping[str, AppSettings],
+    ):
+        self.version = version
+        self.checksum = checksum
+        self.loaded_at = time.time()
+        self.env = MappingProxyType(dict(env))
+        self.apps = MappingProxyType(dict(apps))
+
+    def app(self, app_id: str) -> Optional[AppSettings]:
+        return self.apps.get(app_id)
+
+    def feature_enabled(self, app_id: str, feature: str) -> bool:
+        app = self.apps.get(app_id)
+        return bool(app and app.features.get(feature, False))
+
+
+def build_apps(overrides: Dict[str, Any]) -> Dict[str, AppSettings]:
+    """Merge per-app overrides onto ``APP_SETTINGS`` and validate the result"""
+    unknown = set(overrides) - set(APP_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown apps in config: {', '.join(sorted(unknown))}")
+    apps = {}
+    for app_id, defaults in APP_SETTINGS.items():
+        # Round-trip through JSON so feature keys are plain strings on both sides
+        merged = json.loads(defaults.json())
+        for key, value in overrides.get(app_id, {}).items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = {**merged[key], **value}
+            else:
+                merged[key] = value
+        apps[app_id] = AppSettings(**merged)
+    return apps
+
+
+class ConfigStore:
+    """Holds the current ``ConfigSnapshot`` and swaps it when the source changes
+
+    The snapshot combines the environment (validated once, it cannot change
+    under a running process) with ``APP_SETTINGS`` overlaid by the optional
+    JSON file at ``path``. The file is polled every ``interval`` seconds and
+    re-read immediately on SIGUSR1. A new snapshot is fully validated before
+    it replaces the old one, so readers only ever take ``store.snapshot``,
+    a plain attribute read, and never see a partial update. Invalid files
+    are logged and leave the running snapshot in place.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = settings.APP_CONFIG_FILE,
+        interval: float = settings.CONFIG_WATCH_INTERVAL_SECONDS,
+    ):
+        self.path = Path(path) if path else None
+        self.interval = interval
+        self.listeners: List[Callable[[ConfigSnapshot], Any]] = []
+        self.snapshot = ConfigSnapshot(0, None, {}, build_apps({}))
+        self._env: Optional[Dict[str, Any]] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self, listener: Callable[[ConfigSnapshot], Any]
+    ) -> Callable[[ConfigSnapshot], Any]:
+        """Call ``listener`` with every snapshot swapped in from now on"""
+        self.listeners.append(listener)
+        return listener
+
+    def _validated_env(self) -> Dict[str, Any]:
+        if self._env is None:
+            try:
+                self._env = validate_environment()
+            except Exception:
+                logger.warning("Continuing with default configuration")
+                self._env = {}
+        return self._env
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except (OSError, TypeError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> Tuple[Optional[str], Dict[str, Any]]:
+        if self.path is None or not self.path.exists():
+            return None, {}
+        raw = self.path.read_bytes()
+        data = json.loads(raw) if raw.strip() else {}
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.path} must contain a JSON object")
+        return hashlib.sha256(raw).hexdigest(), data.get("apps", {})
+
+    def load(self) -> ConfigSnapshot:
+        """Build and install a snapshot from the current sources
+
+        Raises if the file is invalid; the previous snapshot stays current.
+        """
+        self._stamp = self._file_stamp()
+        checksum, overrides = self._read()
+        if self._env is not None and checksum == self.snapshot.checksum:
+            return self.snapshot
+        snapshot = ConfigSnapshot(
+            self.snapshot.version + 1,
+            checksum,
+            self._validated_env(),
+            build_apps(overrides),
+        )
+        self.snapshot = snapshot
+        logger.info(f"Configuration version {snapshot.version} loaded")
+        for listener in self.listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.warning(
+                    f"Config listener {listener.__qualname__} failed: {str(e)}"
+                )
+        return snapshot
+
+    def reload(self) -> bool:
+        """Reload, keeping the current snapshot if the new one is invalid"""
+        version = self.snapshot.version
+        try:
+            return self.load().version != version
+        except Exception as e:
+            logger.error(f"Configuration reload failed: {str(e)}")
+            return False
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._file_stamp() != self._stamp:
+                self.reload()
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if RELOAD_SIGNAL is not None:
+            try:
+                loop.add_signal_handler(RELOAD_SIGNAL, self.reload)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Not the main thread, or no signal support
+        if self.path is not None and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if RELOAD_SIGNAL is not None:
+            try:
+                asyncio.get_running_loop().remove_signal_handler(RELOAD_SIGNAL)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+config_store = ConfigStore()
+
+
+def get_config() -> ConfigSnapshot:
+    """The current configuration snapshot"""
+    return config_store.snapshot
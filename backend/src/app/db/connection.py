@@ -1,21 +1,54 @@
+import asyncio
 from contextlib import asynccontextmanager
 
+try:
+    import asyncpg
+except ImportError:  # Only required when DATABASE_URL is configured
+    asyncpg = None
+
 
 class PostgresDB:
-    def __init__(self, dsn: str):
+    def __init__(self, dsn: str, min_size: int = 2, max_size: int = 10):
         self._pool = None
         self._dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+
+    @property
+    def pool(self):
+        return self._pool
 
     async def connect(self):
+        if asyncpg is None:
+            raise RuntimeError("asyncpg is required for DATABASE_URL connections")
         if not self._pool:
             self._pool = await asyncpg.create_pool(
                 self._dsn,
-                min_size=2,
-                max_size=10,
+                min_size=self.min_size,
+                max_size=self.max_size,
                 command_timeout=60,
                 statement_cache_size=100,
             )
 
+    async def warmup(self) -> None:
+        """Open min_size connections and round-trip each one"""
+        conns = [await self._pool.acquire() for _ in range(self.min_size)]
+        try:
+            await asyncio.gather(*(conn.execute("SELECT 1") for conn in conns))
+        finally:
+            for conn in conns:
+                await self._pool.release(conn)
+
+    async def close(self, timeout: float = 10) -> None:
+        """Wait for in-flight queries, then terminate whatever is left"""
+        if not self._pool:
+            return
+        try:
+            await asyncio.wait_for(self._pool.close(), timeout)
+        except asyncio.TimeoutError:
+            self._pool.terminate()
+        self._pool = None
+
     @asynccontextmanager
     async def transaction(self):
         async with self._pool.acquire() as conn:
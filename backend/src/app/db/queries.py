@@ -13,3 +13,24 @@ class Queries:
         VALUES ($1, $2, $3)
         RETURNING id, email, full_name, created_at;
     """
+
+    # Supabase Auth signups, tagged with their app in the user metadata
+    COUNT_APP_SIGNUPS = """
+        SELECT count(*)
+        FROM auth.users
+        WHERE raw_user_meta_data->>'app_id' = $1;
+    """
+
+    # Product inventory queries
+    GET_PRODUCT_STOCK = """
+        SELECT id, stock
+        FROM products
+        WHERE id = ANY($1::bigint[]);
+    """
+
+    ADJUST_PRODUCT_STOCK = """
+        UPDATE products
+        SET stock = stock + $2, updated_at = now()
+        WHERE id = $1 AND stock + $2 >= 0
+        RETURNING stock;
+    """
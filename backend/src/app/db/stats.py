@@ -0,0 +1,238 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import orjson
+
+from app.core.config import settings
+from app.core.deadlines import within_deadline
+from app.core.logger import get_logger
+from app.db.queries import Queries
+
+slow_query_logger = get_logger("slow_query")
+
+# Geometric latency buckets (10% wide) from 10us to ~100s
+BUCKET_BOUNDS_MS = [0.01 * 1.1**i for i in range(170)]
+
+
+def redact(value: Any) -> Any:
+    """Replace a query parameter with a description of its type"""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return f"<{type(value).__name__}>"
+    if isinstance(value, (str, bytes, list, tuple, set)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    return f"<{type(value).__name__}>"
+
+
+def _encode_default(value: Any) -> Any:
+    # asyncpg records encode as their values; anything else as its str
+    values = getattr(value, "values", None)
+    return list(values()) if callable(values) else str(value)
+
+
+def _payload_size(data: Any) -> int:
+    try:
+        return len(orjson.dumps(data, default=_encode_default))
+    except TypeError:
+        return 0
+
+
+class QueryStats:
+    """Running counters for one named query
+
+    Result sizes are only measured for sampled calls; ``bytes`` extrapolates
+    their bytes per row to every row returned.
+    """
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "total_ms",
+        "max_ms",
+        "rows",
+        "sampled_rows",
+        "sampled_bytes",
+        "buckets",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.sampled_rows = 0
+        self.sampled_bytes = 0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    @property
+    def bytes(self) -> int:
+        if not self.sampled_rows:
+            return 0
+        return round(self.sampled_bytes * self.rows / self.sampled_rows)
+
+    def record(
+        self, elapsed_ms: float, rows: int, nbytes: Optional[int], error: bool
+    ) -> None:
+        self.calls += 1
+        self.errors += error
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        if nbytes is not None:
+            self.sampled_rows += rows
+            self.sampled_bytes += nbytes
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile"""
+        if not self.calls:
+            return 0.0
+        rank = q / 100 * self.calls
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "bytes": self.bytes,
+        }
+
+
+class QueryRegistry:
+    """Named database operations with pg_stat_statements-style counters
+
+    SQL statements are registered once by name; PostgREST calls are named at
+    the call site. Every execution updates the counters for its name, and
+    executions slower than ``slow_query_ms`` are logged with their
+    parameters redacted to types and sizes. The result of every
+    ``size_sample_every``-th execution of a name is encoded to measure it.
+    """
+
+    _sql: Dict[str, str] = {}
+    _stats: Dict[str, QueryStats] = {}
+    slow_query_ms: float = settings.SLOW_QUERY_MS
+    size_sample_every: int = settings.QUERY_SIZE_SAMPLE_EVERY
+
+    @classmethod
+    def register(cls, name: str, sql: str) -> None:
+        cls._sql[name] = sql
+
+    @classmethod
+    def register_queries(cls, queries: type) -> None:
+        """Register every upper-case string attribute of ``queries``"""
+        for name, sql in vars(queries).items():
+            if name.isupper() and isinstance(sql, str):
+                cls.register(name, sql)
+
+    @classmethod
+    def sql(cls, name: str) -> str:
+        try:
+            return cls._sql[name]
+        except KeyError:
+            raise KeyError(f"Unknown query {name}") from None
+
+    @classmethod
+    def record(
+        cls,
+        name: str,
+        elapsed_ms: float,
+        rows: int = 0,
+        payload: Any = None,
+        params: Union[Sequence[Any], Dict[str, Any]] = (),
+        error: bool = False,
+    ) -> None:
+        stats = cls._stats.get(name)
+        if stats is None:
+            stats = cls._stats[name] = QueryStats()
+        nbytes = None
+        if not error and stats.calls % cls.size_sample_every == 0:
+            nbytes = _payload_size(payload)
+        stats.record(elapsed_ms, rows, nbytes, error)
+        if elapsed_ms >= cls.slow_query_ms:
+            if isinstance(params, dict):
+                redacted = redact(params)
+            else:
+                redacted = [redact(param) for param in params]
+            slow_query_logger.warning(
+                f"Slow query {name}: {elapsed_ms:.1f}ms rows={rows} params={redacted}"
+            )
+
+    @classmethod
+    def stats(cls, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per-name counters, most total time first"""
+        ranked = sorted(cls._stats.items(), key=lambda kv: kv[1].total_ms, reverse=True)
+        return [{"name": name, **stats.to_dict()} for name, stats in ranked[:limit]]
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._stats.clear()
+
+
+QueryRegistry.register_queries(Queries)
+
+
+def _row_count(result: Any) -> int:
+    if isinstance(result, list):
+        return len(result)
+    return 0 if result is None else 1
+
+
+def _asyncpg_result(method: str, result: Any) -> Tuple[int, Any]:
+    """Row count and measurable payload of an asyncpg result"""
+    if method == "execute":
+        # Command status such as "UPDATE 3"
+        count = result.rsplit(" ", 1)[-1]
+        return int(count) if count.isdigit() else 0, None
+    return _row_count(result), result
+
+
+async def run_query(conn, name: str, *args: Any, method: str = "fetch") -> Any:
+    """Run registered SQL ``name`` through an asyncpg connection method"""
+    sql = QueryRegistry.sql(name)
+    started = time.perf_counter()
+    try:
+        result = await within_deadline(getattr(conn, method)(sql, *args))
+    except Exception:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        QueryRegistry.record(name, elapsed_ms, params=args, error=True)
+        raise
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    rows, payload = _asyncpg_result(method, result)
+    QueryRegistry.record(name, elapsed_ms, rows, payload, args)
+    return result
+
+
+async def run_postgrest(
+    name: str, build: Callable[[], Any], params: Optional[Dict[str, Any]] = None
+) -> Any:
+    """Build and execute a PostgREST request off the event loop, under ``name``"""
+    params = params or {}
+    started = time.perf_counter()
+    try:
+        response = await within_deadline(
+            asyncio.to_thread(lambda: build().execute())
+        )
+    except Exception:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        QueryRegistry.record(name, elapsed_ms, params=params, error=True)
+        raise
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    data = response.data
+    QueryRegistry.record(name, elapsed_ms, _row_count(data), data, params)
+    return response
@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.core.logger import get_logger
+from app.db.base import SupabaseDB
+from app.db.stats import run_postgrest
+
+logger = get_logger(__name__)
+
+Sink = Callable[[List[Dict[str, Any]]], Any]
+
+
+class TableSync:
+    """Mirrors a Supabase table into in-process structures by polling updated_at
+
+    The first sync pages through the whole table; later ones only fetch rows
+    changed since the newest ``updated_at`` seen. Every subscribed sink
+    receives each fetched page.
+    """
+
+    PAGE_SIZE = 1000
+
+    def __init__(self, table: str, interval: float = 30):
+        self.table = table
+        self.interval = interval
+        self.columns = {"id", "updated_at"}
+        self.sinks: List[Sink] = []
+        self.updated_after: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, sink: Sink, columns: Iterable[str] = ()) -> Sink:
+        """Feed fetched pages to ``sink``, selecting ``columns`` as well"""
+        self.columns.update(columns)
+        self.sinks.append(sink)
+        return sink
+
+    def _query(self, start: int, updated_after: Optional[str]) -> Any:
+        query = (
+            SupabaseDB.get_client()
+            .table(self.table)
+            .select(", ".join(sorted(self.columns)))
+        )
+        if updated_after:
+            query = query.gt("updated_at", updated_after)
+        return query.order("id").range(start, start + self.PAGE_SIZE - 1)
+
+    async def sync(self) -> int:
+        """Deliver every row changed since the last sync (all of them initially)"""
+        updated_after = self.updated_after
+        start, loaded = 0, 0
+        while True:
+            response = await run_postgrest(
+                f"{self.table}.sync",
+                lambda: self._query(start, updated_after),
+                {"start": start, "updated_after": updated_after},
+            )
+            rows = response.data
+            for sink in self.sinks:
+                sink(rows)
+            loaded += len(rows)
+            for row in rows:
+                stamp = row.get("updated_at")
+                if stamp and (self.updated_after is None or stamp > self.updated_after):
+                    self.updated_after = stamp
+            if len(rows) < self.PAGE_SIZE:
+                return loaded
+            start += self.PAGE_SIZE
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"Sync of {self.table} failed: {str(e)}")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
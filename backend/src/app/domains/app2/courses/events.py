@@ -0,0 +1,48 @@
+from typing import Any, Dict, List
+
+from app.core.events import event_hub
+from app.domains.app2.courses.scheduling import course_sync, session_sync
+
+COURSES_TOPIC = "app2:courses"
+
+
+def course_topic(course_id: int) -> str:
+    return f"app2:course:{course_id}"
+
+
+@course_sync.subscribe
+def publish_course_updates(rows: List[Dict[str, Any]]) -> None:
+    """Announce courses changed in the database; rapid edits coalesce"""
+    for row in rows:
+        course_id = int(row["id"])
+        event_hub.publish(
+            [COURSES_TOPIC, course_topic(course_id)],
+            "course.updated",
+            {
+                "course_id": course_id,
+                "instructor_id": row.get("instructor_id"),
+                "schedule": row.get("schedule"),
+                "updated_at": row.get("updated_at"),
+            },
+            key=course_id,
+        )
+
+
+@session_sync.subscribe
+def publish_session_updates(rows: List[Dict[str, Any]]) -> None:
+    """Announce sessions booked (or moved) on any worker, once they are stored"""
+    for row in rows:
+        course_id = int(row["course_id"])
+        event_hub.publish(
+            [COURSES_TOPIC, course_topic(course_id)],
+            "session.scheduled",
+            {
+                "session_id": row["id"],
+                "course_id": course_id,
+                "instructor_id": row.get("instructor_id"),
+                "start": row.get("starts_at"),
+                "end": row.get("ends_at"),
+                "updated_at": row.get("updated_at"),
+            },
+            key=row["id"],
+        )
@@ -0,0 +1,27 @@
+from typing import List
+
+from app.core.instrumentation import instrument
+from app.db.base import SupabaseDB
+from app.db.stats import run_postgrest
+
+
+class CourseRepository:
+    """PostgREST access to the courses table"""
+
+    __slots__ = ("db",)
+
+    def __init__(self):
+        self.db = SupabaseDB.get_client()
+
+    @instrument
+    async def list(self, limit: int = 100, offset: int = 0) -> List[dict]:
+        response = await run_postgrest(
+            "courses.list",
+            lambda: self.db.table("courses")
+            .select("*")
+            .order("id")
+            .range(offset, offset + limit - 1),
+            {"limit": limit, "offset": offset},
+        )
+
+        return response.data
@@ -0,0 +1,347 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from postgrest.exceptions import APIError
+
+from app.core.config import settings
+from app.core.container import Container
+from app.core.logger import get_logger
+from app.db.base import SupabaseDB
+from app.db.stats import run_postgrest
+from app.db.sync import TableSync
+from app.domains.app2.courses.models import Course
+from app.utils.timestamps import from_timestamp, to_timestamp
+
+logger = get_logger(__name__)
+
+DEFAULT_SESSION_MINUTES = 60
+# Postgres exclusion_violation, raised by the course_sessions overlap constraint
+EXCLUSION_VIOLATION = "23P01"
+
+Session = Tuple[float, float, int]  # start, end, course id
+
+
+class ScheduleConflictError(Exception):
+    """Raised when a booking overlaps an instructor's existing sessions"""
+
+    def __init__(self, conflicts: List[Dict[str, Any]]):
+        self.conflicts = conflicts
+        super().__init__(f"Session overlaps {len(conflicts)} existing session(s)")
+
+
+class BookingStore(ABC):
+    """Where booked sessions are persisted"""
+
+    @abstractmethod
+    async def insert(
+        self, course_id: int, instructor_id: int, start: datetime, end: datetime
+    ) -> Dict[str, Any]:
+        """Store a session and return its row
+
+        Raises ScheduleConflictError if it overlaps a stored session of the
+        same instructor.
+        """
+
+
+class SupabaseBookingStore(BookingStore):
+    async def insert(
+        self, course_id: int, instructor_id: int, start: datetime, end: datetime
+    ) -> Dict[str, Any]:
+        row = {
+            "course_id": course_id,
+            "instructor_id": instructor_id,
+            "starts_at": start.isoformat(),
+            "ends_at": end.isoformat(),
+        }
+        try:
+            response = await run_postgrest(
+                "course_sessions.insert",
+                lambda: SupabaseDB.get_client().table("course_sessions").insert(row),
+                row,
+            )
+        except APIError as e:
+            if e.code == EXCLUSION_VIOLATION:
+                # Booked by another worker since this one last synced
+                raise ScheduleConflictError([]) from e
+            raise
+        return response.data[0]
+
+
+class InstructorCalendar:
+    """Sessions of one instructor kept as parallel arrays sorted by start
+
+    Any session overlapping [start, end) must start in
+    [start - longest_session, end), so lookups are two bisects plus a scan of
+    the sessions that actually match.
+    """
+
+    __slots__ = ("starts", "ends", "course_ids", "longest")
+
+    def __init__(self):
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.course_ids: List[int] = []
+        self.longest = 0.0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def load(self, sessions: Iterable[Tuple[float, float, int]]) -> None:
+        """Replace all sessions at once (one sort instead of n inserts)"""
+        ordered = sorted(sessions)
+        self.starts = [s[0] for s in ordered]
+        self.ends = [s[1] for s in ordered]
+        self.course_ids = [s[2] for s in ordered]
+        self.longest = max((end - start for start, end, _ in ordered), default=0.0)
+
+    def add(self, start: float, end: float, course_id: int) -> None:
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.course_ids.insert(i, course_id)
+        self.longest = max(self.longest, end - start)
+
+    def overlapping(self, start: float, end: float) -> List[Tuple[float, float, int]]:
+        lo = bisect_left(self.starts, start - self.longest)
+        hi = bisect_left(self.starts, end)
+        return [
+            (self.starts[i], self.ends[i], self.course_ids[i])
+            for i in range(lo, hi)
+            if self.ends[i] > start
+        ]
+
+    def has_conflict(self, start: float, end: float) -> bool:
+        lo = bisect_left(self.starts, start - self.longest)
+        hi = bisect_left(self.starts, end)
+        return any(self.ends[i] > start for i in range(lo, hi))
+
+    def free_slots(
+        self, start: float, end: float, duration: float
+    ) -> List[Tuple[float, float]]:
+        """Gaps of at least ``duration`` inside [start, end)"""
+        slots = []
+        cursor = start
+        for busy_start, busy_end, _ in self.overlapping(start, end):
+            if busy_start - cursor >= duration:
+                slots.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if end - cursor >= duration:
+            slots.append((cursor, end))
+        return slots
+
+
+class SchedulingEngine:
+    """Per-instructor session index for conflict and availability checks
+
+    Course schedules come from the course sync and booked sessions from the
+    course_sessions sync, so every worker converges on the same calendars.
+    Bookings are checked against this index first and then stored, where a
+    constraint rejects overlaps with sessions other workers booked since
+    their last sync.
+    """
+
+    def __init__(
+        self,
+        session_minutes: int = DEFAULT_SESSION_MINUTES,
+        store: Optional[BookingStore] = None,
+    ):
+        self.session_length = session_minutes * 60.0
+        self.store = store or SupabaseBookingStore()
+        self._calendars: Dict[int, InstructorCalendar] = {}
+        self._course_instructor: Dict[int, int] = {}
+        # course id -> session id -> (instructor id, start, end) of bookings
+        self._booked: Dict[int, Dict[int, Tuple[int, float, float]]] = {}
+
+    def calendar(self, instructor_id: int) -> InstructorCalendar:
+        calendar = self._calendars.get(instructor_id)
+        if calendar is None:
+            calendar = self._calendars[instructor_id] = InstructorCalendar()
+        return calendar
+
+    def _sessions(self, course: Dict[str, Any]) -> List[Session]:
+        return [
+            (start, start + self.session_length, int(course["id"]))
+            for start in map(to_timestamp, course.get("schedule") or [])
+        ]
+
+    def _rebuild(
+        self,
+        instructor_id: int,
+        keep: Callable[[Session], bool],
+        added: Iterable[Session],
+    ) -> None:
+        calendar = self.calendar(instructor_id)
+        sessions = [
+            session
+            for session in zip(calendar.starts, calendar.ends, calendar.course_ids)
+            if keep(session)
+        ]
+        sessions.extend(added)
+        # A booking that is also in the synced schedule is one session
+        calendar.load(dict.fromkeys(sessions))
+
+    def load_courses(self, courses: Iterable[Union[Course, Dict[str, Any]]]) -> int:
+        """Bulk-load (or reload) courses, sorting each touched calendar once
+
+        A reloaded course's scheduled sessions are replaced; its bookings
+        are kept.
+        """
+        grouped: Dict[int, List[Session]] = {}
+        stale: Dict[int, Set[int]] = {}  # instructor id -> course ids to drop
+        loaded = 0
+        for course in courses:
+            data = course.dict() if isinstance(course, Course) else course
+            course_id = int(data["id"])
+            instructor_id = int(data["instructor_id"])
+            previous = self._course_instructor.get(course_id)
+            if previous is not None:
+                stale.setdefault(previous, set()).add(course_id)
+            self._course_instructor[course_id] = instructor_id
+            grouped.setdefault(instructor_id, []).extend(self._sessions(data))
+            for booked_by, start, end in self._booked.get(course_id, {}).values():
+                stale.setdefault(booked_by, set()).add(course_id)
+                grouped.setdefault(booked_by, []).append((start, end, course_id))
+            loaded += 1
+        for instructor_id in stale.keys() | grouped.keys():
+            dropped = stale.get(instructor_id, set())
+            self._rebuild(
+                instructor_id,
+                lambda session: session[2] not in dropped,
+                grouped.get(instructor_id, ()),
+            )
+        return loaded
+
+    def load_sessions(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Merge booked sessions (course_sessions rows), sorting calendars once"""
+        stale: Dict[int, Set[Session]] = {}
+        added: Dict[int, List[Session]] = {}
+        loaded = 0
+        for row in rows:
+            session_id, course_id = int(row["id"]), int(row["course_id"])
+            booking = (
+                int(row["instructor_id"]),
+                to_timestamp(row["starts_at"]),
+                to_timestamp(row["ends_at"]),
+            )
+            booked = self._booked.setdefault(course_id, {})
+            previous = booked.get(session_id)
+            if previous == booking:
+                continue  # Already known, e.g. booked by this worker
+            if previous is not None:
+                stale.setdefault(previous[0], set()).add(
+                    (previous[1], previous[2], course_id)
+                )
+            booked[session_id] = booking
+            added.setdefault(booking[0], []).append((booking[1], booking[2], course_id))
+            loaded += 1
+        for instructor_id in stale.keys() | added.keys():
+            dropped = stale.get(instructor_id, set())
+            self._rebuild(
+                instructor_id,
+                lambda session: session not in dropped,
+                added.get(instructor_id, ()),
+            )
+        return loaded
+
+    def conflicts(
+        self, instructor_id: int, start: datetime, minutes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        begin = to_timestamp(start)
+        end = begin + (minutes * 60.0 if minutes else self.session_length)
+        calendar = self._calendars.get(instructor_id)
+        if calendar is None:
+            return []
+        return [
+            {
+                "course_id": course_id,
+                "start": from_timestamp(s),
+                "end": from_timestamp(e),
+            }
+            for s, e, course_id in calendar.overlapping(begin, end)
+        ]
+
+    def booked_sessions(self, course_id: int) -> List[Dict[str, Any]]:
+        """Stored bookings of a course, by start"""
+        return [
+            {
+                "session_id": session_id,
+                "instructor_id": instructor_id,
+                "start": from_timestamp(start),
+                "end": from_timestamp(end),
+            }
+            for session_id, (instructor_id, start, end) in sorted(
+                self._booked.get(course_id, {}).items(), key=lambda item: item[1][1]
+            )
+        ]
+
+    async def book(
+        self,
+        instructor_id: int,
+        course_id: int,
+        start: datetime,
+        minutes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Store a session unless it overlaps the instructor's sessions"""
+        begin = to_timestamp(start)
+        end = begin + (minutes * 60.0 if minutes else self.session_length)
+        calendar = self.calendar(instructor_id)
+        if calendar.has_conflict(begin, end):
+            raise ScheduleConflictError(self.conflicts(instructor_id, start, minutes))
+        row = await self.store.insert(
+            course_id, instructor_id, from_timestamp(begin), from_timestamp(end)
+        )
+        self.load_sessions([row])
+        return {
+            "session_id": row["id"],
+            "course_id": course_id,
+            "start": from_timestamp(begin),
+            "end": from_timestamp(end),
+        }
+
+    def free_slots(
+        self,
+        instructor_id: int,
+        start: datetime,
+        end: datetime,
+        minutes: Optional[int] = None,
+    ) -> List[Dict[str, datetime]]:
+        duration = minutes * 60.0 if minutes else self.session_length
+        calendar = self._calendars.get(instructor_id) or InstructorCalendar()
+        return [
+            {"start": from_timestamp(s), "end": from_timestamp(e)}
+            for s, e in calendar.free_slots(
+                to_timestamp(start), to_timestamp(end), duration
+            )
+        ]
+
+
+scheduling_engine = SchedulingEngine()
+
+
+course_sync = TableSync("courses")
+course_sync.subscribe(scheduling_engine.load_courses, ("instructor_id", "schedule"))
+
+session_sync = TableSync("course_sessions", settings.COURSE_SESSION_SYNC_SECONDS)
+session_sync.subscribe(
+    scheduling_engine.load_sessions,
+    ("course_id", "instructor_id", "starts_at", "ends_at"),
+)
+
+
+@Container.on_startup
+async def build_scheduling_engine(container: Container) -> None:
+    try:
+        courses = await course_sync.sync()
+        sessions = await session_sync.sync()
+        logger.info(f"Scheduling engine loaded {courses} courses, {sessions} bookings")
+    finally:
+        await course_sync.start()
+        await session_sync.start()
+
+
+@Container.on_shutdown
+async def stop_course_sync(container: Container) -> None:
+    await course_sync.stop()
+    await session_sync.stop()
@@ -1,21 +1,117 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
 from app.core.apps import AppFeature
+from app.core.deadlines import request_budget
+from app.core.events import EventStreamResponse, event_hub
 from app.core.deps import get_current_app, require_feature
+from app.domains.app2.courses.events import (
+    COURSES_TOPIC,
+    course_topic,
+)
+from app.domains.app2.courses.repository import CourseRepository
+from app.domains.app2.courses.scheduling import (
+    ScheduleConflictError,
+    scheduling_engine,
+)
 
 router = APIRouter(prefix="/app2")
 
 
+class ScheduleRequest(BaseModel):
+    course_id: int
+    instructor_id: int
+    start: datetime
+    duration_minutes: Optional[int] = Field(None, gt=0, le=24 * 60)
+
+
 @router.get("/courses")
 async def list_courses(
-    app=Depends(get_current_app), _=Depends(require_feature(AppFeature.SCHEDULING))
+    limit: int = Query(100, gt=0, le=1000),
+    offset: int = Query(0, ge=0),
+    courses: CourseRepository = Depends(CourseRepository),
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.SCHEDULING)),
 ):
-    """List courses for app2"""
-    return {"courses": [], "app": "app2"}
+    """List courses for app2, each with its booked sessions"""
+    rows = await courses.list(limit=limit, offset=offset)
+    return {
+        "courses": [
+            {**row, "sessions": scheduling_engine.booked_sessions(int(row["id"]))}
+            for row in rows
+        ],
+        "app": "app2",
+    }
+
+
+@router.get("/courses/events", dependencies=[Depends(request_budget(None))])
+async def course_events(
+    course_id: Optional[List[int]] = Query(None),
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.SCHEDULING)),
+):
+    """Server-sent course and session updates, for all or the given courses
+
+    Replaces polling /courses: clients fetch once, then apply events, and
+    refetch when they receive ``resync``.
+    """
+    topics = [course_topic(cid) for cid in course_id] if course_id else [COURSES_TOPIC]
+    return EventStreamResponse(event_hub, event_hub.subscribe(topics))
 
 
 @router.post("/schedule")
 async def schedule_session(
-    app=Depends(get_current_app), _=Depends(require_feature(AppFeature.VIDEOCONFERENCE))
+    request: ScheduleRequest,
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.VIDEOCONFERENCE)),
+):
+    """Schedule a video session for app2
+
+    Bookings are stored in course_sessions, whose exclusion constraint
+    rejects overlaps booked on other workers, and reach the other workers'
+    calendars through the session sync.
+    """
+    try:
+        session = await scheduling_engine.book(
+            request.instructor_id,
+            request.course_id,
+            request.start,
+            request.duration_minutes,
+        )
+    except ScheduleConflictError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "conflicts": jsonable_encoder(e.conflicts)},
+        )
+    return {"status": "scheduled", "app": "app2", "session": session}
+
+
+@router.get("/instructors/{instructor_id}/availability")
+async def instructor_availability(
+    instructor_id: int,
+    start: datetime,
+    end: datetime,
+    duration_minutes: Optional[int] = Query(None, gt=0, le=24 * 60),
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.SCHEDULING)),
+):
+    """Free slots for an instructor between start and end"""
+    if end <= start:
+        raise HTTPException(status_code=422, detail="end must be after start")
+    slots = scheduling_engine.free_slots(instructor_id, start, end, duration_minutes)
+    return {"instructor_id": instructor_id, "free_slots": slots, "app": "app2"}
+
+
+@router.get("/instructors/{instructor_id}/sessions")
+async def overlapping_sessions(
+    instructor_id: int,
+    start: datetime,
+    duration_minutes: Optional[int] = Query(None, gt=0, le=24 * 60),
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.SCHEDULING)),
 ):
-    """Schedule a video session for app2"""
-    return {"status": "scheduled", "app": "app2"}
+    """Sessions of an instructor overlapping the given window"""
+    sessions = scheduling_engine.conflicts(instructor_id, start, duration_minutes)
+    return {"instructor_id": instructor_id, "sessions": sessions, "app": "app2"}
@@ -1,5 +1,9 @@
+import asyncio
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
-from app.core.apps import AppFeature
+from app.core.auth import get_current_session
+from app.core.apps import AppFeature, AppRegistry
+from app.core.deadlines import DeadlineExceeded, run_to_completion, within_deadline
 from app.core.deps import get_current_app
 from app.services.auth.service import AuthService
 from app.services.auth.schemas import SignUpRequest, SignInRequest
@@ -7,7 +11,9 @@ from app.core.logger import get_logger
 from app.core.dependencies import require_feature
 from app.core.route_validator import validate_api_prefix
 from pydantic import BaseModel
+from app.core.quotas import QuotaExceededError, quota_manager
 from app.core.supabase import supabase
+from app.services.auth.sessions import SessionEntry, session_store
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,12 +31,23 @@ class SignInRequest(BaseModel):
     password: str
 
 
+async def _reserved_sign_up(app_id: Optional[str], credentials: dict):
+    # The signup thread cannot be cancelled, so the slot is held until it ends
+    async with quota_manager.reservation(app_id, "users"):
+        return await asyncio.to_thread(supabase.auth.sign_up, credentials)
+
+
 @router.post("/signup")
 async def sign_up(request: SignUpRequest):
     logger.info(f"Signup attempt for email: {request.email}")
+    app = AppRegistry.get_current_app()
+    credentials = {"email": request.email, "password": request.password}
+    if app:
+        # Lets the users quota count each app's signups
+        credentials["options"] = {"data": {"app_id": app.id}}
     try:
-        result = supabase.auth.sign_up(
-            {"email": request.email, "password": request.password}
+        result = await run_to_completion(
+            _reserved_sign_up(app.id if app else None, credentials)
         )
         logger.info(f"Signup successful for email: {request.email}")
         return {
@@ -38,6 +55,11 @@ async def sign_up(request: SignUpRequest):
             "message": "Signup successful! Please check your email.",
             "data": result.user,
         }
+    except QuotaExceededError as e:
+        logger.warning(f"Signup rejected for email {request.email}: {str(e)}")
+        raise HTTPException(status_code=403, detail="User limit reached")
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         logger.error(f"Signup failed for email {request.email}: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -47,16 +69,31 @@ async def sign_up(request: SignUpRequest):
 async def sign_in(request: SignInRequest):
     logger.info(f"Login attempt for email: {request.email}")
     try:
-        result = supabase.auth.sign_in_with_password(
-            {"email": request.email, "password": request.password}
+        result = await within_deadline(
+            asyncio.to_thread(
+                supabase.auth.sign_in_with_password,
+                {"email": request.email, "password": request.password},
+            )
         )
+        entry = await session_store.create(result.session)
         logger.info(f"Login successful for email: {request.email}")
+        # The server owns the Supabase tokens and refreshes them; clients
+        # authenticate with the session id (X-Session-Id header)
         return {
             "status": "success",
             "message": "Login successful!",
             "data": result.user,
-            "session": result.session,
+            "session_id": entry.session_id,
+            "expires_in": session_store.ttl,
         }
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         logger.error(f"Login failed for email {request.email}: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/signout")
+async def sign_out(session: SessionEntry = Depends(get_current_session)):
+    await session_store.revoke(session.session_id)
+    return {"status": "success", "message": "Signed out"}
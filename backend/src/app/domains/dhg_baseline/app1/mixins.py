@@ -1,28 +1,77 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.core.idempotency import fingerprint, idempotency_store
 from app.core.mixins.base import BaseMixin
+from app.domains.dhg_baseline.app1.products.inventory import inventory
 
 
 class PaymentProcessingMixin(BaseMixin):
-    """Mixin for payment processing capabilities"""
+    """Mixin for payment processing capabilities
+
+    Passing an ``idempotency_key`` makes retries replay the first result
+    instead of charging or refunding again. Services override
+    ``execute_payment`` and ``execute_refund`` with the provider calls; the
+    defaults raise, so nothing is recorded as a successful result.
+    """
+
+    __slots__ = ()
 
     async def process_payment(
-        self, amount: float, currency: str, payment_method: str, user_id: str
+        self,
+        amount: float,
+        currency: str,
+        payment_method: str,
+        user_id: str,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
-        # Implement payment processing logic
-        pass
+        if not idempotency_key:
+            return await self.execute_payment(amount, currency, payment_method, user_id)
+        result, _ = await idempotency_store.run(
+            f"payment:{user_id}:{idempotency_key}",
+            fingerprint(amount, currency, payment_method),
+            lambda: self.execute_payment(amount, currency, payment_method, user_id),
+        )
+        return result
 
     async def refund_payment(
+        self,
+        payment_id: str,
+        amount: float,
+        reason: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if not idempotency_key:
+            return await self.execute_refund(payment_id, amount, reason)
+        result, _ = await idempotency_store.run(
+            f"refund:{payment_id}:{idempotency_key}",
+            fingerprint(amount, reason),
+            lambda: self.execute_refund(payment_id, amount, reason),
+        )
+        return result
+
+    async def execute_payment(
+        self, amount: float, currency: str, payment_method: str, user_id: str
+    ) -> Dict[str, Any]:
+        raise NotImplementedError(f"{type(self).__name__} has no payment provider")
+
+    async def execute_refund(
         self, payment_id: str, amount: float, reason: str
     ) -> Dict[str, Any]:
-        # Implement refund logic
-        pass
+        raise NotImplementedError(f"{type(self).__name__} has no refund provider")
 
 
 class ProductManagementMixin(BaseMixin):
     """Mixin for product management capabilities"""
 
+    __slots__ = ()
+
+    INVENTORY_ACTIONS = {"adjust": 1, "add": 1, "remove": -1}
+
     async def update_inventory(
-        self, product_id: str, quantity: int, action: str
-    ) -> None:
-        # Implement inventory management logic
-        pass
+        self, product_id: str, quantity: int, action: str, user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Apply a stock change; raises InsufficientStockError on oversell"""
+        sign = self.INVENTORY_ACTIONS.get(action)
+        if sign is None:
+            raise ValueError(f"Unknown inventory action: {action}")
+        stock = await inventory.adjust(int(product_id), sign * quantity, user_id)
+        return {"product_id": product_id, "stock": stock}
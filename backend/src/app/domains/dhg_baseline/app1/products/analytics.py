@@ -0,0 +1,246 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.domains.dhg_baseline.app1.products.models import Product
+from app.domains.dhg_baseline.app1.products.sync import (
+    product_deletions,
+    product_sync,
+)
+from app.utils.timestamps import from_timestamp, to_timestamp
+
+DAY = 24 * 60 * 60
+WEEK = 7 * DAY
+# The epoch fell on a Thursday; shift by three days so weeks start on Monday
+WEEK_OFFSET = 3 * DAY
+
+PERCENTILES = (50, 90, 95, 99)
+# Upper bound on fixed-width price buckets, which are allocated densely
+MAX_BUCKETS = 1000
+
+
+class ProductColumns:
+    """Columnar snapshot of the products table for reporting
+
+    Each field lives in its own contiguous array (timestamps as epoch
+    seconds), grown geometrically and updated in place, so every aggregate is
+    a handful of vectorized passes over 8 bytes per product per column.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._rows: Dict[int, int] = {}
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._prices = np.empty(capacity, dtype=np.float64)
+        self._created = np.empty(capacity, dtype=np.float64)
+        self._updated = np.empty(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._rows
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            column.nbytes
+            for column in (self._ids, self._prices, self._created, self._updated)
+        )
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_ids", "_prices", "_created", "_updated"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            setattr(self, name, grown)
+
+    def upsert_many(self, products: Iterable[Union[Product, Dict[str, Any]]]) -> int:
+        """Insert or update products, writing each column in one assignment"""
+        positions: List[int] = []
+        ids: List[int] = []
+        prices: List[float] = []
+        created: List[float] = []
+        updated: List[float] = []
+        size = self._size
+        for product in products:
+            data = product.dict() if isinstance(product, Product) else product
+            product_id = int(data["id"])
+            position = self._rows.get(product_id)
+            if position is None:
+                position = self._rows[product_id] = size
+                size += 1
+            positions.append(position)
+            ids.append(product_id)
+            prices.append(float(data.get("price") or 0.0))
+            created.append(to_timestamp(data.get("created_at")))
+            updated.append(to_timestamp(data.get("updated_at")))
+        if not positions:
+            return 0
+        self._reserve(size)
+        self._size = size
+        index = np.asarray(positions, dtype=np.int64)
+        self._ids[index] = ids
+        self._prices[index] = prices
+        self._created[index] = created
+        self._updated[index] = updated
+        return len(positions)
+
+    def remove(self, product_id: int) -> None:
+        """Drop a product by moving the last row into its slot"""
+        position = self._rows.pop(product_id, None)
+        if position is None:
+            return
+        last = self._size - 1
+        if position != last:
+            for column in (self._ids, self._prices, self._created, self._updated):
+                column[position] = column[last]
+            self._rows[int(self._ids[position])] = position
+        self._size = last
+
+    def remove_many(self, products: Iterable[Dict[str, Any]]) -> None:
+        for product in products:
+            self.remove(int(product["id"]))
+
+    def _select(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """Row mask for the given filters over the live part of the arrays"""
+        prices = self._prices[: self._size]
+        created = self._created[: self._size]
+        mask = np.ones(self._size, dtype=bool)
+        if min_price is not None:
+            mask &= prices >= min_price
+        if max_price is not None:
+            mask &= prices <= max_price
+        if created_after is not None:
+            mask &= created >= to_timestamp(created_after)
+        if created_before is not None:
+            mask &= created < to_timestamp(created_before)
+        return mask
+
+    def _column(
+        self, column: np.ndarray, mask: Optional[np.ndarray], filters: Dict[str, Any]
+    ) -> np.ndarray:
+        if mask is None:
+            mask = self._select(**filters)
+        return column[: self._size][mask]
+
+    def summary(
+        self, _mask: Optional[np.ndarray] = None, **filters: Any
+    ) -> Dict[str, Any]:
+        prices = self._column(self._prices, _mask, filters)
+        if not len(prices):
+            return {"count": 0}
+        percentiles = np.percentile(prices, PERCENTILES)
+        return {
+            "count": int(len(prices)),
+            "avg_price": round(float(prices.mean()), 2),
+            "min_price": float(prices.min()),
+            "max_price": float(prices.max()),
+            "percentiles": {
+                f"p{p}": round(float(value), 2)
+                for p, value in zip(PERCENTILES, percentiles)
+            },
+        }
+
+    def price_buckets(
+        self,
+        width: Optional[float] = None,
+        buckets: int = 10,
+        edges: Optional[Sequence[float]] = None,
+        _mask: Optional[np.ndarray] = None,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """Product counts per price range
+
+        Ranges are either fixed ``width`` steps from zero, explicit ``edges``
+        or ``buckets`` equal slices of the observed price range. Raises
+        ValueError if ``width`` would need more than MAX_BUCKETS ranges.
+        """
+        prices = self._column(self._prices, _mask, filters)
+        if not len(prices):
+            return []
+        if width:
+            span = (float(prices.max()) - float(prices.min())) / width + 1
+            if not span <= MAX_BUCKETS:  # Also rejects inf/NaN from tiny widths
+                raise ValueError(
+                    f"Bucket width {width} would need {span:.0f} buckets "
+                    f"(at most {MAX_BUCKETS})"
+                )
+            slots = np.floor(prices / width).astype(np.int64)
+            first = int(slots.min())
+            counts = np.bincount(slots - first)
+            return [
+                {
+                    "min": (first + i) * width,
+                    "max": (first + i + 1) * width,
+                    "count": int(c),
+                }
+                for i, c in enumerate(counts)
+                if c
+            ]
+        bins = edges if edges is not None else buckets
+        counts, bounds = np.histogram(prices, bins=bins)
+        return [
+            {"min": float(bounds[i]), "max": float(bounds[i + 1]), "count": int(c)}
+            for i, c in enumerate(counts)
+        ]
+
+    def weekly_counts(
+        self, _mask: Optional[np.ndarray] = None, **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """Products created per ISO week (Monday start, UTC)"""
+        created = self._column(self._created, _mask, filters)
+        created = created[~np.isnan(created)]
+        if not len(created):
+            return []
+        weeks = ((created + WEEK_OFFSET) // WEEK).astype(np.int64)
+        first = int(weeks.min())
+        counts = np.bincount(weeks - first)
+        (present,) = np.nonzero(counts)
+        starts = (first + present) * WEEK - WEEK_OFFSET
+        return [
+            {"week_start": from_timestamp(float(start)), "count": int(count)}
+            for start, count in zip(starts, counts[present])
+        ]
+
+    def report(
+        self,
+        bucket_width: Optional[float] = None,
+        buckets: int = 10,
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """Summary, price buckets and weekly counts from one filter pass"""
+        mask = self._select(**filters)
+        return {
+            "summary": self.summary(_mask=mask),
+            "price_buckets": self.price_buckets(bucket_width, buckets, _mask=mask),
+            "created_per_week": self.weekly_counts(_mask=mask),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        updated = self._updated[: self._size]
+        updated = updated[~np.isnan(updated)]
+        return {
+            "products": self._size,
+            "bytes": self.nbytes,
+            "last_updated": (
+                from_timestamp(float(updated.max())) if len(updated) else None
+            ),
+        }
+
+
+product_columns = ProductColumns()
+product_sync.subscribe(product_columns.upsert_many, ("price", "created_at"))
+product_deletions.subscribe(product_columns.remove_many)
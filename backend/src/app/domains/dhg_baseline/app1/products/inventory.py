@@ -0,0 +1,387 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.container import Container
+from app.core.deadlines import detach, without_deadline
+from app.core.logger import get_logger
+from app.db.base import SupabaseDB
+from app.db.connection import PostgresDB
+from app.db.stats import run_postgrest, run_query
+
+logger = get_logger(__name__)
+
+# (product_id, committed stock, [(actor, delta), ...]) for one flushed batch
+FlushListener = Callable[[int, int, List[Tuple[Optional[str], int]]], Awaitable[None]]
+
+
+class InsufficientStockError(Exception):
+    """Raised when an adjustment would take stock below zero"""
+
+    def __init__(self, product_id: int, delta: int, available: int):
+        self.product_id = product_id
+        self.delta = delta
+        self.available = available
+        super().__init__(
+            f"Product {product_id} has {available} in stock, cannot apply {delta}"
+        )
+
+
+class ProductNotFoundError(Exception):
+    """Raised when stock is adjusted for a product that does not exist"""
+
+    def __init__(self, product_id: int):
+        self.product_id = product_id
+        super().__init__(f"Product {product_id} not found")
+
+
+class StockStore(ABC):
+    """Source of truth for stock levels"""
+
+    @abstractmethod
+    async def fetch(self, product_ids: List[int]) -> Dict[int, int]:
+        """Current stock of the given products that exist"""
+
+    @abstractmethod
+    async def adjust(self, product_id: int, delta: int) -> Optional[int]:
+        """Atomically add ``delta``; None if negative or no such product"""
+
+
+class SupabaseStockStore(StockStore):
+    async def fetch(self, product_ids: List[int]) -> Dict[int, int]:
+        response = await run_postgrest(
+            "products.fetch_stock",
+            lambda: SupabaseDB.get_client()
+            .table("products")
+            .select("id, stock")
+            .in_("id", product_ids),
+            {"ids": product_ids},
+        )
+        return {int(row["id"]): int(row["stock"] or 0) for row in response.data}
+
+    async def adjust(self, product_id: int, delta: int) -> Optional[int]:
+        params = {"p_product_id": product_id, "p_delta": delta}
+        response = await run_postgrest(
+            "products.adjust_stock",
+            lambda: SupabaseDB.get_client().rpc("adjust_product_stock", params),
+            params,
+        )
+        return response.data
+
+
+class PostgresStockStore(StockStore):
+    def __init__(self, db: PostgresDB):
+        self.db = db
+
+    async def fetch(self, product_ids: List[int]) -> Dict[int, int]:
+        async with self.db.pool.acquire() as conn:
+            rows = await run_query(conn, "GET_PRODUCT_STOCK", product_ids)
+        return {row["id"]: row["stock"] for row in rows}
+
+    async def adjust(self, product_id: int, delta: int) -> Optional[int]:
+        async with self.db.pool.acquire() as conn:
+            return await run_query(
+                conn, "ADJUST_PRODUCT_STOCK", product_id, delta, method="fetchval"
+            )
+
+
+class _Adjustment:
+    __slots__ = ("delta", "actor", "future")
+
+    def __init__(self, delta: int, actor: Optional[str], future: asyncio.Future):
+        self.delta = delta
+        self.actor = actor
+        self.future = future
+
+
+class _Ledger:
+    """In-memory view of one product: committed stock plus uncommitted deltas"""
+
+    __slots__ = (
+        "stock",
+        "reserved",
+        "pending",
+        "flushing",
+        "timer",
+        "loading",
+        "touched",
+    )
+
+    def __init__(self):
+        self.stock: Optional[int] = None
+        self.reserved = 0
+        self.pending: List[_Adjustment] = []
+        self.flushing = False
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.loading: Optional[asyncio.Future] = None
+        self.touched = time.monotonic()
+
+    @property
+    def available(self) -> int:
+        return (self.stock or 0) + self.reserved
+
+    @property
+    def idle(self) -> bool:
+        return not (self.pending or self.flushing or self.timer or self.loading)
+
+
+class InventoryEngine:
+    """Coalesces concurrent stock adjustments into one write per product
+
+    Adjustments are admitted against an in-memory ledger, so requests that
+    fit never wait for the database; one that would oversell is checked
+    again against freshly fetched stock before it is rejected. Admitted deltas are
+    buffered for ``window`` seconds and committed as a single guarded
+    ``stock = stock + net`` update; each caller then gets the stock level
+    after its own delta. If another worker drained the stock in the meantime
+    the guard rejects the batch, the ledger is reloaded and the batch is
+    re-admitted in arrival order. Idle ledgers are periodically reconciled
+    with the database and evicted once unused.
+    """
+
+    MAX_ATTEMPTS = 3
+    FETCH_CHUNK = 500
+
+    def __init__(
+        self,
+        store: Optional[StockStore] = None,
+        window: float = settings.INVENTORY_FLUSH_WINDOW_SECONDS,
+        reconcile_interval: float = settings.INVENTORY_RECONCILE_INTERVAL_SECONDS,
+        idle_ttl: float = settings.INVENTORY_LEDGER_IDLE_SECONDS,
+    ):
+        self.store = store or SupabaseStockStore()
+        self.window = window
+        self.reconcile_interval = reconcile_interval
+        self.idle_ttl = idle_ttl
+        self.listeners: List[FlushListener] = []
+        self._ledgers: Dict[int, _Ledger] = {}
+        self._flushes: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def on_flush(self, listener: FlushListener) -> FlushListener:
+        """Register a callback run once per committed batch"""
+        self.listeners.append(listener)
+        return listener
+
+    def _ledger(self, product_id: int) -> _Ledger:
+        ledger = self._ledgers.get(product_id)
+        if ledger is None:
+            ledger = self._ledgers[product_id] = _Ledger()
+        return ledger
+
+    async def _load(
+        self, product_id: int, ledger: _Ledger, refresh: bool = False
+    ) -> None:
+        """Fetch the stock once however many requests are waiting for it
+
+        With ``refresh`` an already loaded ledger takes the fetched level too,
+        unless a flush is committing (its result is fresher).
+        """
+        if ledger.loading is None:
+            # Shared by every waiting request, so not bound by the first one's deadline
+            ledger.loading = detach(self.store.fetch([product_id]))
+            ledger.loading.add_done_callback(lambda _: setattr(ledger, "loading", None))
+        fetched = await asyncio.shield(ledger.loading)
+        if product_id not in fetched:
+            if ledger.idle and self._ledgers.get(product_id) is ledger:
+                del self._ledgers[product_id]
+            raise ProductNotFoundError(product_id)
+        if ledger.stock is None or (refresh and not ledger.flushing):
+            ledger.stock = fetched[product_id]
+
+    def available(self, product_id: int) -> Optional[int]:
+        ledger = self._ledgers.get(int(product_id))
+        return None if ledger is None or ledger.stock is None else ledger.available
+
+    async def adjust(
+        self, product_id: int, delta: int, actor: Optional[str] = None
+    ) -> int:
+        """Apply ``delta`` and return the resulting stock level"""
+        product_id = int(product_id)
+        ledger = self._ledger(product_id)
+        ledger.touched = time.monotonic()
+        loaded = ledger.stock is None
+        if loaded:
+            await self._load(product_id, ledger)
+        if delta < 0 and ledger.available + delta < 0 and not loaded:
+            # Restocks on other workers only reach this ledger on reconcile
+            await self._load(product_id, ledger, refresh=True)
+        if delta < 0 and ledger.available + delta < 0:
+            raise InsufficientStockError(product_id, delta, ledger.available)
+
+        loop = asyncio.get_running_loop()
+        adjustment = _Adjustment(delta, actor, loop.create_future())
+        ledger.reserved += delta
+        ledger.pending.append(adjustment)
+        if not ledger.flushing and ledger.timer is None:
+            self._schedule(product_id, ledger)
+        return await adjustment.future
+
+    def _schedule(self, product_id: int, ledger: _Ledger) -> None:
+        # Once shutting down, stop buffering and commit right away
+        window = 0 if self._closing else self.window
+        # The flush commits other requests' adjustments too, so it must not
+        # inherit the deadline of the request that happened to schedule it
+        ledger.timer = asyncio.get_running_loop().call_later(
+            window, self._start_flush, product_id, context=without_deadline()
+        )
+
+    def _start_flush(self, product_id: int) -> None:
+        ledger = self._ledgers[product_id]
+        ledger.timer = None
+        ledger.flushing = True
+        task = asyncio.create_task(self._flush(product_id, ledger))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    def _readmit(
+        self, product_id: int, batch: List[_Adjustment], stock: int
+    ) -> List[_Adjustment]:
+        """Keep the prefix-feasible adjustments of ``batch`` against ``stock``"""
+        admitted = []
+        for adjustment in batch:
+            if stock + adjustment.delta < 0:
+                if not adjustment.future.done():
+                    adjustment.future.set_exception(
+                        InsufficientStockError(product_id, adjustment.delta, stock)
+                    )
+                continue
+            stock += adjustment.delta
+            admitted.append(adjustment)
+        return admitted
+
+    async def _flush(self, product_id: int, ledger: _Ledger) -> None:
+        batch, ledger.pending = ledger.pending, []
+        net = sum(adjustment.delta for adjustment in batch)
+        try:
+            for _ in range(self.MAX_ATTEMPTS):
+                stock = (
+                    await self.store.adjust(product_id, net) if net else ledger.stock
+                )
+                if stock is not None:
+                    break
+                # Another writer took the stock first: reload and re-admit in order
+                fresh = await self.store.fetch([product_id])
+                if product_id not in fresh:
+                    raise ProductNotFoundError(product_id)
+                ledger.reserved -= net
+                ledger.stock = fresh[product_id]
+                batch = self._readmit(product_id, batch, ledger.stock)
+                net = sum(adjustment.delta for adjustment in batch)
+                ledger.reserved += net
+            else:
+                raise RuntimeError(f"Stock of product {product_id} kept changing")
+        except Exception as e:
+            ledger.reserved -= net
+            ledger.stock = None  # Reload before admitting anything else
+            for adjustment in batch:
+                if not adjustment.future.done():
+                    adjustment.future.set_exception(e)
+            logger.error(f"Inventory flush for product {product_id} failed: {str(e)}")
+        else:
+            ledger.reserved -= net
+            ledger.stock = stock
+            running = stock - net
+            for adjustment in batch:
+                running += adjustment.delta
+                if not adjustment.future.done():
+                    adjustment.future.set_result(running)
+            if batch:
+                changes = [(adjustment.actor, adjustment.delta) for adjustment in batch]
+                await self._notify(product_id, stock, changes)
+        finally:
+            ledger.flushing = False
+            if ledger.pending:
+                self._schedule(product_id, ledger)
+
+    async def _notify(
+        self, product_id: int, stock: int, changes: List[Tuple[Optional[str], int]]
+    ) -> None:
+        for listener in self.listeners:
+            try:
+                await listener(product_id, stock, changes)
+            except Exception as e:
+                name = listener.__qualname__
+                logger.warning(f"Inventory listener {name} failed: {str(e)}")
+
+    async def reconcile(self) -> int:
+        """Refresh idle ledgers from the database and evict stale ones"""
+        now = time.monotonic()
+        idle = [
+            product_id
+            for product_id, ledger in self._ledgers.items()
+            if ledger.idle and ledger.stock is not None
+        ]
+        for product_id in idle:
+            if now - self._ledgers[product_id].touched > self.idle_ttl:
+                del self._ledgers[product_id]
+        refreshed = 0
+        ids = [product_id for product_id in idle if product_id in self._ledgers]
+        for start in range(0, len(ids), self.FETCH_CHUNK):
+            stock = await self.store.fetch(ids[start : start + self.FETCH_CHUNK])
+            for product_id, level in stock.items():
+                ledger = self._ledgers.get(product_id)
+                # Skip ledgers that picked up work while we were fetching
+                if ledger is not None and ledger.idle:
+                    if ledger.stock != level:
+                        refreshed += 1
+                    ledger.stock = level
+        return refreshed
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                drift = await self.reconcile()
+                if drift:
+                    logger.info(f"Inventory reconcile corrected {drift} products")
+            except Exception as e:
+                logger.warning(f"Inventory reconcile failed: {str(e)}")
+
+    async def flush_all(self) -> None:
+        """Commit every buffered adjustment now"""
+        while True:
+            for product_id, ledger in self._ledgers.items():
+                if ledger.timer is not None:
+                    ledger.timer.cancel()
+                    self._start_flush(product_id)
+            if not self._flushes:
+                return
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+
+    async def start(self) -> None:
+        self._closing = False
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush_all()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "products": len(self._ledgers),
+            "pending": sum(len(ledger.pending) for ledger in self._ledgers.values()),
+            "flushing": len(self._flushes),
+        }
+
+
+inventory = InventoryEngine()
+
+
+@Container.on_startup
+async def start_inventory(container: Container) -> None:
+    if container.db is not None and container.db.pool is not None:
+        inventory.store = PostgresStockStore(container.db)
+    await inventory.start()
+
+
+@Container.on_shutdown
+async def stop_inventory(container: Container) -> None:
+    await inventory.stop()
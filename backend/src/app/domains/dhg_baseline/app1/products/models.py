@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, Field
 
 
@@ -9,3 +10,13 @@ class Product(BaseModel):
     description: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ProductSummary(BaseModel):
+    """Product as listed by search; ``score`` is only set for text queries"""
+
+    id: int
+    name: str
+    description: str
+    price: float
+    score: Optional[float] = None
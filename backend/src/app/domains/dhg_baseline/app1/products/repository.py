@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import List, Optional
+
+from app.core.instrumentation import instrument
+from app.db.base import SupabaseDB
+from app.db.stats import run_postgrest
+
+
+class ProductRepository:
+    """PostgREST access to the products table, used by ProductService"""
+
+    __slots__ = ("db",)
+
+    def __init__(self):
+        self.db = SupabaseDB.get_client()
+
+    @instrument
+    async def get(self, id: str) -> Optional[dict]:
+        response = await run_postgrest(
+            "products.get",
+            lambda: self.db.table("products").select("*").eq("id", id),
+            {"id": id},
+        )
+
+        return response.data[0] if response.data else None
+
+    @instrument
+    async def list(self, filters: Optional[dict] = None) -> List[dict]:
+        filters = filters or {}
+
+        def build():
+            query = self.db.table("products").select("*")
+            for column, value in filters.items():
+                query = query.eq(column, value)
+            return query.order("id")
+
+        response = await run_postgrest("products.list", build, filters)
+
+        return response.data
+
+    @instrument
+    async def create(self, data: dict) -> Optional[dict]:
+        response = await run_postgrest(
+            "products.create", lambda: self.db.table("products").insert(data), data
+        )
+
+        return response.data[0] if response.data else None
+
+    @instrument
+    async def update(self, id: str, data: dict) -> Optional[dict]:
+        changes = {**data, "updated_at": datetime.utcnow().isoformat()}
+        response = await run_postgrest(
+            "products.update",
+            lambda: self.db.table("products").update(changes).eq("id", id),
+            {"id": id, **changes},
+        )
+
+        return response.data[0] if response.data else None
+
+    @instrument
+    async def delete(self, id: str) -> None:
+        await run_postgrest(
+            "products.delete",
+            lambda: self.db.table("products").delete().eq("id", id),
+            {"id": id},
+        )
@@ -0,0 +1,274 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from app.domains.dhg_baseline.app1.products.models import Product
+from app.domains.dhg_baseline.app1.products.sync import (
+    product_deletions,
+    product_sync,
+)
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Relative weight of a match depending on how the query term was expanded
+EXACT, PREFIX, TYPO = 1.0, 0.7, 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-fold, strip accents and split on non-alphanumerics"""
+    text = text or ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return TOKEN_RE.findall(text.casefold())
+
+
+def _deletes(term: str) -> Set[str]:
+    return {term[:i] + term[i + 1 :] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Optimal string alignment distance <= 1"""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        if a[i + 1 :] == b[i + 1 :]:
+            return True  # substitution
+        return a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2 :] == b[i + 2 :]
+    if la > lb:
+        return a[i + 1 :] == b[i:]
+    return a[i:] == b[i + 1 :]
+
+
+class _Doc:
+    __slots__ = ("id", "name", "description", "price", "length", "terms")
+
+    def __init__(self, id: int, name: str, description: str, price: float):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.price = price
+        self.length = 0.0
+        self.terms: Dict[str, float] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "price": self.price,
+        }
+
+
+class ProductSearchIndex:
+    """Incrementally maintained inverted index over product name/description
+
+    Ranking is BM25 with name tokens weighted above description tokens. The
+    last query token also matches as a prefix, and tokens missing from the
+    vocabulary fall back to single-edit typo matches via a deletion index.
+    """
+
+    FIELD_WEIGHTS = {"name": 2.0, "description": 1.0}
+    MAX_EXPANSIONS = 50
+    MIN_TYPO_LENGTH = 4
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[int, _Doc] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+        self._delete_index: Dict[str, Set[str]] = {}
+        self._prices: List[Tuple[float, int]] = []
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._docs
+
+    def _add_term(self, term: str) -> None:
+        insort(self._vocabulary, term)
+        for variant in _deletes(term) | {term}:
+            self._delete_index.setdefault(variant, set()).add(term)
+
+    def _drop_term(self, term: str) -> None:
+        del self._postings[term]
+        i = bisect_left(self._vocabulary, term)
+        if i < len(self._vocabulary) and self._vocabulary[i] == term:
+            del self._vocabulary[i]
+        for variant in _deletes(term) | {term}:
+            terms = self._delete_index.get(variant)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._delete_index[variant]
+
+    def add(
+        self,
+        product: Union[Product, Dict[str, Any]],
+        _pending: Optional[List[Tuple[float, int]]] = None,
+    ) -> None:
+        """Insert or replace a product"""
+        data = product.dict() if isinstance(product, Product) else product
+        product_id = int(data["id"])
+        if product_id in self._docs:
+            self.remove(product_id)
+
+        doc = _Doc(
+            product_id,
+            data.get("name") or "",
+            data.get("description") or "",
+            float(data.get("price") or 0.0),
+        )
+        weighted: Counter = Counter()
+        for field, weight in self.FIELD_WEIGHTS.items():
+            for token in tokenize(getattr(doc, field)):
+                weighted[token] += weight
+        doc.terms = dict(weighted)
+        doc.length = sum(weighted.values())
+
+        for term, tf in doc.terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._add_term(term)
+            postings[product_id] = tf
+
+        self._docs[product_id] = doc
+        self._total_length += doc.length
+        if _pending is not None:
+            _pending.append((doc.price, product_id))
+        else:
+            insort(self._prices, (doc.price, product_id))
+
+    def add_many(self, products: Iterable[Union[Product, Dict[str, Any]]]) -> None:
+        # New price entries are held back so _prices stays sorted (and
+        # removable by bisection) while products are replaced
+        pending: List[Tuple[float, int]] = []
+        for product in products:
+            self.add(product, pending)
+        fresh = set()
+        for price, product_id in pending:
+            doc = self._docs.get(product_id)
+            if doc is not None and doc.price == price:
+                fresh.add((price, product_id))  # Not replaced again later on
+        self._prices.extend(fresh)
+        self._prices.sort()
+
+    def remove(self, product_id: int) -> None:
+        doc = self._docs.pop(product_id, None)
+        if doc is None:
+            return
+        for term in doc.terms:
+            postings = self._postings[term]
+            postings.pop(product_id, None)
+            if not postings:
+                self._drop_term(term)
+        self._total_length -= doc.length
+        i = bisect_left(self._prices, (doc.price, product_id))
+        if i < len(self._prices) and self._prices[i] == (doc.price, product_id):
+            del self._prices[i]
+
+    def remove_many(self, products: Iterable[Dict[str, Any]]) -> None:
+        for product in products:
+            self.remove(int(product["id"]))
+
+    def get(self, product_id: int) -> Optional[Dict[str, Any]]:
+        doc = self._docs.get(product_id)
+        return doc.to_dict() if doc else None
+
+    def _expand(self, token: str, prefix: bool) -> Dict[str, float]:
+        expansions: Dict[str, float] = {}
+        if token in self._postings:
+            expansions[token] = EXACT
+        if prefix:
+            start = bisect_left(self._vocabulary, token)
+            end = bisect_right(self._vocabulary, token + "\uffff")
+            candidates = self._vocabulary[start : min(end, start + 4 * self.MAX_EXPANSIONS)]
+            candidates = heapq.nlargest(
+                self.MAX_EXPANSIONS,
+                (term for term in candidates if term != token),
+                key=lambda term: len(self._postings[term]),
+            )
+            for term in candidates:
+                expansions.setdefault(term, PREFIX)
+        if not expansions and len(token) >= self.MIN_TYPO_LENGTH:
+            for variant in _deletes(token) | {token}:
+                for term in self._delete_index.get(variant, ()):
+                    if term not in expansions and _within_one_edit(token, term):
+                        expansions[term] = TYPO
+        return expansions
+
+    def _price_bounds(
+        self, min_price: Optional[float], max_price: Optional[float]
+    ) -> Tuple[int, int]:
+        lo = 0 if min_price is None else bisect_left(self._prices, (min_price, -math.inf))
+        hi = (
+            len(self._prices)
+            if max_price is None
+            else bisect_right(self._prices, (max_price, math.inf))
+        )
+        return lo, hi
+
+    def search(
+        self,
+        query: str = "",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Rank products for ``query`` within an optional price range"""
+        tokens = tokenize(query)
+        if not tokens:
+            # Pure filter: price order straight from the sorted price list
+            lo, hi = self._price_bounds(min_price, max_price)
+            window = self._prices[lo + offset : min(hi, lo + offset + limit)]
+            return [self._docs[product_id].to_dict() for _, product_id in window]
+
+        n = len(self._docs)
+        avgdl = self._total_length / n if n else 0.0
+        scores: Dict[int, float] = {}
+        for position, token in enumerate(tokens):
+            expansions = self._expand(token, prefix=position == len(tokens) - 1)
+            for term, boost in expansions.items():
+                postings = self._postings[term]
+                df = len(postings)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                for product_id, tf in postings.items():
+                    doc = self._docs[product_id]
+                    norm = self.k1 * (1 - self.b + self.b * doc.length / avgdl)
+                    score = boost * idf * tf * (self.k1 + 1) / (tf + norm)
+                    scores[product_id] = scores.get(product_id, 0.0) + score
+
+        if min_price is not None or max_price is not None:
+            lo = -math.inf if min_price is None else min_price
+            hi = math.inf if max_price is None else max_price
+            scores = {
+                product_id: score
+                for product_id, score in scores.items()
+                if lo <= self._docs[product_id].price <= hi
+            }
+
+        ranked = heapq.nlargest(offset + limit, scores.items(), key=lambda kv: kv[1])
+        return [
+            {**self._docs[product_id].to_dict(), "score": round(score, 4)}
+            for product_id, score in ranked[offset:]
+        ]
+
+
+product_index = ProductSearchIndex()
+product_sync.subscribe(product_index.add_many, ("name", "description", "price"))
+product_deletions.subscribe(product_index.remove_many)
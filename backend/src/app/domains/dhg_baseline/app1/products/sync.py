@@ -0,0 +1,34 @@
+import time
+
+from app.core.container import Container
+from app.core.logger import get_logger
+from app.db.sync import TableSync
+
+logger = get_logger(__name__)
+
+# Shared by the search index and the analytics columns so the products table
+# is paged once per poll, not once per consumer
+product_sync = TableSync("products")
+# Deleted rows never reach product_sync; a trigger on products records their
+# ids here so every worker drops them too
+product_deletions = TableSync("product_deletions")
+
+
+@Container.on_startup
+async def load_products(container: Container) -> None:
+    started = time.perf_counter()
+    try:
+        loaded = await product_sync.sync()
+        await product_deletions.sync()
+        elapsed = time.perf_counter() - started
+        logger.info(f"Product caches built: {loaded} products in {elapsed:.2f}s")
+    finally:
+        # Keep converging on changes made through other workers
+        await product_sync.start()
+        await product_deletions.start()
+
+
+@Container.on_shutdown
+async def stop_product_sync(container: Container) -> None:
+    await product_sync.stop()
+    await product_deletions.stop()
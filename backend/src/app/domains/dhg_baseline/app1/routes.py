@@ -1,21 +1,114 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from pydantic import BaseModel
 from app.core.apps import AppFeature
+from app.core.auth import get_current_session
 from app.core.deps import get_current_app, require_feature
+from app.core.fields import FieldSet, sparse_fields, sparse_response
+from app.core.idempotency import IDEMPOTENCY_HEADER, idempotent_response
+from app.core.registry import ServiceRegistry
+from app.domains.dhg_baseline.app1.products.analytics import product_columns
+from app.domains.dhg_baseline.app1.products.inventory import (
+    InsufficientStockError,
+    ProductNotFoundError,
+)
+from app.domains.dhg_baseline.app1.products.models import ProductSummary
+from app.domains.dhg_baseline.app1.products.search import product_index
+from app.domains.dhg_baseline.app1.services.product_service import ProductService
 
 router = APIRouter(prefix="/app1")
 
 
+class StockAdjustment(BaseModel):
+    quantity: int
+    action: str = "adjust"
+
+
 @router.get("/products")
 async def list_products(
-    app=Depends(get_current_app), _=Depends(require_feature(AppFeature.MARKETPLACE))
+    q: str = "",
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[FieldSet] = Depends(sparse_fields(ProductSummary)),
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.MARKETPLACE)),
+):
+    """List or search products for app1; ``fields`` trims each product"""
+    products = product_index.search(
+        q, min_price=min_price, max_price=max_price, limit=limit, offset=offset
+    )
+    return sparse_response({"products": products, "app": "app1"}, fields, "products")
+
+
+@router.post("/products/{product_id}/stock")
+async def adjust_stock(
+    product_id: int,
+    adjustment: StockAdjustment,
+    session=Depends(get_current_session),
+    service: ProductService = Depends(ServiceRegistry.provider(ProductService)),
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.MARKETPLACE)),
 ):
-    """List products for app1"""
-    return {"products": [], "app": "app1"}
+    """Adjust product stock; concurrent adjustments are committed together"""
+    try:
+        return await service.update_inventory(
+            product_id, adjustment.quantity, adjustment.action, session.user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ProductNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InsufficientStockError as e:
+        raise HTTPException(
+            status_code=409, detail={"message": str(e), "available": e.available}
+        )
+
+
+@router.get("/reports/products")
+async def product_report(
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    bucket_width: Optional[float] = Query(None, gt=0),
+    buckets: int = Query(10, ge=1, le=100),
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.MARKETPLACE)),
+):
+    """Price and catalog aggregates from the columnar product snapshot"""
+    try:
+        report = product_columns.report(
+            bucket_width=bucket_width,
+            buckets=buckets,
+            min_price=min_price,
+            max_price=max_price,
+            created_after=created_after,
+            created_before=created_before,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**report, "snapshot": product_columns.stats(), "app": "app1"}
 
 
 @router.post("/checkout")
 async def process_checkout(
-    app=Depends(get_current_app), _=Depends(require_feature(AppFeature.PAYMENTS))
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    session=Depends(get_current_session),
+    app=Depends(get_current_app),
+    _=Depends(require_feature(AppFeature.PAYMENTS)),
 ):
-    """Process checkout for app1"""
-    return {"status": "success", "app": "app1"}
+    """Process checkout for app1; retries with the same Idempotency-Key replay
+
+    Keys are per user, so callers choosing the same key never share results.
+    """
+
+    async def checkout():
+        return {"status": "success", "app": "app1"}
+
+    return await idempotent_response(
+        request, idempotency_key, checkout, scope=f"app1:checkout:{session.user_id}"
+    )
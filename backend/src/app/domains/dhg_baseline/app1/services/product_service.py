@@ -1,45 +1,101 @@
-from app.core.mixins.service_mixins import CacheMixin, AuditMixin, ValidationMixin
-from app.domains.app1.mixins import ProductManagementMixin
-from app.core.base import BaseService
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from app.core.instrumentation import instrument
+from app.core.jobs import job_queue
+from app.core.mixins.service_mixins import (
+    AuditMixin,
+    BackgroundJobMixin,
+    CacheMixin,
+    ValidationMixin,
+)
+from app.core.registry import ServiceRegistry
+from app.domains.dhg_baseline.app1.mixins import ProductManagementMixin
+from app.domains.dhg_baseline.app1.products.analytics import product_columns
+from app.domains.dhg_baseline.app1.products.inventory import inventory
+from app.domains.dhg_baseline.app1.products.models import Product
+from app.domains.dhg_baseline.app1.products.repository import ProductRepository
+from app.domains.dhg_baseline.app1.products.search import product_index
+from app.core.base.service import BaseService
 
 
 class ProductService(
-    BaseService, CacheMixin, AuditMixin, ValidationMixin, ProductManagementMixin
+    BaseService,
+    CacheMixin,
+    AuditMixin,
+    ValidationMixin,
+    BackgroundJobMixin,
+    ProductManagementMixin,
 ):
     """Product service with mixed-in capabilities"""
 
-    async def create_product(self, data: dict, user_id: str) -> dict:
+    @instrument
+    async def create_product(self, data: dict, user_id: str) -> Optional[dict]:
         # Validate data
-        await self.validate_entity(data, ProductSchema)
+        await self.validate_entity(data, Product)
 
         # Create product
         product = await self.repository.create(data)
+        if product is None:
+            return None
+        encoded = jsonable_encoder(product)
+        product_index.add(encoded)
+        product_columns.upsert_many([encoded])
 
-        # Update cache
-        cache_key = f"product:{product.id}"
-        await self.set_cached(cache_key, product)
-
-        # Log action
-        await self.log_action(
-            "product_created", user_id, {"product_id": product.id}, "app1"
+        # Cache warmup and audit run in the background
+        await self.enqueue_job(
+            "app1.product_created",
+            {"product": encoded, "user_id": user_id},
         )
 
         return product
 
+    @instrument
+    async def delete(self, id: str) -> None:
+        await self.repository.delete(id)
+        # Other workers drop it when product_deletions syncs
+        product_index.remove(int(id))
+        product_columns.remove(int(id))
+
+    @instrument
     async def update_product_stock(
         self, product_id: str, quantity: int, user_id: str
-    ) -> None:
-        # Update inventory using mixin
-        await self.update_inventory(product_id, quantity, "adjust")
-
-        # Clear cache
-        cache_key = f"product:{product_id}"
-        await self.clear_cached(cache_key)
-
-        # Log action
-        await self.log_action(
-            "stock_updated",
-            user_id,
-            {"product_id": product_id, "quantity": quantity},
-            "app1",
-        )
+    ) -> dict:
+        # Adjustments are coalesced per product; cache invalidation and audit
+        # run once per committed batch (see on_inventory_flush)
+        return await self.update_inventory(product_id, quantity, "adjust", user_id)
+
+
+ServiceRegistry.register(
+    ProductService, lambda app_id: ProductService(ProductRepository())
+)
+
+
+@job_queue.task("app1.product_created", queue="audit")
+async def on_product_created(product: dict, user_id: str) -> None:
+    service = ServiceRegistry.get(ProductService, "app1")
+    await service.set_cached(f"product:{product['id']}", product)
+    await service.log_action(
+        "product_created", user_id, {"product_id": product["id"]}, "app1"
+    )
+
+
+@inventory.on_flush
+async def on_inventory_flush(product_id: int, stock: int, changes: list) -> None:
+    changes = [{"user_id": user_id, "delta": delta} for user_id, delta in changes]
+    await job_queue.enqueue(
+        "app1.stock_updated",
+        {"product_id": product_id, "stock": stock, "changes": changes},
+    )
+
+
+@job_queue.task("app1.stock_updated", queue="audit")
+async def on_stock_updated(product_id: int, stock: int, changes: list) -> None:
+    service = ServiceRegistry.get(ProductService, "app1")
+    await service.clear_cached(f"product:{product_id}")
+    await service.log_action(
+        "stock_updated",
+        None,
+        {"product_id": product_id, "stock": stock, "changes": changes},
+        "app1",
+    )
@@ -1,28 +1,35 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.container import Container
+from app.core.deps import get_container
+from app.core.registry import ServiceRegistry
 from app.services.test.service import TestService
 
 router = APIRouter()
 
 
 @router.get("/test-supabase")
-async def test_supabase():
-    """Test Supabase connection"""
-    try:
-        test_service = TestService()
-        return await test_service.test_db_connection()
-    except Exception as e:
+async def test_supabase(container: Container = Depends(get_container)):
+    """Report the last Supabase connectivity probe"""
+    check = container.health.status()["checks"].get("supabase")
+    if check and check["ok"]:
         return {
-            "status": "error",
-            "message": str(e),
-            "details": "Connection test failed",
+            "status": "success",
+            "message": "Connected to Supabase successfully!",
+            "data": check,
         }
+    return {
+        "status": "error",
+        "message": check["error"] if check else "Supabase has not been probed yet",
+        "details": "Connection test failed",
+    }
 
 
 @router.post("/test-supabase/add")
-async def add_test_data():
+async def add_test_data(
+    test_service: TestService = Depends(ServiceRegistry.provider(TestService)),
+):
     """Add test data to Supabase"""
     try:
-        test_service = TestService()
         return await test_service.add_sample_data()
     except Exception as e:
         return {
@@ -1,60 +1,81 @@
 from typing import Optional, List
 from datetime import datetime
+from app.core.fields import FieldSet, select_for
+from app.core.instrumentation import instrument
 from app.db.base import SupabaseDB
-from .schemas import UserCreate, UserUpdate
+from app.db.stats import run_postgrest
+from .schemas import UserCreate, UserResponse, UserUpdate
 
 
 class UserRepository:
+    __slots__ = ("db",)
+
     def __init__(self):
         self.db = SupabaseDB.get_client()
 
+    @instrument
     async def create(self, user_data: UserCreate) -> dict:
-        response = (
-            self.db.table("users")
-            .insert(
-                {
-                    "email": user_data.email,
-                    "full_name": user_data.full_name,
-                    # Note: Password handling is managed by Supabase Auth
-                }
-            )
-            .execute()
+        row = {
+            "email": user_data.email,
+            "full_name": user_data.full_name,
+            # Note: Password handling is managed by Supabase Auth
+        }
+        response = await run_postgrest(
+            "users.create", lambda: self.db.table("users").insert(row), row
+        )
+
+        return response.data[0] if response.data else None
+
+    @instrument
+    async def get_by_id(
+        self, user_id: int, fields: Optional[FieldSet] = None
+    ) -> Optional[dict]:
+        columns = select_for(UserResponse, fields)
+        response = await run_postgrest(
+            "users.get_by_id",
+            lambda: self.db.table("users").select(columns).eq("id", user_id),
+            {"id": user_id, "select": columns},
         )
 
         return response.data[0] if response.data else None
 
-    async def get_by_email(self, email: str) -> Optional[dict]:
-        response = (
-            self.db.table("users")
-            .select("id, email, full_name, created_at")
-            .eq("email", email)
-            .execute()
+    @instrument
+    async def get_by_email(
+        self, email: str, fields: Optional[FieldSet] = None
+    ) -> Optional[dict]:
+        columns = select_for(UserResponse, fields)
+        response = await run_postgrest(
+            "users.get_by_email",
+            lambda: self.db.table("users").select(columns).eq("email", email),
+            {"email": email, "select": columns},
         )
 
         return response.data[0] if response.data else None
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[dict]:
-        response = (
-            self.db.table("users")
-            .select("id, email, full_name, created_at")
-            .range(skip, skip + limit)
-            .execute()
+    @instrument
+    async def list_users(
+        self, skip: int = 0, limit: int = 100, fields: Optional[FieldSet] = None
+    ) -> List[dict]:
+        columns = select_for(UserResponse, fields)
+        response = await run_postgrest(
+            "users.list",
+            lambda: self.db.table("users").select(columns).range(skip, skip + limit),
+            {"skip": skip, "limit": limit, "select": columns},
         )
 
         return response.data
 
+    @instrument
     async def update(self, user_id: int, user_data: UserUpdate) -> Optional[dict]:
-        response = (
-            self.db.table("users")
-            .update(
-                {
-                    "email": user_data.email,
-                    "full_name": user_data.full_name,
-                    "updated_at": datetime.utcnow().isoformat(),
-                }
-            )
-            .eq("id", user_id)
-            .execute()
+        changes = {
+            "email": user_data.email,
+            "full_name": user_data.full_name,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+        response = await run_postgrest(
+            "users.update",
+            lambda: self.db.table("users").update(changes).eq("id", user_id),
+            {"id": user_id, **changes},
         )
 
         return response.data[0] if response.data else None
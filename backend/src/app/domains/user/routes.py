@@ -1,33 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from typing import List, Optional
 from .schemas import UserCreate, UserResponse, UserUpdate
 from .repository import UserRepository
 from app.core.auth import get_current_user
+from app.core.fields import FieldSet, sparse_fields, sparse_response
+from app.core.registry import ServiceRegistry
 
 router = APIRouter()
 
 
 @router.post("/users/", response_model=UserResponse)
-async def create_user(user: UserCreate):
-    repo = UserRepository()
-    existing_user = await repo.get_by_email(user.email)
+async def create_user(
+    user: UserCreate,
+    repo: UserRepository = Depends(ServiceRegistry.provider(UserRepository)),
+):
+    existing_user = await repo.get_by_email(user.email, FieldSet(UserResponse, ["id"]))
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
+    # Not counted against the "users" quota: that counts Supabase Auth
+    # signups (see /auth/signup), and this table has no app to count by
     return await repo.create(user)
 
 
 @router.get("/users/", response_model=List[UserResponse])
 async def list_users(
-    skip: int = 0, limit: int = 100, current_user: dict = Depends(get_current_user)
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[FieldSet] = Depends(sparse_fields(UserResponse)),
+    current_user: dict = Depends(get_current_user),
+    repo: UserRepository = Depends(ServiceRegistry.provider(UserRepository)),
 ):
-    repo = UserRepository()
-    return await repo.list_users(skip, limit)
+    return sparse_response(await repo.list_users(skip, limit, fields), fields)
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, current_user: dict = Depends(get_current_user)):
-    repo = UserRepository()
-    user = await repo.get_by_id(user_id)
+async def get_user(
+    user_id: int,
+    fields: Optional[FieldSet] = Depends(sparse_fields(UserResponse)),
+    current_user: dict = Depends(get_current_user),
+    repo: UserRepository = Depends(ServiceRegistry.provider(UserRepository)),
+):
+    user = await repo.get_by_id(user_id, fields)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return sparse_response(user, fields)
@@ -2,34 +2,57 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI, Depends, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.routes import api_router
+from app.api.health import router as health_router
+from app.api.docs.openapi import install_openapi
 from app.core.apps import AppRegistry, AppConfig
 from app.middleware.app_context import AppContextMiddleware
-from app.core.app_settings import APP_SETTINGS
-import logging
-from app.core.env_validator import validate_environment
+from app.middleware.concurrency import ConcurrencyLimitMiddleware
+from app.middleware.deadline import DeadlineMiddleware
+from app.core.deadlines import DeadlineExceeded
+from app.core.runtime_config import ConfigSnapshot, config_store
 import time
 from app.domains.auth.routes import router as auth_router
+from app.core.container import lifespan
+from app.core.logger import get_logger
 
 # Load environment variables
 ENV = os.getenv("ENV", "development")
 env_file = f".env.{ENV}" if ENV != "development" else ".env"
 load_dotenv(Path(__file__).parent.parent.parent / env_file)
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+
+def register_apps(snapshot: ConfigSnapshot) -> None:
+    """(Re-)register every app from a configuration snapshot"""
+    for app_id, app_settings in snapshot.apps.items():
+        AppRegistry.register_app(
+            AppConfig(
+                id=app_id,
+                name=f"Application {app_id}",
+                features=[
+                    feature
+                    for feature in app_settings.features
+                    if snapshot.feature_enabled(app_id, feature)
+                ],
+                database_schema=app_id,
+                api_prefix=f"/api/{app_settings.api_version}",
+                cors_origins=[f"https://{app_id}.yourdomain.com"],
+            )
+        )
 
 
 def create_app() -> FastAPI:
-    # Validate environment before creating app
+    # Validate environment and app settings once, before creating app
     try:
-        env_config = validate_environment()
-        logger.info(f"Environment validated successfully: {env_config['ENV']}")
+        snapshot = config_store.load()
+        logger.info(f"Environment validated successfully: {snapshot.env.get('ENV')}")
     except Exception as e:
-        logger.error(f"Environment validation failed: {str(e)}")
+        logger.error(f"Configuration failed to load: {str(e)}")
         # Don't raise here, continue with defaults
         logger.warning("Continuing with default configuration")
 
@@ -37,20 +60,21 @@ def create_app() -> FastAPI:
         title=settings.PROJECT_NAME,
         description=settings.DESCRIPTION,
         version=settings.VERSION,
+        lifespan=lifespan,
+        # Served pre-encoded by install_openapi below
+        openapi_url=None,
+        docs_url=None,
+        redoc_url=None,
     )
 
-    # Register apps
-    for app_id, app_settings in APP_SETTINGS.items():
-        AppRegistry.register_app(
-            AppConfig(
-                id=app_id,
-                name=f"Application {app_id}",
-                features=list(app_settings.features.keys()),
-                database_schema=app_id,
-                api_prefix=f"/api/{app_settings.api_version}",
-                cors_origins=[f"https://{app_id}.yourdomain.com"],
-            )
-        )
+    # Register apps, and again whenever the configuration is reloaded
+    register_apps(config_store.snapshot)
+    config_store.subscribe(register_apps)
+
+    # Inside CORS, so deadline and overload responses still carry CORS
+    # headers; shedding happens before any per-request work is set up
+    app.add_middleware(DeadlineMiddleware)
+    app.add_middleware(ConcurrencyLimitMiddleware)
 
     # Configure CORS
     app.add_middleware(
@@ -67,6 +91,12 @@ def create_app() -> FastAPI:
     # Mount routers directly without v1 prefix
     app.include_router(auth_router, prefix="/auth", tags=["auth"])
     app.include_router(api_router, prefix="/api")
+    app.include_router(health_router, prefix="/health", tags=["health"])
+    install_openapi(app, settings.OPENAPI_PREBUILT_DIR)
+
+    @app.exception_handler(DeadlineExceeded)
+    async def deadline_exceeded(request: Request, exc: DeadlineExceeded):
+        return JSONResponse({"detail": str(exc)}, status_code=504)
 
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
@@ -3,6 +3,17 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.apps import AppRegistry
 
 
+def resolve_app_id(path: str, host: str) -> str:
+    # From path: /app1/api/users or /api/app1/products -> app1
+    for part in path.split("/")[1:3]:
+        if AppRegistry.get_app(part):
+            return part
+
+    # From subdomain: app1.yourdomain.com
+    subdomain = host.split(".")[0]
+    return subdomain if subdomain in ["app1", "app2"] else "default"
+
+
 class AppContextMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         # Extract app_id from path or subdomain
@@ -15,12 +26,4 @@ class AppContextMiddleware(BaseHTTPMiddleware):
         return response
 
     def _get_app_id(self, request: Request) -> str:
-        # From path: /app1/api/users -> app1
-        path_parts = request.url.path.split("/")
-        if len(path_parts) > 1:
-            return path_parts[1]
-
-        # From subdomain: app1.yourdomain.com
-        host = request.headers.get("host", "")
-        subdomain = host.split(".")[0]
-        return subdomain if subdomain in ["app1", "app2"] else "default"
+        return resolve_app_id(request.url.path, request.headers.get("host", ""))
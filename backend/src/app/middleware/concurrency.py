@@ -0,0 +1,60 @@
+import time
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.concurrency import (
+    EXEMPT,
+    AdaptiveLimiter,
+    RoutePriorities,
+    concurrency_limiter,
+    route_priorities,
+)
+
+
+class ConcurrencyLimitMiddleware:
+    """Admit requests through the adaptive limiter, shedding with 503
+
+    Routes are classified by ``priorities`` (see RoutePriorities); by default
+    the ``CONCURRENCY_PRIORITIES`` setting.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[AdaptiveLimiter] = None,
+        priorities: Optional[Dict[str, str]] = None,
+    ):
+        self.app = app
+        self.limiter = limiter or concurrency_limiter
+        self.priorities = (
+            RoutePriorities(priorities) if priorities is not None else route_priorities
+        )
+
+    def classify(self, method: str, path: str) -> str:
+        return self.priorities.classify(method, path)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        priority = self.classify(scope["method"], scope["path"])
+        if priority == EXEMPT:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.acquire(priority):
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.limiter.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release(time.perf_counter() - started)
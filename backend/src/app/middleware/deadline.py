@@ -0,0 +1,153 @@
+import asyncio
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.deadlines import Deadline, budget_from_header, current_deadline
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _DisconnectListener:
+    """Shares ``receive`` between the app and a disconnect watcher
+
+    The watcher only starts listening once the request body has been read
+    (immediately for requests without one), so it can never take body
+    chunks from the app; after that the server only has a disconnect left
+    to deliver. An empty body it reads first is replayed to the app.
+    """
+
+    def __init__(self, scope: Scope, receive: Receive):
+        self._receive = receive
+        self._stash: Optional[Message] = None
+        self._body_read = asyncio.Event()
+        has_body = False
+        for name, value in scope["headers"]:
+            if name == b"transfer-encoding" or (
+                name == b"content-length" and value != b"0"
+            ):
+                has_body = True
+        if not has_body:
+            self._body_read.set()
+
+    async def receive(self) -> Message:
+        if self._stash is not None:
+            message, self._stash = self._stash, None
+            return message
+        message = await self._receive()
+        if message["type"] == "http.disconnect" or not message.get("more_body"):
+            self._body_read.set()
+        return message
+
+    async def disconnected(self) -> None:
+        await self._body_read.wait()
+        while True:
+            message = await self._receive()
+            if message["type"] == "http.disconnect":
+                return
+            self._stash = message
+
+
+class DeadlineMiddleware:
+    """Give every request a time budget and stop it when nobody is waiting
+
+    The budget comes from the client's timeout header (capped) or the
+    default, and routes can replace it with ``request_budget``. It is
+    published through ``current_deadline`` so outbound calls wait no
+    longer than the request has left. The handler is cancelled when the
+    client disconnects, or ``grace`` after the budget runs out (answering
+    504 if nothing was sent yet); the grace lets outbound calls fail with
+    DeadlineExceeded first, so handlers can clean up.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default: Optional[float] = settings.REQUEST_TIMEOUT_SECONDS,
+        maximum: float = settings.REQUEST_TIMEOUT_MAX_SECONDS,
+        header: str = settings.REQUEST_TIMEOUT_HEADER,
+        grace: float = 0.05,
+    ):
+        self.app = app
+        self.default = default
+        self.maximum = maximum
+        self.header = header.lower().encode()
+        self.grace = grace
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                requested = budget_from_header(value.decode("latin-1"), self.maximum)
+        deadline = Deadline(self.default, requested)
+        token = current_deadline.set(deadline)
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        listener = _DisconnectListener(scope, receive)
+        handler = asyncio.ensure_future(
+            self.app(scope, listener.receive, send_wrapper)
+        )
+        watcher = asyncio.ensure_future(self._watch(handler, deadline, listener))
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not watcher.done() or watcher.cancelled():
+                # Cancelled from outside, e.g. server shutdown: take the
+                # handler down too rather than leave it running unowned
+                handler.cancel()
+                await asyncio.gather(handler, return_exceptions=True)
+                raise
+            reason = watcher.result()
+            logger.warning(f"{scope['method']} {scope['path']} cancelled: {reason}")
+            if reason == "deadline" and not response_started:
+                response = JSONResponse(
+                    {"detail": "Request deadline exceeded"}, status_code=504
+                )
+                await response(scope, receive, send)
+        finally:
+            watcher.cancel()
+            current_deadline.reset(token)
+
+    async def _watch(
+        self, handler: asyncio.Future, deadline: Deadline, listener: _DisconnectListener
+    ) -> str:
+        """Cancel ``handler`` on disconnect or expiry; returns which"""
+        disconnected = asyncio.ensure_future(listener.disconnected())
+        changed: Optional[asyncio.Future] = None
+        try:
+            while True:
+                # Routes may set their own budget; start over when they do
+                deadline.changed.clear()
+                changed = asyncio.ensure_future(deadline.changed.wait())
+                left = deadline.remaining()
+                done, _ = await asyncio.wait(
+                    {disconnected, changed},
+                    timeout=None if left is None else left + self.grace,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnected in done:
+                    reason = "client disconnected"
+                    break
+                if not done:
+                    reason = "deadline"
+                    break
+        finally:
+            disconnected.cancel()
+            if changed is not None:
+                changed.cancel()
+        handler.cancel()
+        return reason
@@ -1,4 +1,12 @@
 from .service import AuthService
 from .schemas import SignUpRequest, SignInRequest
+from .sessions import SessionEntry, SessionStore, session_store
 
-__all__ = ["AuthService", "SignUpRequest", "SignInRequest"]
+__all__ = [
+    "AuthService",
+    "SignUpRequest",
+    "SignInRequest",
+    "SessionEntry",
+    "SessionStore",
+    "session_store",
+]
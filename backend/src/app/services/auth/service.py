@@ -1,5 +1,6 @@
 from app.services.supabase.mixins import SupabaseAuthMixin
 from app.services.auth.schemas import SignUpRequest, SignInRequest
+from app.core.instrumentation import instrument
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -8,6 +9,7 @@ logger = get_logger(__name__)
 class AuthService(SupabaseAuthMixin):
     """Authentication service using Supabase"""
 
+    @instrument
     async def signup_user(self, request: SignUpRequest):
         """Handle user signup"""
         try:
@@ -16,6 +18,7 @@ class AuthService(SupabaseAuthMixin):
             logger.error(f"Signup failed: {str(e)}")
             raise
 
+    @instrument
     async def login_user(self, request: SignInRequest):
         """Handle user login"""
         try:
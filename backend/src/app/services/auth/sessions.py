@@ -0,0 +1,261 @@
+import asyncio
+import json
+import secrets
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+from jose import jwt
+from supabase import Client, create_client
+
+from app.core.cache import RedisCache
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SessionEntry:
+    """Server-side view of an authenticated Supabase session"""
+
+    session_id: str
+    user: Dict[str, Any]
+    claims: Dict[str, Any]
+    access_token: str
+    refresh_token: str
+    expires_at: float
+    last_seen: float = field(default_factory=time.time)
+
+    @property
+    def user_id(self) -> Optional[str]:
+        return self.user.get("id") or self.claims.get("sub")
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at <= (now or time.time())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionEntry":
+        return cls(**data)
+
+
+def to_plain(model: Any) -> Dict[str, Any]:
+    """Convert a gotrue pydantic model into JSON-compatible data"""
+    if model is None:
+        return {}
+    if hasattr(model, "json"):
+        return json.loads(model.json())
+    return dict(model)
+
+
+class SessionStore:
+    """Session cache keyed by session id, with background token refresh
+
+    The local dict is the hot tier: resolving an authenticated request is a
+    single dict lookup. Entries are mirrored to Redis (when configured) so any
+    worker can pick up a session created elsewhere. Revoking a session leaves
+    a tombstone in Redis that every worker checks before serving or
+    refreshing its local copy.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        ttl: int = settings.SESSION_TTL_SECONDS,
+        refresh_margin: int = settings.SESSION_REFRESH_MARGIN_SECONDS,
+        refresh_interval: int = settings.SESSION_REFRESH_INTERVAL_SECONDS,
+    ):
+        self._cache = cache or RedisCache(prefix="session", local_ttl=1)
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.refresh_interval = refresh_interval
+        self._sessions: Dict[str, SessionEntry] = {}
+        self._by_token: Dict[str, str] = {}
+        self._client: Optional[Client] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self) -> Client:
+        # Dedicated client so refreshes never touch the shared client's session
+        if self._client is None:
+            self._client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        return self._client
+
+    def _remember(self, entry: SessionEntry) -> None:
+        previous = self._sessions.get(entry.session_id)
+        if previous is not None and previous.access_token != entry.access_token:
+            self._by_token.pop(previous.access_token, None)
+        self._sessions[entry.session_id] = entry
+        self._by_token[entry.access_token] = entry.session_id
+
+    def _forget(self, session_id: str) -> Optional[SessionEntry]:
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self._by_token.pop(entry.access_token, None)
+        return entry
+
+    async def _persist(self, entry: SessionEntry) -> None:
+        await self._cache.set(entry.session_id, entry.to_dict(), expire=self.ttl)
+
+    @staticmethod
+    def _tombstone(session_id: str) -> str:
+        return f"revoked:{session_id}"
+
+    async def is_revoked(self, session_id: str) -> bool:
+        if not self._cache.has_redis:
+            # Without a shared tier sessions never leave this worker
+            return False
+        return await self._cache.get(self._tombstone(session_id)) is not None
+
+    async def create(self, session: Any) -> SessionEntry:
+        """Register a freshly issued Supabase session"""
+        entry = SessionEntry(
+            session_id=secrets.token_urlsafe(32),
+            user=to_plain(session.user),
+            claims=jwt.get_unverified_claims(session.access_token),
+            access_token=session.access_token,
+            refresh_token=session.refresh_token,
+            expires_at=float(session.expires_at or time.time() + session.expires_in),
+        )
+        self._remember(entry)
+        await self._persist(entry)
+        return entry
+
+    def get_local(self, session_id: str) -> Optional[SessionEntry]:
+        """Resolve a session from the local tier only"""
+        entry = self._sessions.get(session_id)
+        if entry is None or entry.is_expired():
+            return None
+        entry.last_seen = time.time()
+        return entry
+
+    async def get_by_token(self, access_token: str) -> Optional[SessionEntry]:
+        session_id = self._by_token.get(access_token)
+        if session_id is None:
+            return None
+        if await self.is_revoked(session_id):
+            self._forget(session_id)
+            return None
+        return self.get_local(session_id)
+
+    async def get(self, session_id: str) -> Optional[SessionEntry]:
+        """Resolve a session, falling back to the shared tier on a local miss"""
+        if await self.is_revoked(session_id):
+            self._forget(session_id)
+            return None
+        entry = self.get_local(session_id)
+        if entry is not None:
+            return entry
+        data = await self._cache.get(session_id)
+        if not data:
+            return None
+        entry = SessionEntry.from_dict(data)
+        if entry.is_expired():
+            return None
+        self._remember(entry)
+        return entry
+
+    async def _drop(self, session_id: str) -> None:
+        self._forget(session_id)
+        await self._cache.delete(session_id)
+
+    async def revoke(self, session_id: str) -> None:
+        """Sign a session out on every worker and with Supabase"""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            data = await self._cache.get(session_id)
+            entry = SessionEntry.from_dict(data) if data else None
+        # Outlives any copy: idle copies are evicted after ``ttl``
+        await self._cache.set(self._tombstone(session_id), True, expire=self.ttl)
+        await self._drop(session_id)
+        if entry is None:
+            return
+        try:
+            # Invalidates the refresh token; the access token runs out by itself
+            await asyncio.to_thread(
+                self.client.auth.admin.sign_out, entry.access_token
+            )
+        except Exception as e:
+            logger.warning(f"Supabase sign-out failed for {entry.user_id}: {str(e)}")
+
+    async def refresh(self, entry: SessionEntry) -> Optional[SessionEntry]:
+        """Exchange the refresh token for a new access token"""
+        if await self.is_revoked(entry.session_id):
+            self._forget(entry.session_id)
+            return None
+        shared = await self._cache.get(entry.session_id)
+        if shared and shared["expires_at"] > entry.expires_at:
+            # Another worker already refreshed this session
+            entry = SessionEntry.from_dict(shared)
+            self._remember(entry)
+            return entry
+
+        try:
+            result = await asyncio.to_thread(
+                self.client.auth.refresh_session, entry.refresh_token
+            )
+        except Exception as e:
+            logger.warning(f"Session refresh failed for {entry.user_id}: {str(e)}")
+            await self._drop(entry.session_id)
+            return None
+
+        session = result.session
+        refreshed = SessionEntry(
+            session_id=entry.session_id,
+            user=to_plain(session.user) or entry.user,
+            claims=jwt.get_unverified_claims(session.access_token),
+            access_token=session.access_token,
+            refresh_token=session.refresh_token,
+            expires_at=float(session.expires_at or time.time() + session.expires_in),
+            last_seen=entry.last_seen,
+        )
+        if await self.is_revoked(entry.session_id):
+            # Signed out while we were refreshing; do not bring it back
+            self._forget(entry.session_id)
+            return None
+        self._remember(refreshed)
+        await self._persist(refreshed)
+        return refreshed
+
+    async def refresh_due(self) -> int:
+        """Refresh sessions close to expiry and evict idle ones"""
+        now = time.time()
+        due = []
+        for entry in list(self._sessions.values()):
+            if now - entry.last_seen > self.ttl:
+                self._forget(entry.session_id)
+            elif entry.expires_at - now <= self.refresh_margin:
+                due.append(entry)
+        if due:
+            await asyncio.gather(*(self.refresh(entry) for entry in due))
+        return len(due)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh_due()
+            except Exception as e:
+                logger.error(f"Session refresh loop error: {str(e)}")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+session_store = SessionStore()
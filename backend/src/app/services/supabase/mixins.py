@@ -1,8 +1,15 @@
+import asyncio
 from typing import Dict, Any, Optional
-from app.core.mixins.base import BaseMixin
+import httpx
+from gotrue import SyncGoTrueClient
 from app.core.config import settings
+from app.core.mixins.base import BaseMixin
+from app.core.deadlines import DeadlineExceeded, within_deadline
 from app.core.logger import get_logger
-from supabase import create_client, Client
+from app.db.base import SupabaseDB
+from app.db.stats import run_postgrest
+from app.services.auth.sessions import to_plain
+from supabase import Client
 
 logger = get_logger(__name__)
 
@@ -10,25 +17,47 @@ logger = get_logger(__name__)
 class SupabaseClientMixin(BaseMixin):
     """Base mixin for Supabase client functionality"""
 
-    _client = None
+    __slots__ = ()
 
     @property
-    def client(self):
-        if self._client is None:
-            self._client = create_client(
-                supabase_url=settings.SUPABASE_URL,
-                supabase_key=settings.SUPABASE_KEY,
-            )
-        return self._client
+    def client(self) -> Client:
+        # One process-wide client; services hold no per-instance state
+        return SupabaseDB.get_client()
 
 
 class SupabaseAuthMixin(SupabaseClientMixin):
     """Mixin for Supabase authentication operations"""
 
+    __slots__ = ()
+
+    _http: Optional[httpx.Client] = None
+
+    @property
+    def auth(self) -> SyncGoTrueClient:
+        """A fresh auth client for one sign-up or sign-in
+
+        Signing in stores the user's session on the auth client, so no two
+        callers may share one; they do share a connection pool.
+        """
+        if SupabaseAuthMixin._http is None:
+            SupabaseAuthMixin._http = httpx.Client()
+        key = settings.SUPABASE_KEY
+        return SyncGoTrueClient(
+            url=f"{settings.SUPABASE_URL}/auth/v1",
+            headers={"apiKey": key, "Authorization": f"Bearer {key}"},
+            auto_refresh_token=False,
+            persist_session=False,
+            http_client=SupabaseAuthMixin._http,
+        )
+
     async def sign_up(self, email: str, password: str) -> Dict[str, Any]:
         logger.info(f"Signup attempt for email: {email}")
         try:
-            result = self.client.auth.sign_up({"email": email, "password": password})
+            result = await within_deadline(
+                asyncio.to_thread(
+                    self.auth.sign_up, {"email": email, "password": password}
+                )
+            )
             logger.info(f"Signup successful for email: {email}")
             return result.user
         except Exception as e:
@@ -38,8 +67,11 @@ class SupabaseAuthMixin(SupabaseClientMixin):
     async def sign_in(self, email: str, password: str) -> Dict[str, Any]:
         logger.info(f"Login attempt for email: {email}")
         try:
-            result = self.client.auth.sign_in_with_password(
-                {"email": email, "password": password}
+            result = await within_deadline(
+                asyncio.to_thread(
+                    self.auth.sign_in_with_password,
+                    {"email": email, "password": password},
+                )
             )
             logger.info(f"Login successful for email: {email}")
             return {"user": result.user, "session": result.session}
@@ -47,21 +79,31 @@ class SupabaseAuthMixin(SupabaseClientMixin):
             logger.error(f"Login failed for email {email}: {str(e)}")
             raise
 
-    async def get_current_user(self):
-        """Get current authenticated user"""
+    async def get_current_user(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """The user ``access_token`` belongs to, or None if it is not valid"""
         try:
-            return self.client.auth.get_user()
-        except Exception as e:
+            response = await within_deadline(
+                asyncio.to_thread(self.client.auth.get_user, access_token)
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception:
             return None
+        return to_plain(response.user) if response and response.user else None
 
 
 class SupabaseQueryMixin(SupabaseClientMixin):
     """Mixin for Supabase database operations"""
 
+    __slots__ = ()
+
     async def test_connection(self) -> Dict[str, Any]:
         """Test database connection using test table"""
         try:
-            result = self.client.from_("test").select("*").limit(1).execute()
+            result = await run_postgrest(
+                "test.select_one",
+                lambda: self.client.from_("test").select("*").limit(1),
+            )
             return result.data
         except Exception as e:
             logger.error(f"Database connection test failed: {str(e)}")
@@ -70,7 +112,9 @@ class SupabaseQueryMixin(SupabaseClientMixin):
     async def add_test_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Add test data to test table"""
         try:
-            result = self.client.table("test").insert(data).execute()
+            result = await run_postgrest(
+                "test.insert", lambda: self.client.table("test").insert(data), data
+            )
             return result.data
         except Exception as e:
             logger.error(f"Failed to add test data: {str(e)}")
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from typing import Union
+
+from pydantic.datetime_parse import parse_datetime
+
+Timestamp = Union[datetime, str, float, None]
+
+
+def to_timestamp(value: Timestamp) -> float:
+    """Epoch seconds of a datetime, ISO string or number; NaN for None
+
+    Naive datetimes are taken as UTC. Strings go through pydantic's parser,
+    which (unlike ``datetime.fromisoformat`` before 3.11) accepts the 1-6
+    digit fractions and ``Z`` suffix PostgREST returns.
+    """
+    if value is None:
+        return float("nan")
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def from_timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
@@ -1,16 +1,27 @@
+import argparse
+import gc
 import os
+import select
+import signal
+import socket
+import time
+from importlib.util import find_spec
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from dotenv import load_dotenv
 import uvicorn
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Records reach the app's log pipeline once main installs it (that needs the
+# environment loaded first, for the settings)
 logger = logging.getLogger(__name__)
 
 
-def load_environment():
-    """Load environment variables from the appropriate .env file"""
+def load_environment() -> Optional[Path]:
+    """Load environment variables from the appropriate .env file
+
+    Returns the file loaded, if any.
+    """
     # Get the backend root directory (two levels up from this file)
     backend_dir = Path(__file__).parent.parent.parent
 
@@ -20,26 +31,300 @@ def load_environment():
     env_path = backend_dir / env_file
 
     # Load environment variables
-    if env_path.exists():
-        load_dotenv(env_path)
-        logger.info(f"Loaded environment from: {env_path}")
-    else:
-        logger.warning(f"Environment file not found: {env_path}")
-        logger.info("Using existing environment variables")
+    if not env_path.exists():
+        return None
+    load_dotenv(env_path)
+    return env_path
+
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return os.cpu_count() or 1
+
+
+def bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+class ReadyServer(uvicorn.Server):
+    """Tells the supervisor once startup (including lifespan) has completed"""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        try:
+            if self.started:
+                os.write(self.ready_fd, b"1")
+        except BrokenPipeError:
+            pass  # Nobody is waiting on this worker
+        finally:
+            os.close(self.ready_fd)
+
+    async def shutdown(self, sockets=None) -> None:
+        # Event streams never finish by themselves; end them first so the
+        # graceful shutdown only waits for ordinary requests
+        from app.core.events import event_hub
+
+        event_hub.close_all()
+        await super().shutdown(sockets=sockets)
+
+
+class Supervisor:
+    """Pre-fork process manager for production
+
+    The app is imported once in the parent and the heap frozen out of the
+    garbage collector before forking, so workers share those pages
+    copy-on-write instead of each importing (and dirtying) their own copy.
+    Where the OS supports SO_REUSEPORT every worker binds its own listener
+    and the kernel balances connections; otherwise they share one socket.
+
+    Signals: TERM/INT stop gracefully, HUP replaces workers one at a time,
+    each new worker taking traffic before the old one drains, and USR1 is
+    passed on to workers to reload runtime configuration in place. Because
+    listeners use SO_REUSEPORT, a new release can also be rolled by starting
+    a second supervisor before stopping the old one.
+    """
+
+    READY_TIMEOUT = 60.0
+
+    def __init__(
+        self,
+        app,
+        host: str,
+        port: int,
+        workers: int,
+        log_level: str,
+        graceful_timeout: float,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.size = workers
+        self.log_level = log_level
+        self.graceful_timeout = graceful_timeout
+        self.loop = "uvloop" if find_spec("uvloop") else "asyncio"
+        self.http = "httptools" if find_spec("httptools") else "h11"
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+        self.shared_socket: Optional[socket.socket] = None
+        self.workers: Dict[int, float] = {}  # pid -> spawn time
+        self.stopping = False
+        self.reload_requested = False
+
+    def _serve(self, ready_fd: int) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_DFL)
+        # Until the app installs its reload handler, USR1 must not kill us
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+        sock = self.shared_socket or bind_socket(self.host, self.port, True)
+        config = uvicorn.Config(
+            self.app,
+            loop=self.loop,
+            http=self.http,
+            lifespan="on",
+            log_level=self.log_level,
+            # uvicorn's loggers propagate into the app's queued log pipeline
+            log_config=None,
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        ReadyServer(config, ready_fd).run(sockets=[sock])
+
+    def spawn(self) -> Tuple[int, int]:
+        """Fork a worker; returns its pid and the read end of its ready pipe"""
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            code = 0
+            try:
+                self._serve(ready_write)
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                # os._exit skips atexit, and the log writer is a daemon
+                # thread; flush the crash record and shutdown logs first
+                from app.core.logger import log_pipeline
+
+                log_pipeline.stop()
+                # Never fall back into the supervisor loop
+                os._exit(code)
+        os.close(ready_write)
+        self.workers[pid] = time.monotonic()
+        return pid, ready_read
+
+    def _wait_ready(self, ready_read: int) -> bool:
+        try:
+            readable, _, _ = select.select([ready_read], [], [], self.READY_TIMEOUT)
+            return bool(readable) and os.read(ready_read, 1) == b"1"
+        finally:
+            os.close(ready_read)
+
+    def _terminate(self, pid: int, timeout: float) -> None:
+        self.workers.pop(pid, None)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return
+            time.sleep(0.1)
+        logger.warning(f"Worker {pid} did not stop in time; killing it")
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+    def _reap(self) -> None:
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            spawned = self.workers.pop(pid, None)
+            if spawned is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if self.stopping:
+                continue
+            # Back off if workers die straight after starting
+            if time.monotonic() - spawned < 1:
+                time.sleep(1)
+            logger.warning(f"Worker {pid} exited with {code}; respawning")
+            _, ready_read = self.spawn()
+            os.close(ready_read)
+
+    def rolling_restart(self) -> None:
+        for old in list(self.workers):
+            new, ready_read = self.spawn()
+            if not self._wait_ready(ready_read):
+                logger.error(f"Replacement worker {new} failed to start; aborting")
+                self._terminate(new, self.graceful_timeout)
+                return
+            self._terminate(old, self.graceful_timeout)
+        logger.info("Rolling restart complete")
+
+    def _handle_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _handle_reload(self, signum, frame) -> None:
+        self.reload_requested = True
+
+    def _forward(self, signum, frame) -> None:
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        if not self.reuse_port:
+            self.shared_socket = bind_socket(self.host, self.port, False)
+        # Everything imported so far is shared with the workers; keep the
+        # collector from touching (and so copying) those pages after fork
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        signal.signal(signal.SIGUSR1, self._forward)
+
+        logger.info(
+            f"Starting {self.size} workers on {self.host}:{self.port} "
+            f"(loop={self.loop}, http={self.http}, reuse_port={self.reuse_port})"
+        )
+        for _ in range(self.size):
+            _, ready_read = self.spawn()
+            os.close(ready_read)
+
+        while not self.stopping:
+            if self.reload_requested:
+                self.reload_requested = False
+                self.rolling_restart()
+            self._reap()
+            time.sleep(0.2)
+
+        logger.info("Stopping workers")
+        for pid in list(self.workers):
+            os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            self._terminate(pid, 0)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the DHG Composer API")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        default=os.getenv("ENV", "development") in ("production", "staging"),
+        help="Pre-forked multi-worker server (default for production/staging)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", "0")) or available_cpus(),
+        help="Worker processes in --prod mode (default: available CPUs)",
+    )
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8001")))
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        help="Seconds a stopping worker may spend draining requests",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
     # Load environment before importing the app
-    load_environment()
-
-    # Import app after environment is loaded
-    from app.main import app
-
-    # Run the server
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=int(os.getenv("PORT", "8001")),
-        reload=True,
-        log_level=os.getenv("LOG_LEVEL", "info"),
-    )
+    env_path = load_environment()
+    from app.core.logger import log_pipeline
+
+    log_pipeline.install()
+    if env_path is not None:
+        logger.info(f"Loaded environment from: {env_path}")
+    else:
+        logger.warning("Environment file not found; using existing variables")
+    args = parse_args()
+    log_level = os.getenv("LOG_LEVEL", "info")
+
+    if args.prod:
+        # Preload once in the supervisor; workers inherit it via fork
+        from app.main import app
+
+        Supervisor(
+            app,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level=log_level,
+            graceful_timeout=args.graceful_timeout,
+        ).run()
+    else:
+        # Run the development server
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level=log_level,
+        )
@@ -1,5 +1,11 @@
+import os
 import pytest
 from typing import Generator, Dict, Any
+
+# Placeholder credentials so settings validate without a real project
+os.environ.setdefault("SUPABASE_URL", "https://test-project.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "test-anon-key.test-payload.test-signature")
+
 from app.core.config import settings
 from app.db.base import SupabaseDB
 
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.api import batch
+from app.api.batch import BatchItem, router as batch_router
+from app.core.auth import get_current_session
+from app.core.concurrency import AdaptiveLimiter, RoutePriorities
+from app.services.auth.sessions import SessionEntry, session_store
+
+
+def make_app():
+    api = APIRouter()
+
+    @api.get("/me")
+    async def me(session: SessionEntry = Depends(get_current_session)):
+        return {"user": session.user_id}
+
+    @api.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404, detail="Nope")
+
+    @api.get("/text")
+    async def text():
+        return PlainTextResponse("hello")
+
+    @api.post("/echo")
+    async def echo(payload: dict):
+        return payload
+
+    app = FastAPI()
+    app.include_router(api, prefix="/api")
+    app.include_router(batch_router, prefix="/api")
+    return app
+
+
+def test_batch_authenticates_once_and_keeps_order(monkeypatch):
+    entry = SessionEntry("s1", {"id": "u1"}, {}, "token-1", "r1", time.time() + 60)
+    session_store._remember(entry)
+    lookups = []
+    get_by_token = session_store.get_by_token
+
+    async def counting(token):
+        lookups.append(token)
+        return await get_by_token(token)
+
+    monkeypatch.setattr(session_store, "get_by_token", counting)
+    client = TestClient(make_app())
+    try:
+        response = client.post(
+            "/api/batch",
+            headers={"Authorization": "Bearer token-1"},
+            json={
+                "requests": [
+                    {"path": "/api/me"},
+                    {"path": "/api/missing"},
+                    {"path": "/api/text"},
+                    {"method": "post", "path": "/api/echo", "body": {"a": [1, 2]}},
+                    {"path": "/api/nowhere"},
+                ]
+            },
+        )
+    finally:
+        session_store._forget("s1")
+
+    assert response.status_code == 200
+    results = response.json()["responses"]
+    assert [r["status"] for r in results] == [200, 404, 200, 200, 404]
+    assert results[0]["body"] == {"user": "u1"}
+    assert results[1]["body"] == {"detail": "Nope"}
+    assert results[2]["body"] == "hello"
+    assert results[3]["body"] == {"a": [1, 2]}
+    assert lookups == ["token-1"]
+
+
+def test_batch_requires_auth_and_rejects_nesting():
+    client = TestClient(make_app())
+    response = client.post("/api/batch", json={"requests": [{"path": "/api/me"}]})
+    assert response.status_code == 401
+    with pytest.raises(ValidationError):
+        BatchItem(path="/api/batch/")
+    with pytest.raises(ValidationError):
+        BatchItem(method="TRACE", path="/api/me")
+
+
+def test_batched_requests_go_through_the_concurrency_limiter(monkeypatch):
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_queue=0)
+    limiter.in_flight = 1  # Saturated: every limited request is shed
+    monkeypatch.setattr(batch, "concurrency_limiter", limiter)
+    monkeypatch.setattr(
+        batch, "route_priorities", RoutePriorities({"/api/text": "exempt"})
+    )
+    entry = SessionEntry("s1", {"id": "u1"}, {}, "token-1", "r1", time.time() + 60)
+    session_store._remember(entry)
+    client = TestClient(make_app())
+    try:
+        response = client.post(
+            "/api/batch",
+            headers={"Authorization": "Bearer token-1"},
+            json={"requests": [{"path": "/api/me"}, {"path": "/api/text"}]},
+        )
+    finally:
+        session_store._forget("s1")
+
+    shed, exempt = response.json()["responses"]
+    assert shed["status"] == 503
+    assert int(shed["headers"]["retry-after"]) >= 1
+    assert exempt["status"] == 200
+    assert limiter.in_flight == 1
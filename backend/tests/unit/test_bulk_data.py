@@ -0,0 +1,31 @@
+import orjson
+
+from utils.bulk import encode, generate, generate_chunks
+
+
+def test_chunks_are_deterministic_with_unique_emails():
+    def chunks(seed, workers):
+        return list(
+            generate_chunks("users", 2500, "copy", seed, 1, 1000, workers)
+        )
+
+    first = chunks(seed=7, workers=1)
+    assert chunks(seed=7, workers=2) == first
+    assert chunks(seed=8, workers=1) != first
+
+    rows = b"".join(first).decode().splitlines()
+    ids = [int(row.split("\t")[0]) for row in rows]
+    emails = [row.split("\t")[1] for row in rows]
+    assert ids == list(range(1, 2501))
+    assert len(set(emails)) == len(emails)
+
+
+def test_formats_round_trip_course_schedules():
+    columns = generate("courses", 1, 3, seed=1)
+
+    records = [orjson.loads(line) for line in encode(columns, "ndjson").splitlines()]
+    assert [r["id"] for r in records] == [1, 2, 3]
+    assert all(4 <= len(r["schedule"]) <= 12 for r in records)
+
+    copy_row = encode(columns, "copy").decode().splitlines()[0].split("\t")
+    assert copy_row[4] == "{" + ",".join(f'"{s}"' for s in records[0]["schedule"]) + "}"
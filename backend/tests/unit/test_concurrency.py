@@ -0,0 +1,73 @@
+import asyncio
+
+from app.core.concurrency import AdaptiveLimiter
+from app.middleware.concurrency import ConcurrencyLimitMiddleware
+
+
+async def test_queued_critical_requests_go_first_and_bulk_is_shed():
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=2, max_queue=10)
+    assert await limiter.acquire("normal")
+    assert await limiter.acquire("critical")
+
+    # Full: bulk gives up almost at once, critical and normal wait
+    bulk = asyncio.ensure_future(limiter.acquire("bulk"))
+    normal = asyncio.ensure_future(limiter.acquire("normal"))
+    critical = asyncio.ensure_future(limiter.acquire("critical"))
+    assert await bulk is False
+
+    limiter.release(0.01)
+    assert await critical is True
+    assert not normal.done()
+    limiter.release(0.01)
+    assert await normal is True
+    assert limiter.shed == 1 and limiter.queued == 0
+
+
+def test_limit_shrinks_when_latency_rises_and_recovers():
+    limiter = AdaptiveLimiter(initial=20, min_limit=2, max_limit=100)
+    limiter.in_flight = 20
+    for _ in range(200):
+        limiter._update(0.01)
+    grown = limiter.limit
+    assert grown > 20
+
+    for _ in range(50):
+        limiter._update(0.2)
+    assert limiter.limit < grown / 2
+
+
+async def test_middleware_sheds_with_retry_after():
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=1, max_queue=0)
+    gate = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await gate.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = ConcurrencyLimitMiddleware(
+        app, limiter, {"/health": "exempt", "GET /api/items": "bulk"}
+    )
+    assert middleware.classify("GET", "/api/items/1") == "bulk"
+    assert middleware.classify("POST", "/api/items") == "normal"
+
+    def call(path):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": path, "headers": []}
+        return sent, asyncio.ensure_future(middleware(scope, None, send))
+
+    first, first_done = call("/api/items")
+    await asyncio.sleep(0)
+    shed, shed_done = call("/api/items")
+    health, health_done = call("/health/live")
+    await shed_done
+    assert shed[0]["status"] == 503
+    assert (b"retry-after", b"1") in shed[0]["headers"]
+
+    gate.set()
+    await asyncio.gather(first_done, health_done)
+    assert first[0]["status"] == 200 and health[0]["status"] == 200
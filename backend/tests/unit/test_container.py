@@ -0,0 +1,134 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import container as container_module
+from app.core.container import Container
+from app.core.deps import get_db
+
+
+class Recorder:
+    """Stands in for a shared service, logging lifecycle calls"""
+
+    has_redis = False
+
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    def add_check(self, name, check):
+        pass
+
+    async def start(self, *args):
+        self.log.append(f"{self.name}.start")
+
+    async def stop(self, *args, **kwargs):
+        self.log.append(f"{self.name}.stop")
+
+    async def close(self, *args, **kwargs):
+        self.log.append(f"{self.name}.close")
+
+
+@pytest.fixture
+def log(monkeypatch):
+    log = []
+
+    async def warm(self):
+        log.append("warmup")
+
+    async def broken(self):
+        log.append("warmup")
+        raise RuntimeError("unreachable")
+
+    async def hook(container):
+        log.append("hook")
+
+    async def failing_hook(container):
+        log.append("hook")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(Container, "_start_db", broken)
+    monkeypatch.setattr(Container, "_start_supabase", warm)
+    monkeypatch.setattr(Container, "_start_cache", warm)
+    monkeypatch.setattr(Container, "startup_hooks", [failing_hook, hook])
+    monkeypatch.setattr(Container, "shutdown_hooks", [failing_hook, hook])
+    return log
+
+
+@pytest.fixture
+def container(log):
+    container = Container()
+    for name in (
+        "cache",
+        "sessions",
+        "health",
+        "jobs",
+        "idempotency",
+        "config",
+        "quotas",
+        "events",
+    ):
+        setattr(container, name, Recorder(name, log))
+    return container
+
+
+async def test_startup_warms_resources_before_services_and_hooks(container, log):
+    await container.startup()
+
+    assert log == [
+        "warmup",
+        "warmup",
+        "warmup",
+        "config.start",
+        "quotas.start",
+        "health.start",
+        "sessions.start",
+        "jobs.start",
+        "events.start",
+        "hook",
+        "hook",
+    ]
+
+
+async def test_shutdown_runs_hooks_before_closing_resources(container, log):
+    await container.shutdown()
+
+    assert log == [
+        "hook",
+        "hook",
+        "events.stop",
+        "config.stop",
+        "quotas.stop",
+        "sessions.stop",
+        "health.stop",
+        "jobs.stop",
+        "cache.close",
+        "idempotency.close",
+    ]
+
+
+async def test_unconnected_pool_is_not_handed_out(monkeypatch):
+    class UnreachableDB:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def connect(self):
+            raise OSError("connection refused")
+
+    monkeypatch.setattr(container_module.settings, "DATABASE_URL", "postgresql://db")
+    monkeypatch.setattr(container_module, "PostgresDB", UnreachableDB)
+    container = Container()
+    with pytest.raises(OSError):
+        await container._start_db()
+    assert container.db is None
+
+    app = FastAPI()
+    app.state.container = container
+
+    @app.get("/rows")
+    async def rows(db=Depends(get_db)):
+        return []
+
+    response = TestClient(app).get("/rows")
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Database not configured"}
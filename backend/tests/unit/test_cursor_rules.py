@@ -0,0 +1,42 @@
+import importlib.util
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+SCRIPT = ROOT / "scripts" / "sys" / "evaluate_cursor_rules.py"
+spec = importlib.util.spec_from_file_location("evaluate_cursor_rules", SCRIPT)
+cursor_rules = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cursor_rules)
+
+TEXTS = [
+    "python -m pip install requests\n",
+    "run pip install -r requirements.txt && pip freeze > requirements.txt\n",
+    "aaaa\nxpip-syncpip sync\n  source venv/bin/activate\n",
+]
+
+
+def naive(rules, text):
+    findings = []
+    for name, rule in rules.items():
+        for index, pattern in enumerate(rule["patterns"]):
+            for m in re.finditer(pattern, text):
+                line = text.count("\n", 0, m.start())
+                column = m.start() - (text.rfind("\n", 0, m.start()) + 1)
+                findings.append((name, index, line + 1, column + 1, m.group()))
+    return sorted(findings)
+
+
+def test_scanner_matches_per_pattern_finditer():
+    rules = {
+        name: {"patterns": rule["patterns"] + ["aa"]}
+        for name, rule in cursor_rules.CURSOR_RULES.items()
+    }
+    scanner = cursor_rules.RuleScanner(rules)
+    for text in TEXTS:
+        assert sorted(scanner.scan(text)) == naive(rules, text)
+
+
+def test_overlapping_matches_are_all_reported():
+    scanner = cursor_rules.RuleScanner(cursor_rules.CURSOR_RULES)
+    found = {(f[3], f[4]) for f in scanner.scan("python -m pip install requests")}
+    assert {(1, "python -m pip"), (11, "pip install")} <= found
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from app.core.deadlines import DeadlineExceeded, request_budget, within_deadline
+from app.middleware.deadline import DeadlineMiddleware
+
+
+def scope(headers=()):
+    return {"type": "http", "method": "GET", "path": "/slow", "headers": list(headers)}
+
+
+async def run(app, headers=(), disconnect_after=None, default=0.05):
+    sent = []
+
+    async def receive():
+        if not sent and not hasattr(receive, "body_sent"):
+            receive.body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        if disconnect_after is not None:
+            await asyncio.sleep(disconnect_after)
+            return {"type": "http.disconnect"}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    await DeadlineMiddleware(app, default=default, maximum=1.0)(
+        scope(headers), receive, send
+    )
+    return sent
+
+
+async def test_expired_budget_cancels_handler_with_504():
+    cancelled = asyncio.Event()
+
+    async def app(scope, receive, send):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    sent = await run(app)
+    assert cancelled.is_set()
+    assert sent[0]["status"] == 504
+
+
+async def test_client_disconnect_cancels_without_response():
+    async def app(scope, receive, send):
+        await asyncio.sleep(5)
+
+    sent = await asyncio.wait_for(run(app, disconnect_after=0.01, default=None), 1)
+    assert sent == []
+
+
+async def test_outbound_calls_get_the_shorter_budget():
+    seen = {}
+
+    async def app(scope, receive, send):
+        await request_budget(10)()  # Route default cannot exceed the header
+        try:
+            await within_deadline(asyncio.sleep(5))
+        except DeadlineExceeded:
+            seen["raised"] = True
+        await send({"type": "http.response.start", "status": 504, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = await run(app, headers=[(b"x-request-timeout", b"0.02")], default=None)
+    assert seen == {"raised": True}
+    assert sent[0]["status"] == 504
+
+
+async def test_outer_cancellation_waits_for_the_handler():
+    finished = asyncio.Event()
+
+    async def app(scope, receive, send):
+        try:
+            await asyncio.sleep(5)
+        finally:
+            await asyncio.sleep(0.01)  # Cleanup still gets to run
+            finished.set()
+
+    request = asyncio.ensure_future(run(app, default=None))
+    await asyncio.sleep(0.01)
+    request.cancel()
+    await asyncio.gather(request, return_exceptions=True)
+    assert request.cancelled() and finished.is_set()
+
+
+async def test_token_verification_is_bounded_by_the_deadline(monkeypatch):
+    import time
+    from types import SimpleNamespace
+
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from app.core import auth
+    from app.core.deadlines import Deadline, current_deadline
+
+    client = SimpleNamespace(auth=SimpleNamespace(get_user=lambda jwt: time.sleep(0.5)))
+    monkeypatch.setattr(auth.SupabaseDB, "get_client", lambda: client)
+    token = HTTPAuthorizationCredentials(scheme="Bearer", credentials="jwt")
+    reset = current_deadline.set(Deadline(0.02))
+    try:
+        started = time.perf_counter()
+        with pytest.raises(DeadlineExceeded):
+            await auth.get_current_user(None, token)
+        assert time.perf_counter() - started < 0.3
+    finally:
+        current_deadline.reset(reset)
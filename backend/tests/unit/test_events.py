@@ -0,0 +1,64 @@
+import asyncio
+
+from app.core.events import RESYNC, EventHub, EventStreamResponse
+
+
+async def test_updates_coalesce_and_overflow_asks_for_resync():
+    hub = EventHub(buffer_size=3, heartbeat=60)
+    course = hub.subscribe(["app2:course:1"])
+    everything = hub.subscribe(["app2:courses", "app2:course:1"])
+
+    for version in range(5):
+        hub.publish(["app2:courses", "app2:course:1"], "course.updated", version, key=1)
+    chunk = await course.next_chunk()
+    assert chunk.count(b"event: course.updated") == 1 and b"data: 4" in chunk
+    # Subscribed to both topics, still delivered once
+    assert (await everything.next_chunk()).count(b"data: 4") == 1
+
+    for i in range(4):
+        hub.publish(["app2:course:1"], "session.scheduled", {"n": i})
+    assert (await course.next_chunk()).startswith(RESYNC)
+
+    hub.unsubscribe(course)
+    assert hub.publish(["app2:course:1"], "course.updated", 5, key=1) == 1
+
+
+async def test_stream_ends_when_hub_closes():
+    hub = EventHub(heartbeat=60)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    response = EventStreamResponse(hub, hub.subscribe(["app2:courses"]))
+    stream = asyncio.ensure_future(response({"type": "http"}, None, send))
+    await asyncio.sleep(0)
+    hub.publish(["app2:courses"], "course.updated", {"course_id": 7}, key=7)
+    await asyncio.sleep(0)
+    hub.close_all()
+    await asyncio.wait_for(stream, 1)
+
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in sent[0]["headers"]
+    assert b'data: {"course_id":7}' in sent[2]["body"]
+    assert sent[-1]["more_body"] is False
+    assert hub.stats() == {"subscriptions": 0, "topics": 0}
+
+
+async def test_stored_sessions_are_published_from_the_session_sync():
+    from app.core.events import event_hub
+    from app.domains.app2.courses.events import publish_session_updates
+    from app.domains.app2.courses.scheduling import session_sync
+
+    assert publish_session_updates in session_sync.sinks
+    course = event_hub.subscribe(["app2:course:4"])
+    try:
+        row = {"id": 9, "course_id": 4, "instructor_id": 10}
+        publish_session_updates([dict(row, starts_at="2025-01-06T09:00:00+00:00")])
+        publish_session_updates([dict(row, starts_at="2025-01-06T11:00:00+00:00")])
+        chunk = await course.next_chunk()
+    finally:
+        event_hub.unsubscribe(course)
+
+    # A moved session replaces its pending event
+    assert chunk.count(b"event: session.scheduled") == 1
+    assert b'"session_id":9' in chunk and b"T11:00" in chunk
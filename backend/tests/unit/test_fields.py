@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import orjson
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.fields import FieldSet, InvalidFieldsError, sparse_fields, sparse_response
+from app.domains.user.schemas import UserResponse
+
+
+def test_fieldset_renders_select_and_projects_rows():
+    fields = FieldSet.parse(UserResponse, " email, ,full_name,email", required=["id"])
+    assert fields.names == ("id", "email", "full_name")
+    assert fields.select() == "id,email,full_name"
+    assert fields.sql("users") == '"users"."id", "users"."email", "users"."full_name"'
+    row = {"id": 1, "email": "a@b.co", "full_name": "A", "created_at": "x"}
+    assert fields.project([row]) == [{"id": 1, "email": "a@b.co", "full_name": "A"}]
+
+    assert FieldSet.parse(UserResponse, None) is None
+    with pytest.raises(InvalidFieldsError) as e:
+        FieldSet.parse(UserResponse, "email,password")
+    assert e.value.unknown == ["password"]
+
+
+def test_route_returns_only_requested_fields():
+    app = FastAPI()
+    user = {
+        "id": 7,
+        "email": "a@b.co",
+        "full_name": "A",
+        "created_at": datetime(2024, 1, 1),
+    }
+
+    @app.get("/user", response_model=UserResponse)
+    async def get_user(fields=Depends(sparse_fields(UserResponse))):
+        return sparse_response(user, fields)
+
+    client = TestClient(app)
+    assert set(client.get("/user").json()) == set(UserResponse.__fields__)
+    response = client.get("/user", params={"fields": "email"})
+    assert orjson.loads(response.content) == {"id": 7, "email": "a@b.co"}
+    response = client.get("/user", params={"fields": "secret"})
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]["message"]
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import health
+from app.core.health import HealthProber
+
+
+async def test_probes_are_cached_between_intervals():
+    calls = []
+
+    async def db():
+        calls.append(1)
+
+    prober = HealthProber(interval=60)
+    prober.add_check("db", db)
+    await prober.start()
+    for _ in range(3):
+        prober.status()
+    await prober.stop()
+
+    assert len(calls) == 1
+    assert prober.status()["checks"]["db"]["ok"]
+
+
+async def test_ready_needs_every_check_to_pass():
+    async def ok():
+        pass
+
+    async def hangs():
+        await asyncio.sleep(5)
+
+    prober = HealthProber(timeout=0.01)
+    prober.add_check("db", ok)
+    prober.add_check("redis", hangs)
+    assert not prober.ready  # Not probed yet
+
+    await prober.probe_once()
+    status = prober.status()
+    assert not prober.ready and status["status"] == "unavailable"
+    assert status["checks"]["db"]["ok"]
+    assert status["checks"]["redis"]["error"] == "TimeoutError"
+
+
+def make_client(ready: bool) -> TestClient:
+    app = FastAPI()
+    app.include_router(health.router, prefix="/health")
+    checks = {"db": {"ok": ready}}
+    app.state.container = SimpleNamespace(
+        health=SimpleNamespace(ready=ready, status=lambda: {"checks": checks})
+    )
+    return TestClient(app)
+
+
+def test_live_and_ready_status_codes():
+    assert make_client(True).get("/health/live").status_code == 200
+    assert make_client(True).get("/health/ready").status_code == 200
+    response = make_client(False).get("/health/ready")
+    assert response.status_code == 503
+    assert response.json() == {"checks": {"db": {"ok": False}}}
+
+
+def test_debug_routes_are_hidden_unless_debug(monkeypatch):
+    assert health.settings.__fields__["DEBUG"].default is False
+    client = make_client(True)
+    monkeypatch.setattr(health.settings, "DEBUG", False)
+    for path in ("queries", "spans", "concurrency"):
+        assert client.get(f"/health/{path}").status_code == 404
+
+    monkeypatch.setattr(health.settings, "DEBUG", True)
+    assert "queries" in client.get("/health/queries").json()
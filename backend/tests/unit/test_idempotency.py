@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import RedisCache
+from app.core.idempotency import (
+    IdempotencyKeyReusedError,
+    IdempotencyStore,
+    fingerprint,
+)
+from utils.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(cache=RedisCache(url=""))
+
+
+async def test_concurrent_duplicates_run_once_and_replay(store):
+    calls = []
+
+    async def charge():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"payment_id": "p1"}
+
+    request_hash = fingerprint(10.0, "usd", "card")
+    results = await asyncio.gather(
+        *(store.run("k1", request_hash, charge) for _ in range(5))
+    )
+
+    assert len(calls) == 1
+    assert [replayed for _, replayed in results].count(False) == 1
+    assert all(result == {"payment_id": "p1"} for result, _ in results)
+
+    result, replayed = await store.run("k1", request_hash, charge)
+    assert replayed and result == {"payment_id": "p1"} and len(calls) == 1
+
+
+async def test_key_reuse_with_different_request_is_rejected(store):
+    async def charge():
+        return {"ok": True}
+
+    await store.run("k1", fingerprint(10.0), charge)
+    with pytest.raises(IdempotencyKeyReusedError):
+        await store.run("k1", fingerprint(99.0), charge)
+
+
+async def test_failed_run_is_not_recorded(store):
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("gateway timeout")
+        return {"ok": True}
+
+    with pytest.raises(RuntimeError):
+        await store.run("k1", "h", flaky)
+    result, replayed = await store.run("k1", "h", flaky)
+    assert result == {"ok": True} and not replayed
+
+
+async def test_slow_run_keeps_its_claim_across_workers():
+    redis = FakeRedis()
+    workers = []
+    for _ in range(2):
+        store = IdempotencyStore(cache=RedisCache(url=""), lock_ttl=0.05, wait=2.0)
+        store._redis = redis
+        workers.append(store)
+    calls = []
+
+    async def checkout():
+        calls.append(1)
+        await asyncio.sleep(0.2)  # Several lock lifetimes
+        return {"order": 1}
+
+    async def retry():
+        await asyncio.sleep(0.1)
+        return await workers[1].run("k1", "h", checkout)
+
+    first, second = await asyncio.gather(workers[0].run("k1", "h", checkout), retry())
+    assert len(calls) == 1
+    assert first == ({"order": 1}, False) and second == ({"order": 1}, True)
+
+
+async def test_unimplemented_payment_is_not_recorded(store, monkeypatch):
+    from app.domains.dhg_baseline.app1 import mixins
+
+    class Payments(mixins.PaymentProcessingMixin):
+        pass
+
+    monkeypatch.setattr(mixins, "idempotency_store", store)
+    with pytest.raises(NotImplementedError):
+        await Payments().process_payment(10.0, "EUR", "card", "u1", "k1")
+    assert store.local.get_nowait("payment:u1:k1") is None
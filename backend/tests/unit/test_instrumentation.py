@@ -0,0 +1,73 @@
+import asyncio
+import logging
+
+import pytest
+
+from app.core.instrumentation import SpanRegistry, instrument
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    SpanRegistry.reset()
+    yield SpanRegistry
+    SpanRegistry.reset()
+
+
+def stats_for(name):
+    return next(row for row in SpanRegistry.stats() if row["name"] == name)
+
+
+async def test_sync_async_and_generator_functions_are_timed():
+    @instrument(sample_rate=1)
+    def add(a, b):
+        return a + b
+
+    @instrument(name="fetch", sample_rate=1)
+    async def fetch():
+        await asyncio.sleep(0)
+        return "row"
+
+    @instrument(name="stream", sample_rate=1)
+    async def stream():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield i
+
+    assert add(1, 2) == 3
+    assert await fetch() == "row"
+    assert [i async for i in stream()] == [0, 1, 2]
+
+    assert stats_for(add.__qualname__)["calls"] == 1
+    assert stats_for("fetch")["sampled"] == 1
+    assert stats_for("stream")["calls"] == 1
+
+
+async def test_only_slow_calls_emit_spans(caplog):
+    @instrument(name="slow", slow_ms=5, sample_rate=0)
+    async def slow(delay):
+        await asyncio.sleep(delay)
+        if delay:
+            raise TimeoutError("upstream")
+
+    with caplog.at_level(logging.WARNING, logger="span"):
+        await slow(0)
+        with pytest.raises(TimeoutError):
+            await slow(0.01)
+
+    spans = [record.span for record in caplog.records if hasattr(record, "span")]
+    assert [span["status"] for span in spans] == ["error"]
+    assert spans[0]["error"] == "TimeoutError"
+    row = stats_for("slow")
+    assert row["calls"] == 2 and row["errors"] == 1 and row["sampled"] == 0
+
+
+def test_reset_keeps_decorated_functions_reporting(registry):
+    @instrument(name="reset.me", sample_rate=1)
+    def work():
+        return 1
+
+    work()
+    registry.reset()
+    assert stats_for("reset.me")["calls"] == 0
+    work()
+    assert stats_for("reset.me")["calls"] == 1
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from app.core.deadlines import Deadline, current_deadline, within_deadline
+from app.domains.dhg_baseline.app1.products.inventory import (
+    InsufficientStockError,
+    InventoryEngine,
+    ProductNotFoundError,
+    StockStore,
+)
+
+
+class FakeStockStore(StockStore):
+    def __init__(self, stock):
+        self.stock = dict(stock)
+        self.writes = []
+
+    async def fetch(self, product_ids):
+        return {pid: self.stock[pid] for pid in product_ids if pid in self.stock}
+
+    async def adjust(self, product_id, delta):
+        self.writes.append(delta)
+        if product_id not in self.stock or self.stock[product_id] + delta < 0:
+            return None
+        self.stock[product_id] += delta
+        return self.stock[product_id]
+
+
+async def test_concurrent_adjustments_coalesce_into_one_write():
+    store = FakeStockStore({1: 100})
+    engine = InventoryEngine(store, window=0.01)
+    flushed = []
+
+    @engine.on_flush
+    async def record(product_id, stock, changes):
+        flushed.append((product_id, stock, len(changes)))
+
+    results = await asyncio.gather(*(engine.adjust(1, -1, "u") for _ in range(50)))
+
+    assert store.writes == [-50]
+    assert store.stock[1] == 50
+    assert sorted(results) == list(range(50, 100))
+    assert flushed == [(1, 50, 50)]
+
+
+async def test_oversell_is_rejected_per_request():
+    store = FakeStockStore({1: 3})
+    engine = InventoryEngine(store, window=0.01)
+
+    results = await asyncio.gather(
+        *(engine.adjust(1, -1) for _ in range(5)), return_exceptions=True
+    )
+
+    assert sum(isinstance(r, InsufficientStockError) for r in results) == 2
+    assert store.stock[1] == 0
+    assert store.writes == [-3]
+
+
+async def test_guard_failure_readmits_batch_against_fresh_stock():
+    store = FakeStockStore({1: 10})
+    engine = InventoryEngine(store, window=0.01)
+    await engine.adjust(1, 0)
+    store.stock[1] = 2  # Drained by another worker behind our back
+
+    results = await asyncio.gather(
+        *(engine.adjust(1, -1) for _ in range(4)), return_exceptions=True
+    )
+
+    assert [r for r in results if not isinstance(r, Exception)] == [1, 0]
+    assert store.stock[1] == 0
+    assert engine.available(1) == 0
+
+
+async def test_stale_ledger_is_reloaded_before_rejecting():
+    store = FakeStockStore({1: 1})
+    engine = InventoryEngine(store, window=0.01)
+    assert await engine.adjust(1, -1) == 0
+    store.stock[1] = 5  # Restocked by another worker
+
+    assert await engine.adjust(1, -2) == 3
+    with pytest.raises(InsufficientStockError):
+        await engine.adjust(1, -4)
+    assert store.writes == [-1, -2]
+
+
+def test_stock_store_requires_both_methods():
+    class FetchOnly(StockStore):
+        async def fetch(self, product_ids):
+            return {}
+
+    with pytest.raises(TypeError):
+        FetchOnly()
+
+
+async def test_reconcile_refreshes_idle_ledgers_and_stop_flushes():
+    store = FakeStockStore({1: 5, 2: 5})
+    engine = InventoryEngine(store, window=10)
+    await engine.start()
+    pending = asyncio.ensure_future(engine.adjust(2, 3))
+    await asyncio.sleep(0)
+
+    store.stock[1] = 9
+    assert engine.available(1) is None
+    engine._ledger(1).stock = 5
+    assert await engine.reconcile() == 1
+    assert engine.available(1) == 9
+
+    await engine.stop()
+    assert await pending == 8
+    assert store.stock[2] == 8
+
+
+async def test_flush_is_not_bound_by_the_first_callers_deadline():
+    class DeadlineAwareStore(FakeStockStore):
+        async def adjust(self, product_id, delta):
+            await within_deadline(asyncio.sleep(0))
+            return await super().adjust(product_id, delta)
+
+    store = DeadlineAwareStore({1: 10})
+    engine = InventoryEngine(store, window=0.02)
+
+    async def hurried():
+        current_deadline.set(Deadline(0.005))
+        return await engine.adjust(1, -1)
+
+    results = await asyncio.gather(hurried(), engine.adjust(1, -2))
+    assert results == [9, 7]
+    assert store.writes == [-3]
+
+
+async def test_unknown_products_are_not_found():
+    store = FakeStockStore({1: 5})
+    engine = InventoryEngine(store, window=0.01)
+
+    with pytest.raises(ProductNotFoundError):
+        await engine.adjust(2, 1)
+    assert engine.available(2) is None and store.writes == []
+
+    assert await engine.adjust(1, 1) == 6
+    del store.stock[1]  # Deleted after its ledger was loaded
+    with pytest.raises(ProductNotFoundError):
+        await engine.adjust(1, 1)
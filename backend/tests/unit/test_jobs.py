@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from app.core.jobs import JobQueue, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+async def test_runs_and_removes_completed_jobs(store):
+    queue = JobQueue(store=store, concurrency={"default": 2})
+    done = []
+
+    @queue.task("record")
+    async def record(value: int) -> None:
+        done.append(value)
+
+    await queue.start()
+    for value in range(5):
+        await queue.enqueue("record", {"value": value})
+    await queue.drain(timeout=1)
+
+    assert sorted(done) == [0, 1, 2, 3, 4]
+    assert await store.pending() == []
+    await queue.stop(timeout=1)
+
+
+async def test_retries_with_backoff(store):
+    queue = JobQueue(store=store, retry_base=0.01, max_attempts=3)
+    attempts = []
+
+    @queue.task("flaky")
+    async def flaky() -> None:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("boom")
+
+    await queue.start()
+    await queue.enqueue("flaky")
+    for _ in range(50):
+        if len(attempts) == 3:
+            break
+        await asyncio.sleep(0.01)
+    await queue.drain(timeout=1)
+
+    assert len(attempts) == 3
+    assert await store.pending() == []
+    await queue.stop(timeout=1)
+
+
+async def test_pending_jobs_survive_restart(store):
+    queue = JobQueue(store=store)
+
+    @queue.task("later")
+    async def later() -> None:
+        pass
+
+    await queue.start()
+    await queue.enqueue("later", delay=60)
+    await queue.stop(timeout=0.1)
+
+    assert [job.name for job in await store.pending()] == ["later"]
+
+
+async def test_workers_sharing_a_store_claim_each_job_once(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    first, second = JobStore(path, lease=60), JobStore(path, lease=60)
+    queue = JobQueue(store=first)
+
+    @queue.task("later")
+    async def later() -> None:
+        pass
+
+    await queue.start()
+    await queue.enqueue("later", delay=60)
+
+    # Leased by the running worker: a restarting worker must not resume it
+    assert first.owner != second.owner
+    assert await second.claim(["later"]) == []
+
+    # Released on shutdown, then claimed exactly once
+    await queue.stop(timeout=0.1)
+    assert [job.name for job in await second.claim(["later"])] == ["later"]
+    assert await second.claim(["later"]) == []
+    assert await JobStore(path).claim(["later"]) == []
+    await second.close()
+
+
+async def test_first_run_sees_the_stored_payload(store):
+    from datetime import datetime
+
+    queue = JobQueue(store=store)
+    seen = []
+
+    @queue.task("record")
+    async def record(at, ids) -> None:
+        seen.append((at, ids))
+
+    await queue.start()
+    await queue.enqueue("record", {"at": datetime(2025, 1, 6), "ids": (1, 2)})
+    await queue.drain(timeout=1)
+    await queue.stop(timeout=1)
+
+    assert seen == [("2025-01-06 00:00:00", [1, 2])]
+
+
+def test_job_store_path_is_anchored_to_the_data_dir(tmp_path):
+    from app.core.config import Settings
+
+    config = Settings(DATA_DIR=str(tmp_path))
+    assert config.JOB_STORE_PATH == str(tmp_path / "jobs.sqlite3")
@@ -0,0 +1,27 @@
+import io
+import logging
+import queue
+
+import orjson
+
+from app.core.logger import DroppingQueueHandler, LogPipeline
+
+
+def test_full_queue_drops_and_reports_instead_of_blocking():
+    stream = io.StringIO()
+    pipeline = LogPipeline(stream=stream, json_format=True, queue_size=2)
+    pipeline.handler = DroppingQueueHandler(queue.Queue(2))
+
+    log = logging.getLogger("test.pipeline")
+    for i in range(5):
+        pipeline.handler.handle(
+            log.makeRecord(log.name, logging.INFO, __file__, 1, "event %d", (i,), None)
+        )
+    assert pipeline.dropped == 3
+
+    pipeline._start()
+    pipeline.stop()
+
+    lines = [orjson.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["msg"] for line in lines[:2]] == ["event 0", "event 1"]
+    assert lines[2]["level"] == "WARNING" and lines[2]["dropped"] == 3
@@ -0,0 +1,38 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.docs.openapi import OpenAPICache, install_openapi
+
+
+def make_app(prebuilt_dir=None):
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+
+    @app.get("/api/app1/items")
+    async def items():
+        return []
+
+    install_openapi(app, prebuilt_dir)
+    return app
+
+
+def test_schema_is_served_compressed_with_etag():
+    client = TestClient(make_app())
+
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "/api/app1/items" in response.json()["paths"]
+
+    etag = response.headers["etag"]
+    revalidated = client.get("/openapi.json", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert client.get("/openapi.json").headers["etag"] == etag
+
+
+def test_prebuilt_documents_skip_generation(tmp_path):
+    OpenAPICache(make_app()).write(str(tmp_path))
+    (tmp_path / "openapi.json").write_bytes(b'{"prebuilt": true}')
+    (tmp_path / "openapi.json.gz").unlink()
+
+    client = TestClient(make_app(str(tmp_path)))
+    assert client.get("/openapi.json").json() == {"prebuilt": True}
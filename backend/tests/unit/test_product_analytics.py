@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domains.dhg_baseline.app1.products.analytics import ProductColumns
+
+PRODUCTS = [
+    {"id": 1, "price": 10.0, "created_at": "2024-01-01T09:00:00+00:00"},  # Monday
+    {"id": 2, "price": 20.0, "created_at": "2024-01-07T23:00:00+00:00"},  # Sunday
+    {"id": 3, "price": 30.0, "created_at": "2024-01-08T00:00:00Z"},
+    {"id": 4, "price": 40.0, "created_at": "2024-01-22T12:00:00+00:00"},
+]
+
+
+@pytest.fixture
+def columns():
+    columns = ProductColumns(capacity=2)
+    columns.upsert_many(PRODUCTS)
+    return columns
+
+
+def test_summary_and_filters(columns):
+    summary = columns.summary()
+    assert summary["count"] == 4
+    assert summary["avg_price"] == 25.0
+    assert summary["percentiles"]["p50"] == 25.0
+
+    assert columns.summary(min_price=15, max_price=35)["count"] == 2
+    after = datetime(2024, 1, 8, tzinfo=timezone.utc)
+    assert columns.summary(created_after=after)["min_price"] == 30.0
+    assert columns.summary(min_price=100) == {"count": 0}
+
+
+def test_upsert_updates_in_place_and_remove_compacts(columns):
+    columns.upsert_many([{"id": 2, "price": 200.0, "created_at": None}])
+    assert len(columns) == 4
+    assert columns.summary()["max_price"] == 200.0
+
+    columns.remove(1)
+    assert 1 not in columns and len(columns) == 3
+    assert columns.summary()["min_price"] == 30.0
+    columns.upsert_many([{"id": 5, "price": 1.0}])
+    assert columns.summary(max_price=5)["count"] == 1
+
+
+def test_price_buckets(columns):
+    fixed = columns.price_buckets(width=25)
+    assert [(b["min"], b["count"]) for b in fixed] == [(0, 2), (25, 2)]
+
+    even = columns.price_buckets(buckets=3)
+    assert [b["count"] for b in even] == [1, 1, 2]
+    assert even[0]["min"] == 10.0 and even[-1]["max"] == 40.0
+
+
+def test_price_buckets_reject_too_fine_widths(columns):
+    with pytest.raises(ValueError):
+        columns.price_buckets(width=1e-9)
+    with pytest.raises(ValueError):
+        columns.price_buckets(width=1e-320)
+
+
+def test_weekly_counts_start_on_monday(columns):
+    weeks = columns.weekly_counts()
+    assert [(w["week_start"].date().isoformat(), w["count"]) for w in weeks] == [
+        ("2024-01-01", 2),
+        ("2024-01-08", 1),
+        ("2024-01-22", 1),
+    ]
@@ -0,0 +1,68 @@
+import pytest
+
+from app.domains.dhg_baseline.app1.products.search import ProductSearchIndex, tokenize
+
+PRODUCTS = [
+    {"id": 1, "name": "Wireless Keyboard", "description": "Compact keyboard", "price": 49.0},
+    {"id": 2, "name": "Mechanical Keyboard", "description": "Clicky switches", "price": 129.0},
+    {"id": 3, "name": "Wireless Mouse", "description": "Ergonomic mouse", "price": 29.0},
+    {"id": 4, "name": "USB Cable", "description": "Braided, for keyboards", "price": 9.0},
+    {"id": 5, "name": "Café Mug", "description": "Ceramic", "price": 12.0},
+]
+
+
+@pytest.fixture
+def index():
+    index = ProductSearchIndex()
+    index.add_many(PRODUCTS)
+    return index
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Café-Mug, 2 PACK") == ["cafe", "mug", "2", "pack"]
+
+
+def test_name_matches_rank_above_description(index):
+    ranked = ids(index.search("keyboard"))
+    assert set(ranked[:2]) == {1, 2}
+    assert ranked[-1] == 4
+
+
+def test_prefix_and_typo_matching(index):
+    assert set(ids(index.search("wire"))) == {1, 3}
+    assert ids(index.search("mosue")) == [3]
+    assert ids(index.search("cafe")) == [5]
+
+
+def test_price_filters(index):
+    assert ids(index.search(min_price=10, max_price=50)) == [5, 3, 1]
+    assert ids(index.search("wireless", max_price=30)) == [3]
+
+
+def test_incremental_updates(index):
+    index.add({"id": 3, "name": "Gaming Mouse", "description": "", "price": 59.0})
+    assert ids(index.search("wireless")) == [1]
+    assert ids(index.search("gaming")) == [3]
+
+    index.remove(3)
+    assert index.search("mouse") == []
+    assert 3 not in index
+
+
+def test_bulk_readds_replace_price_entries(index):
+    index.add_many(
+        [
+            {**PRODUCTS[0], "price": 59.0},
+            {**PRODUCTS[1], "price": 19.0},
+            {**PRODUCTS[1], "price": 99.0},
+            {"id": 6, "name": "Desk Lamp", "description": "LED", "price": 35.0},
+        ]
+    )
+    assert len(index._prices) == len(index) == 6
+    listed = index.search("", limit=10)
+    assert ids(listed) == [4, 5, 3, 6, 1, 2]
+    assert [product["price"] for product in listed][-2:] == [59.0, 99.0]
@@ -0,0 +1,84 @@
+import logging
+
+import pytest
+
+from app.db.stats import QueryRegistry, QueryStats, redact, run_postgrest
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, data=None, error=None):
+        self.data = data
+        self.error = error
+
+    def execute(self):
+        if self.error:
+            raise self.error
+        return FakeResponse(self.data)
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    QueryRegistry.reset()
+    yield
+    QueryRegistry.reset()
+
+
+def test_redact_keeps_only_types_and_sizes():
+    assert redact("alice@example.com") == "<str:17>"
+    assert redact(42) == "<int>"
+    assert redact([1, 2, 3]) == "<list:3>"
+    assert redact({"email": "a@b.c", "active": True}) == {
+        "email": "<str:5>",
+        "active": True,
+    }
+
+
+def test_percentile_tracks_latency_distribution():
+    stats = QueryStats()
+    for _ in range(99):
+        stats.record(1.0, 1, 10, False)
+    stats.record(500.0, 1, 10, False)
+    assert stats.percentile(50) == pytest.approx(1.0, rel=0.1)
+    assert stats.percentile(100) == 500.0
+
+
+async def test_postgrest_calls_are_counted_by_name():
+    rows = [{"id": 1}, {"id": 2}]
+    await run_postgrest("users.list", lambda: FakeQuery(rows), {"skip": 0})
+    with pytest.raises(RuntimeError):
+        await run_postgrest("users.list", lambda: FakeQuery(error=RuntimeError()))
+
+    (stats,) = QueryRegistry.stats()
+    assert stats["name"] == "users.list"
+    assert stats["calls"] == 2 and stats["errors"] == 1
+    assert stats["rows"] == 2 and stats["bytes"] == len(b'[{"id":1},{"id":2}]')
+
+
+async def test_result_sizes_are_sampled(monkeypatch):
+    monkeypatch.setattr(QueryRegistry, "size_sample_every", 2)
+    measured = []
+    monkeypatch.setattr(
+        "app.db.stats._payload_size", lambda data: measured.append(data) or 10
+    )
+    for rows in ([{"id": 1}], [{"id": 2}, {"id": 3}], [{"id": 4}]):
+        await run_postgrest("users.list", lambda: FakeQuery(rows))
+
+    assert measured == [[{"id": 1}], [{"id": 4}]]
+    (stats,) = QueryRegistry.stats()
+    # 20 bytes over 2 sampled rows, extrapolated to all 4
+    assert stats["rows"] == 4 and stats["bytes"] == 40
+
+
+async def test_slow_queries_are_logged_redacted(caplog, monkeypatch):
+    monkeypatch.setattr(QueryRegistry, "slow_query_ms", 0.0)
+    with caplog.at_level(logging.WARNING, logger="slow_query"):
+        await run_postgrest(
+            "users.get_by_email", lambda: FakeQuery([]), {"email": "bob@example.com"}
+        )
+    assert "users.get_by_email" in caplog.text
+    assert "<str:15>" in caplog.text and "bob@example.com" not in caplog.text
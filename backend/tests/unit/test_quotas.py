@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import RedisCache
+from app.core.quotas import QuotaExceededError, QuotaManager
+
+
+@pytest.fixture
+def quotas():
+    return QuotaManager(cache=RedisCache(url=""))
+
+
+async def test_reservations_stop_at_the_configured_limit(quotas):
+    quotas._usage[("app2", "users")] = 498
+
+    await quotas.reserve("app2", "users")
+    await quotas.reserve("app2", "users")
+    with pytest.raises(QuotaExceededError) as info:
+        await quotas.reserve("app2", "users")
+
+    assert info.value.limit == 500 and info.value.used == 500
+    # Unknown apps and requests without an app are not limited
+    await quotas.reserve("default", "users")
+    await quotas.reserve(None, "users")
+
+
+async def test_failed_block_releases_its_reservation(quotas):
+    with pytest.raises(RuntimeError):
+        async with quotas.reservation("app1", "storage", 4096):
+            raise RuntimeError("upload failed")
+    assert quotas.usage("app1", "storage") == 0
+
+    async with quotas.reservation("app1", "storage", 4096):
+        pass
+    assert quotas.usage("app1", "storage") == 4096
+
+
+async def test_reconcile_resets_counters_from_sources(quotas):
+    @quotas.source("storage")
+    async def stored_bytes(app_id):
+        await asyncio.sleep(0)
+        return {"app1": 1234}.get(app_id)
+
+    quotas._usage[("app1", "storage")] = 99
+    quotas._usage[("app2", "storage")] = 7
+    await quotas.reconcile()
+
+    assert quotas.usage("app1", "storage") == 1234
+    assert quotas.usage("app2", "storage") == 7
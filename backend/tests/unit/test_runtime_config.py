@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from app.core.runtime_config import ConfigStore
+
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def test_overrides_are_merged_onto_app_defaults(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {"apps": {"app1": {"max_users": 5, "features": {"marketplace": True}}}})
+    store = ConfigStore(str(path))
+
+    snapshot = store.load()
+
+    app1 = snapshot.app("app1")
+    assert app1.max_users == 5
+    assert app1.storage_limit == 5_000_000
+    assert snapshot.feature_enabled("app1", "marketplace")
+    assert snapshot.feature_enabled("app1", "payments")
+    assert snapshot.app("app2").max_users == 500
+    with pytest.raises(TypeError):
+        app1.max_users = 10
+
+
+def test_invalid_reload_keeps_current_snapshot(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {"apps": {"app2": {"max_users": 50}}})
+    store = ConfigStore(str(path))
+    seen = []
+    store.subscribe(seen.append)
+    first = store.load()
+
+    write(path, {"apps": {"app2": {"max_users": "many"}}})
+    assert store.reload() is False
+    write(path, {"apps": {"app3": {}}})
+    assert store.reload() is False
+    assert store.snapshot is first
+
+    write(path, {"apps": {"app2": {"max_users": 75}}})
+    assert store.reload() is True
+    assert store.snapshot.app("app2").max_users == 75
+    assert store.snapshot.version == first.version + 1
+    assert [s.version for s in seen] == [first.version, first.version + 1]
+    # An unchanged file does not produce a new snapshot
+    assert store.reload() is False
+
+
+def test_disabled_features_are_not_registered(tmp_path):
+    from app.core.apps import AppFeature, AppRegistry
+    from app.main import register_apps
+
+    path = tmp_path / "config.json"
+    write(path, {"apps": {"app1": {"features": {"marketplace": False}}}})
+    store = ConfigStore(str(path))
+    store.subscribe(register_apps)
+    store.load()
+    assert AppFeature.MARKETPLACE not in AppRegistry.get_app("app1").features
+    assert AppFeature.PAYMENTS in AppRegistry.get_app("app1").features
+
+    write(path, {"apps": {"app1": {"features": {"marketplace": True}}}})
+    assert store.reload() is True
+    assert AppFeature.MARKETPLACE in AppRegistry.get_app("app1").features
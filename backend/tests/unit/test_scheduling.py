@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domains.app2.courses.scheduling import (
+    BookingStore,
+    ScheduleConflictError,
+    SchedulingEngine,
+)
+
+BASE = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+
+
+def at(hours: float) -> datetime:
+    return BASE + timedelta(hours=hours)
+
+
+class FakeBookingStore(BookingStore):
+    """course_sessions stand-in that enforces the no-overlap constraint"""
+
+    def __init__(self):
+        self.rows = []
+
+    async def insert(self, course_id, instructor_id, start, end):
+        for row in self.rows:
+            if (
+                row["instructor_id"] == instructor_id
+                and row["starts_at"] < end
+                and row["ends_at"] > start
+            ):
+                raise ScheduleConflictError([])
+        row = {
+            "id": len(self.rows) + 1,
+            "course_id": course_id,
+            "instructor_id": instructor_id,
+            "starts_at": start,
+            "ends_at": end,
+        }
+        self.rows.append(row)
+        return row
+
+
+@pytest.fixture
+def store():
+    return FakeBookingStore()
+
+
+@pytest.fixture
+def engine(store):
+    engine = SchedulingEngine(session_minutes=60, store=store)
+    engine.load_courses(
+        [
+            {"id": 1, "instructor_id": 10, "schedule": [at(0), at(3)]},
+            {"id": 2, "instructor_id": 10, "schedule": [at(5)]},
+            {"id": 3, "instructor_id": 20, "schedule": [at(0)]},
+        ]
+    )
+    return engine
+
+
+def test_conflicts_are_per_instructor(engine):
+    assert [c["course_id"] for c in engine.conflicts(10, at(0.5))] == [1]
+    assert engine.conflicts(10, at(1)) == []
+    assert [c["course_id"] for c in engine.conflicts(20, at(0.5))] == [3]
+
+
+async def test_book_rejects_overlaps(engine, store):
+    with pytest.raises(ScheduleConflictError) as exc:
+        await engine.book(10, 4, at(2.5))
+    assert [c["course_id"] for c in exc.value.conflicts] == [1]
+    assert store.rows == []
+
+    session = await engine.book(10, 4, at(1), minutes=120)
+    assert session["end"] == at(3)
+    assert session["session_id"] == store.rows[0]["id"]
+    assert engine.conflicts(10, at(2)) != []
+
+
+async def test_book_rejects_sessions_stored_by_other_workers(engine, store):
+    other = SchedulingEngine(session_minutes=60, store=store)
+    await other.book(10, 4, at(1))
+
+    with pytest.raises(ScheduleConflictError):
+        await engine.book(10, 5, at(1.5))
+    assert len(store.rows) == 1
+
+
+async def test_bookings_propagate_through_session_sync(engine, store):
+    other = SchedulingEngine(session_minutes=60, store=store)
+    await other.book(10, 4, at(1))
+
+    assert engine.load_sessions(store.rows) == 1
+    assert [c["course_id"] for c in engine.conflicts(10, at(1))] == [4]
+    # Unchanged rows are skipped, moved sessions leave their old slot
+    assert engine.load_sessions(store.rows) == 0
+    moved = dict(store.rows[0], starts_at=at(6), ends_at=at(7))
+    assert engine.load_sessions([moved]) == 1
+    assert engine.conflicts(10, at(1)) == []
+    assert [c["course_id"] for c in engine.conflicts(10, at(6))] == [4]
+    assert engine.booked_sessions(4) == [
+        {"session_id": 1, "instructor_id": 10, "start": at(6), "end": at(7)}
+    ]
+
+
+async def test_long_sessions_are_found_from_later_starts(engine):
+    await engine.book(20, 5, at(2), minutes=8 * 60)
+    assert [c["course_id"] for c in engine.conflicts(20, at(9))] == [5]
+
+
+def test_free_slots(engine):
+    slots = engine.free_slots(10, at(0), at(8))
+    assert [(s["start"], s["end"]) for s in slots] == [
+        (at(1), at(3)),
+        (at(4), at(5)),
+        (at(6), at(8)),
+    ]
+    assert len(engine.free_slots(10, at(0), at(8), minutes=90)) == 2
+
+
+def test_reload_replaces_course_sessions(engine):
+    engine.load_courses([{"id": 1, "instructor_id": 10, "schedule": [at(1)]}])
+    assert engine.conflicts(10, at(0)) == []
+    assert [c["course_id"] for c in engine.conflicts(10, at(1))] == [1]
+
+
+async def test_reload_keeps_booked_sessions(engine):
+    await engine.book(10, 1, at(1))
+    await engine.book(20, 7, at(2))
+    engine.load_courses(
+        [
+            {"id": 1, "instructor_id": 10, "schedule": [at(3)]},
+            {"id": 7, "instructor_id": 20, "schedule": [at(2)]},
+        ]
+    )
+    assert [c["course_id"] for c in engine.conflicts(10, at(1))] == [1]
+    assert engine.conflicts(10, at(0)) == []
+    assert [c["course_id"] for c in engine.conflicts(20, at(2))] == [7]
+    assert len(engine.calendar(20)) == 2
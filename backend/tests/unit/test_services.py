@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+from app.core.mixins.base import MixinMeta
+from app.core.registry import ServiceRegistry
+from app.db.base import SupabaseDB
+from app.domains.dhg_baseline.app1.products import repository
+from app.domains.dhg_baseline.app1.services.product_service import ProductService
+from app.services.auth.service import AuthService
+
+
+async def test_registry_builds_product_service_with_repository(monkeypatch):
+    calls = []
+
+    async def fake_postgrest(name, build, params=None):
+        build()  # The query must build against the real client
+        calls.append((name, params))
+        return SimpleNamespace(data=[{"id": 1, "name": "Mug"}])
+
+    monkeypatch.setattr(repository, "run_postgrest", fake_postgrest)
+    ServiceRegistry.reset()
+    service = ServiceRegistry.get(ProductService, "app1")
+
+    assert await service.get("1") == {"id": 1, "name": "Mug"}
+    assert await service.list({"name": "Mug"}) == [{"id": 1, "name": "Mug"}]
+    assert [name for name, _ in calls] == ["products.get", "products.list"]
+    ServiceRegistry.reset()
+
+
+async def test_failed_create_is_not_indexed(monkeypatch):
+    from app.domains.dhg_baseline.app1.services import product_service
+
+    class Repository:
+        async def create(self, data):
+            return None
+
+    added, jobs = [], []
+
+    async def enqueue_job(self, *args):
+        jobs.append(args)
+
+    monkeypatch.setattr(product_service.product_index, "add", added.append)
+    monkeypatch.setattr(ProductService, "enqueue_job", enqueue_job)
+    service = ProductService(Repository())
+    data = {"id": 1, "name": "Mug", "price": 3.5, "description": ""}
+
+    assert await service.create_product(data, "u1") is None
+    assert added == [] and jobs == []
+
+
+async def test_deleted_products_leave_search_and_analytics():
+    from app.domains.dhg_baseline.app1.products.analytics import product_columns
+    from app.domains.dhg_baseline.app1.products.search import product_index
+    from app.domains.dhg_baseline.app1.products.sync import product_deletions
+
+    class Repository:
+        async def delete(self, id):
+            pass
+
+    for product_id in (901, 902):
+        row = {"id": product_id, "name": "Mug", "description": "", "price": 3.5}
+        product_index.add(row)
+        product_columns.upsert_many([row])
+
+    await ProductService(Repository()).delete("901")
+    # Deleted on another worker, seen through the deletions sync
+    for sink in product_deletions.sinks:
+        sink([{"id": 902, "updated_at": "2025-01-01T00:00:00+00:00"}])
+
+    for product_id in (901, 902):
+        assert product_id not in product_index
+        assert product_id not in product_columns
+
+
+def test_auth_clients_do_not_share_session_state():
+    service = AuthService()
+    first, second = service.auth, service.auth
+    assert first is not second
+    assert first._http_client is second._http_client
+    assert service.client is SupabaseDB.get_client()
+
+
+async def test_current_user_comes_from_the_callers_token(monkeypatch):
+    seen = []
+
+    def get_user(jwt=None):
+        seen.append(jwt)
+        return SimpleNamespace(user={"id": "u1"})
+
+    client = SimpleNamespace(auth=SimpleNamespace(get_user=get_user))
+    monkeypatch.setattr(SupabaseDB, "get_client", classmethod(lambda cls: client))
+
+    assert await AuthService().get_current_user("token-1") == {"id": "u1"}
+    assert seen == ["token-1"]
+
+
+def test_mixins_resolve_methods_through_the_mro():
+    class Base(metaclass=MixinMeta):
+        def name(self):
+            return "base"
+
+    class Left(Base):
+        pass
+
+    class Right(Base):
+        def name(self):
+            return "right"
+
+    class Both(Left, Right):
+        pass
+
+    assert Both().name() == "right"
+    assert Both.__slots__ == ()
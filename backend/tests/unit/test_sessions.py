@@ -0,0 +1,104 @@
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core import auth
+from app.core.cache import RedisCache
+from app.services.auth.sessions import SessionStore
+from utils.fake_redis import FakeRedis
+
+
+def make_session(user_id: str = "user-1", expires_in: int = 3600):
+    claims = {"sub": user_id, "role": "authenticated", "jti": uuid.uuid4().hex}
+    return SimpleNamespace(
+        access_token=jwt.encode(claims, "secret"),
+        refresh_token=f"refresh-{uuid.uuid4().hex}",
+        expires_at=int(time.time()) + expires_in,
+        expires_in=expires_in,
+        user={"id": user_id, "email": f"{user_id}@example.com"},
+    )
+
+
+class FakeAuth:
+    def __init__(self):
+        self.calls = 0
+        self.signed_out = []
+        self.admin = SimpleNamespace(sign_out=self.signed_out.append)
+
+    def refresh_session(self, refresh_token):
+        self.calls += 1
+        return SimpleNamespace(session=make_session(expires_in=3600))
+
+
+@pytest.fixture
+def store():
+    store = SessionStore(cache=RedisCache(url=""), refresh_margin=120)
+    store._client = SimpleNamespace(auth=FakeAuth())
+    return store
+
+
+async def test_create_and_resolve(store):
+    session = make_session()
+    entry = await store.create(session)
+
+    assert store.get_local(entry.session_id) is entry
+    assert await store.get_by_token(session.access_token) is entry
+    assert entry.claims["sub"] == "user-1"
+    assert entry.user_id == "user-1"
+
+
+async def test_refresh_due_rotates_tokens(store):
+    entry = await store.create(make_session(expires_in=30))
+    old_token = entry.access_token
+
+    assert await store.refresh_due() == 1
+    refreshed = store.get_local(entry.session_id)
+    assert store._client.auth.calls == 1
+    assert refreshed.expires_at > entry.expires_at
+    assert await store.get_by_token(old_token) is None
+    assert await store.get_by_token(refreshed.access_token) is refreshed
+
+
+async def test_revoke(store):
+    entry = await store.create(make_session())
+    await store.revoke(entry.session_id)
+    assert store.get_local(entry.session_id) is None
+    assert await store.get(entry.session_id) is None
+    assert store._client.auth.signed_out == [entry.access_token]
+
+
+async def test_revoke_reaches_other_workers():
+    redis = FakeRedis()
+    workers = []
+    for _ in range(2):
+        cache = RedisCache(url="", prefix="session", local_ttl=1)
+        cache._redis = redis
+        worker = SessionStore(cache=cache, refresh_margin=120)
+        worker._client = SimpleNamespace(auth=FakeAuth())
+        workers.append(worker)
+    first, second = workers
+    session = make_session(expires_in=30)
+    entry = await first.create(session)
+    copy = await second.get(entry.session_id)  # Now in second's local tier
+
+    await first.revoke(entry.session_id)
+
+    assert await second.get_by_token(session.access_token) is None
+    assert await second.refresh(copy) is None
+    assert second._client.auth.calls == 0
+    assert await redis.get(f"session:{entry.session_id}") is None
+
+
+async def test_current_user_is_plain_data_from_session_id(store, monkeypatch):
+    monkeypatch.setattr(auth, "session_store", store)
+    entry = await store.create(make_session())
+
+    user = await auth.get_current_user(x_session_id=entry.session_id, token=None)
+    assert user == {"id": "user-1", "email": "user-1@example.com"}
+    with pytest.raises(HTTPException) as e:
+        await auth.get_current_user(x_session_id=None, token=None)
+    assert e.value.status_code == 401
@@ -0,0 +1,66 @@
+import os
+import signal
+
+import run
+
+
+class FakeSupervisor(run.Supervisor):
+    """Spawns pretend workers whose readiness the test decides"""
+
+    READY_TIMEOUT = 1.0
+
+    def __init__(self, workers, ready):
+        super().__init__(None, "127.0.0.1", 0, len(workers), "info", 1.0)
+        self.workers = {pid: 0.0 for pid in workers}
+        self.ready = list(ready)
+        self.log = []
+        self.next_pid = 100
+
+    def spawn(self):
+        ready_read, ready_write = os.pipe()
+        if self.ready.pop(0):
+            os.write(ready_write, b"1")
+        os.close(ready_write)  # A worker that dies before startup says nothing
+        pid, self.next_pid = self.next_pid, self.next_pid + 1
+        self.workers[pid] = 0.0
+        self.log.append(("spawn", pid))
+        return pid, ready_read
+
+    def _terminate(self, pid, timeout):
+        self.workers.pop(pid, None)
+        self.log.append(("terminate", pid))
+
+
+def test_rolling_restart_replaces_workers_once_each_is_ready():
+    supervisor = FakeSupervisor([1, 2], ready=[True, True])
+    supervisor.rolling_restart()
+
+    assert supervisor.log == [
+        ("spawn", 100),
+        ("terminate", 1),
+        ("spawn", 101),
+        ("terminate", 2),
+    ]
+    assert set(supervisor.workers) == {100, 101}
+
+
+def test_rolling_restart_keeps_old_workers_when_a_replacement_fails():
+    supervisor = FakeSupervisor([1, 2], ready=[True, False])
+    supervisor.rolling_restart()
+
+    assert supervisor.log == [
+        ("spawn", 100),
+        ("terminate", 1),
+        ("spawn", 101),
+        ("terminate", 101),
+    ]
+    assert set(supervisor.workers) == {2, 100}
+
+
+def test_reload_signal_is_forwarded_to_every_worker(monkeypatch):
+    sent = []
+    monkeypatch.setattr(run.os, "kill", lambda pid, sig: sent.append((pid, sig)))
+    supervisor = FakeSupervisor([1, 2], ready=[])
+    supervisor._forward(signal.SIGUSR1, None)
+
+    assert sent == [(1, signal.SIGUSR1), (2, signal.SIGUSR1)]
@@ -0,0 +1,10 @@
+from datetime import datetime, timezone
+
+from app.utils.timestamps import from_timestamp, to_timestamp
+
+
+def test_postgrest_timestamps_parse_with_any_fraction():
+    expected = datetime(2024, 1, 1, 0, 0, 0, 123400, tzinfo=timezone.utc)
+    assert from_timestamp(to_timestamp("2024-01-01T00:00:00.1234+00:00")) == expected
+    assert from_timestamp(to_timestamp("2024-01-01T00:00:00.1234Z")) == expected
+    assert to_timestamp("2024-01-01T00:00:00") == expected.timestamp() - 0.1234
@@ -0,0 +1,95 @@
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+SCRIPT = ROOT / "scripts" / "sys" / "verify_structure.py"
+spec = importlib.util.spec_from_file_location("verify_structure", SCRIPT)
+verify_structure = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(verify_structure)
+
+FILES = {
+    "app/__init__.py": "",
+    "app/core/__init__.py": "",
+    "app/core/config.py": "import os\n",
+    "app/domains/__init__.py": "",
+    "app/domains/shop.py": (
+        "from app.core import (\n"
+        "    config,\n"
+        ")\n"
+        "from .. import (\n"
+        "    core,\n"
+        ")\n"
+        "from .catalog import items\n"
+        "from core import config\n"
+    ),
+    "app/domains/catalog.py": "from app.core.config import os\n",
+}
+
+
+@pytest.fixture
+def backend(tmp_path):
+    for name, source in FILES.items():
+        path = tmp_path / "src" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    return tmp_path
+
+
+def index_of(backend, cache=None):
+    index = verify_structure.ImportIndex(backend / "src", cache)
+    index.refresh(workers=1)
+    return index
+
+
+def test_multiline_and_relative_imports_are_flagged(backend):
+    issues = verify_structure.verify_imports(index_of(backend))
+    shop = backend / "src" / "app" / "domains" / "shop.py"
+
+    assert issues == [
+        f"{shop}:4 - Relative import found: ..",
+        f"{shop}:7 - Relative import found: .catalog",
+        f"{shop}:8 - Non-absolute import found: core",
+    ]
+
+
+def test_unchanged_files_reuse_cached_results(backend):
+    cache = backend / ".cache" / "structure.json"
+    first = index_of(backend, cache)
+    first.save()
+    assert first.parsed == len(FILES)
+
+    shop = backend / "src" / "app" / "domains" / "shop.py"
+    os.utime(shop, ns=(0, 0))  # Touched, not changed
+    assert index_of(backend, cache).parsed == 0
+
+    shop.write_text("import app.core.config\n")
+    changed = index_of(backend, cache)
+    assert changed.parsed == 1
+    assert changed.entries["app/domains/shop.py"]["imports"] == [
+        ["app.core.config", 1, 0, "app.core.config"]
+    ]
+
+
+def test_import_graph_resolves_relative_and_attribute_imports(
+    backend, tmp_path, monkeypatch
+):
+    graph_path = tmp_path / "graph.json"
+    argv = ["verify_structure", "--root", str(backend), "--no-cache"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--graph", str(graph_path)])
+    verify_structure.main()
+    report = json.loads(graph_path.read_text())
+
+    assert report["graph"]["app.domains.shop"] == [
+        "app",
+        "app.core",
+        "app.domains.catalog",
+    ]
+    assert report["graph"]["app.domains.catalog"] == ["app.core.config"]
+    top = report["hotspots"][0]
+    assert top["module"] == "app.domains.shop"
+    assert top["transitive_modules"] == 4
@@ -0,0 +1,305 @@
+"""Bulk synthetic data for seeding and load tests
+
+Rows are generated column-wise with NumPy from small Faker vocabularies, in
+chunks spread over a process pool, and streamed as CSV, NDJSON or Postgres
+COPY text::
+
+    python tests/utils/bulk.py users -n 10000000 -f copy -o users.copy
+    python tests/utils/bulk.py products -n 1000000 --dsn postgresql://...
+
+Every chunk has its own random stream derived from (seed, table, chunk
+start), so a given seed and chunk size always produce the same bytes no
+matter how many workers run. Ids are sequential from ``--start-id`` and
+emails embed the id, which keeps them unique without any bookkeeping.
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import orjson
+from faker import Faker
+
+try:
+    import asyncpg
+except ImportError:  # Only needed to COPY straight into Postgres
+    asyncpg = None
+
+FORMATS = ("csv", "ndjson", "copy")
+# Epoch seconds for 2020-01-01 and 2025-01-01 (UTC)
+TIME_RANGE = (1_577_836_800, 1_735_689_600)
+DAY = 24 * 3600
+WEEK = 7 * DAY
+# Not a usable password hash; seeded users sign in through Supabase Auth
+SEEDED_PASSWORD = "!seeded"
+# Courses are taught by the first seeded users
+INSTRUCTORS = 1000
+
+# Numeric columns stay NumPy arrays; text columns are lists of str
+Columns = Dict[str, Union[np.ndarray, List[Any]]]
+
+
+class Vocabulary:
+    """Word pools and timestamp tables built once per process"""
+
+    def __init__(self, seed: int, size: int = 1000):
+        fake = Faker()
+        fake.seed_instance(seed)
+
+        def pool(draw: Callable[[], str]) -> np.ndarray:
+            # dict keeps first-seen order, so pools match across processes
+            words = dict.fromkeys(
+                re.sub(r"[^A-Za-z]", "", draw()) for _ in range(size * 2)
+            )
+            return np.array([w for w in words if w][:size], dtype=object)
+
+        self.first_names = pool(fake.first_name)
+        self.last_names = pool(fake.last_name)
+        self.words = pool(fake.word)
+        self.domains = np.array(
+            ["example.com", "example.org", "example.net", "test.dev"], dtype=object
+        )
+        # ISO 8601 is assembled from a date and a time-of-day lookup, which
+        # is several times cheaper than formatting every timestamp
+        first_day = TIME_RANGE[0] // DAY
+        days = np.arange(first_day, TIME_RANGE[1] // DAY + 366).astype("datetime64[D]")
+        self.first_day = first_day
+        self.dates = np.datetime_as_string(days).astype(object)
+        times = np.arange(DAY).astype("datetime64[s]")
+        self.times = np.array(
+            ["T" + stamp[11:] + "Z" for stamp in np.datetime_as_string(times)],
+            dtype=object,
+        )
+
+    def iso(self, seconds: np.ndarray) -> List[str]:
+        days = self.dates[seconds // DAY - self.first_day]
+        return (days + self.times[seconds % DAY]).tolist()
+
+
+def _timestamps(rng: np.random.Generator, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    created = rng.integers(*TIME_RANGE, size=size)
+    updated = created + rng.integers(0, WEEK * 8, size=size)
+    return created, updated
+
+
+def _pick(rng: np.random.Generator, pool: np.ndarray, size: int) -> List[str]:
+    return pool[rng.integers(0, len(pool), size=size)].tolist()
+
+
+def _sentence(
+    rng: np.random.Generator, vocab: Vocabulary, size: int, n: int
+) -> List[str]:
+    picks = vocab.words[rng.integers(0, len(vocab.words), size=(n, size))]
+    return list(map(" ".join, zip(*picks.tolist())))
+
+
+def users(rng: np.random.Generator, vocab: Vocabulary, ids: np.ndarray) -> Columns:
+    size = len(ids)
+    first = _pick(rng, vocab.first_names, size)
+    last = _pick(rng, vocab.last_names, size)
+    domains = _pick(rng, vocab.domains, size)
+    created, updated = _timestamps(rng, size)
+    return {
+        "id": ids,
+        "email": [
+            f"{f}.{l}.{i}@{d}".lower()
+            for f, l, i, d in zip(first, last, ids.tolist(), domains)
+        ],
+        "hashed_password": [SEEDED_PASSWORD] * size,
+        "full_name": list(map("{} {}".format, first, last)),
+        "created_at": vocab.iso(created),
+        "updated_at": vocab.iso(updated),
+    }
+
+
+def products(rng: np.random.Generator, vocab: Vocabulary, ids: np.ndarray) -> Columns:
+    size = len(ids)
+    created, updated = _timestamps(rng, size)
+    prices = np.round(rng.lognormal(mean=3.0, sigma=1.0, size=size), 2)
+    return {
+        "id": ids,
+        "name": list(map(str.capitalize, _sentence(rng, vocab, size, 2))),
+        "description": _sentence(rng, vocab, size, 8),
+        "price": np.maximum(prices, 0.5),
+        "stock": rng.integers(0, 500, size=size),
+        "created_at": vocab.iso(created),
+        "updated_at": vocab.iso(updated),
+    }
+
+
+def courses(rng: np.random.Generator, vocab: Vocabulary, ids: np.ndarray) -> Columns:
+    size = len(ids)
+    created, updated = _timestamps(rng, size)
+    first_session = created + rng.integers(WEEK, WEEK * 4, size=size)
+    sessions = rng.integers(4, 13, size=size)
+    # Weekly sessions at a fixed time of day: only the date moves
+    first_day = (first_session // DAY - vocab.first_day).tolist()
+    times = vocab.times[first_session % DAY].tolist()
+    dates = vocab.dates.tolist()
+    return {
+        "id": ids,
+        "title": list(map(str.title, _sentence(rng, vocab, size, 3))),
+        "description": _sentence(rng, vocab, size, 12),
+        "instructor_id": rng.integers(1, INSTRUCTORS + 1, size=size),
+        "schedule": [
+            [dates[day + 7 * week] + time for week in range(count)]
+            for day, time, count in zip(first_day, times, sessions.tolist())
+        ],
+        "created_at": vocab.iso(created),
+        "updated_at": vocab.iso(updated),
+    }
+
+
+TABLES: Dict[str, Callable[[np.random.Generator, Vocabulary, np.ndarray], Columns]] = {
+    "users": users,
+    "products": products,
+    "courses": courses,
+}
+
+_vocabularies: Dict[int, Vocabulary] = {}
+
+
+def generate(table: str, start: int, size: int, seed: int = 0) -> Columns:
+    """Columns for ``size`` rows of ``table`` with ids from ``start``"""
+    vocab = _vocabularies.get(seed)
+    if vocab is None:
+        vocab = _vocabularies[seed] = Vocabulary(seed)
+    rng = np.random.default_rng([seed, list(TABLES).index(table), start])
+    return TABLES[table](rng, vocab, np.arange(start, start + size, dtype=np.int64))
+
+
+def _text(column: Union[np.ndarray, List[Any]], fmt: str) -> List[str]:
+    if isinstance(column, np.ndarray):
+        return list(map(str, column.tolist()))
+    if column and isinstance(column[0], list):
+        # Postgres array literal; CSV additionally needs the field quoted
+        if fmt == "csv":
+            return ['"{""' + '"",""'.join(values) + '""}"' for values in column]
+        return ['{"' + '","'.join(values) + '"}' for values in column]
+    return column
+
+
+def encode(columns: Columns, fmt: str) -> bytes:
+    """Serialize generated columns as CSV (no header), NDJSON or COPY text"""
+    if fmt == "ndjson":
+        names = list(columns)
+        values = (
+            column.tolist() if isinstance(column, np.ndarray) else column
+            for column in columns.values()
+        )
+        return b"".join(
+            orjson.dumps(dict(zip(names, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in zip(*values)
+        )
+    sep = "," if fmt == "csv" else "\t"
+    lines = map(sep.join, zip(*(_text(column, fmt) for column in columns.values())))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _chunk(args: Tuple[str, str, int, int, int]) -> bytes:
+    table, fmt, start, size, seed = args
+    return encode(generate(table, start, size, seed), fmt)
+
+
+def columns_of(table: str) -> List[str]:
+    return list(generate(table, 1, 1))
+
+
+def generate_chunks(
+    table: str,
+    rows: int,
+    fmt: str = "csv",
+    seed: int = 0,
+    start_id: int = 1,
+    chunk_size: int = 100_000,
+    workers: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Encoded chunks in id order, generated by ``workers`` processes
+
+    At most two chunks per worker are in flight, so memory stays flat
+    however many rows are requested.
+    """
+    tasks = (
+        (table, fmt, start, min(chunk_size, start_id + rows - start), seed)
+        for start in range(start_id, start_id + rows, chunk_size)
+    )
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(_chunk, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for task in tasks:
+            pending.append(pool.submit(_chunk, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+async def copy_to_postgres(dsn: str, table: str, chunks: Iterator[bytes]) -> None:
+    """Stream COPY-format chunks into ``table``"""
+    if asyncpg is None:
+        raise RuntimeError("asyncpg is required to load directly into Postgres")
+
+    async def source():
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.copy_to_table(
+            table, source=source(), columns=columns_of(table), format="text"
+        )
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("table", choices=list(TABLES))
+    parser.add_argument("-n", "--rows", type=int, required=True)
+    parser.add_argument("-f", "--format", choices=FORMATS, default="csv")
+    parser.add_argument("-o", "--out", help="Output file (default: stdout)")
+    parser.add_argument("--dsn", help="COPY straight into this Postgres database")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-id", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    chunks = generate_chunks(
+        args.table,
+        args.rows,
+        "copy" if args.dsn else args.format,
+        seed=args.seed,
+        start_id=args.start_id,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    if args.dsn:
+        asyncio.run(copy_to_postgres(args.dsn, args.table, chunks))
+        return
+
+    out = open(args.out, "wb") if args.out else sys.stdout.buffer
+    try:
+        if args.format == "csv":
+            out.write((",".join(columns_of(args.table)) + "\n").encode())
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.out:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
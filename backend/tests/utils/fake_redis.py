@@ -0,0 +1,36 @@
+"""In-memory stand-in for the parts of redis.asyncio the app uses"""
+
+import time
+
+
+class FakeRedis:
+    """get/set/delete with expiry, plus the idempotency lock script"""
+
+    def __init__(self):
+        self.data = {}
+
+    def _live(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    async def get(self, key):
+        return self._live(key)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def eval(self, script, numkeys, key, marker, ttl):
+        # Only EXTEND_LOCK: extend the key while it still holds ``marker``
+        if self._live(key) != marker:
+            return 0
+        self.data[key] = (marker, time.monotonic() + ttl)
+        return 1
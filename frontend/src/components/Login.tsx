@@ -37,9 +37,9 @@ export function Login({ onSuccess }: LoginProps) {
       if (data.status === 'success') {
         console.log('Operation successful')
         setMessage(data.message)
-        if (isLogin && data.session) {
+        if (isLogin && data.session_id) {
           console.log('Login successful, setting session')
-          onSuccess(data.session)
+          onSuccess(data.session_id)
         }
       } else {
         console.error('Operation failed:', data.detail || 'An error occurred')
@@ -1,3 +1,19 @@
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 # Add to CURSOR_RULES dictionary
 
 CURSOR_RULES = {
@@ -142,3 +158,331 @@ CURSOR_RULES = {
         """,
     },
 }
+
+
+CACHE_VERSION = 1
+MAX_FILE_BYTES = 2_000_000
+SKIP_DIRS = {
+    ".git",
+    ".cache",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    "build",
+    "dist",
+    ".pytest_cache",
+    ".mypy_cache",
+}
+# Below this many files to scan, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 200
+_META = set(".^$*+?{}[]|()")
+RULES_FILE = Path(__file__).resolve()
+
+# (rule, pattern index, line, column, matched text)
+Finding = Tuple[str, int, int, int, str]
+
+
+def required_literal(pattern: str) -> str:
+    """Longest plain substring every match of ``pattern`` must contain
+
+    Only simple patterns are analysed; anything with groups, classes or
+    alternation gets no literal, which just means it is never prefiltered.
+    """
+    if any(c in pattern for c in "|(["):
+        return ""
+    runs, run, i = [], "", 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            token = None if pattern[i + 1].isalnum() else pattern[i + 1]
+            i += 2
+        else:
+            token = None if c in _META else c
+            i += 1
+        if token is not None and i < len(pattern) and pattern[i] in "*?{":
+            token = None  # Optional, so not required
+        if token is None:
+            runs.append(run)
+            run = ""
+        else:
+            run += token
+    runs.append(run)
+    return max(runs, key=len)
+
+
+class RuleScanner:
+    """Finds every rule pattern in a text in a single regex pass
+
+    Reports the same matches as running ``finditer`` per pattern.
+
+    Each pattern's required literal is checked first (a C-speed substring
+    search); only patterns whose literal occurs take part in the scan, and
+    they are matched together through one alternation compiled per set of
+    active patterns. Matches that sit inside the rule's preferred form
+    (``uv pip install`` for ``pip install``) are not reported.
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]]):
+        self.patterns: List[Tuple[str, int, str]] = [
+            (name, index, pattern)
+            for name, rule in rules.items()
+            for index, pattern in enumerate(rule["patterns"])
+        ]
+        self.compiled = [re.compile(p) for _, _, p in self.patterns]
+        self.literals = [required_literal(p) for _, _, p in self.patterns]
+        self.preferred = {
+            name: [s["preferred"] for s in rule.get("suggestions", [])]
+            for name, rule in rules.items()
+        }
+        self._combined: Dict[Tuple[int, ...], Pattern] = {}
+
+    def _regex(self, active: Tuple[int, ...]) -> Pattern:
+        regex = self._combined.get(active)
+        if regex is None:
+            # Zero-width lookaheads, so a match never hides others starting
+            # inside it (``pip install`` within ``python -m pip install``)
+            regex = self._combined[active] = re.compile(
+                "|".join(f"(?=(?P<p{i}>{self.patterns[i][2]}))" for i in active)
+            )
+        return regex
+
+    def _preferred_covers(self, rule: str, text: str, start: int, match: str) -> bool:
+        for preferred in self.preferred[rule]:
+            offset = preferred.find(match)
+            if offset >= 0 and text.startswith(preferred, start - offset):
+                return True
+        return False
+
+    def scan(self, text: str) -> List[Finding]:
+        active = tuple(
+            i for i, literal in enumerate(self.literals) if literal in text
+        )
+        if not active:
+            return []
+        findings = []
+        newlines: Optional[List[int]] = None
+        # Where each pattern may match next: like its own finditer, a
+        # pattern does not match again inside its previous match
+        resume = dict.fromkeys(active, 0)
+        for match in self._regex(active).finditer(text):
+            start = match.start()
+            # The alternation reports one pattern per position; others
+            # that also match here are checked directly
+            hits = []
+            for i in active:
+                if start < resume[i]:
+                    continue
+                m = self.compiled[i].match(text, start)
+                if m:
+                    resume[i] = max(m.end(), start + 1)
+                    hits.append((i, m.group()))
+            for i, matched in hits:
+                rule, index, _ = self.patterns[i]
+                if self._preferred_covers(rule, text, start, matched):
+                    continue
+                if newlines is None:
+                    newlines = [m.start() for m in re.finditer("\n", text)]
+                line = bisect.bisect_left(newlines, start)
+                column = start - (newlines[line - 1] + 1 if line else 0)
+                findings.append((rule, index, line + 1, column + 1, matched))
+        return findings
+
+
+_scanner: Optional[RuleScanner] = None
+
+
+def scan_file(path: str) -> Tuple[Optional[str], List[Finding]]:
+    """Content hash and findings for one file (None hash if unreadable)"""
+    global _scanner
+    if _scanner is None:
+        _scanner = RuleScanner(CURSOR_RULES)
+    try:
+        raw = Path(path).read_bytes()
+    except OSError:
+        return None, []
+    digest = hashlib.sha1(raw).hexdigest()
+    if b"\0" in raw[:8192]:
+        return digest, []  # Binary
+    return digest, _scanner.scan(raw.decode("utf-8", errors="replace"))
+
+
+def rules_fingerprint(rules: Dict[str, Dict[str, Any]]) -> str:
+    relevant = {
+        name: [rule["patterns"], [s["preferred"] for s in rule.get("suggestions", [])]]
+        for name, rule in rules.items()
+    }
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True).encode()).hexdigest()
+
+
+def iter_files(root: Path) -> Iterable[Path]:
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            path = Path(current) / name
+            try:
+                if path.stat().st_size <= MAX_FILE_BYTES:
+                    yield path
+            except OSError:
+                continue
+
+
+def evaluate(
+    root: Path,
+    cache_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Scan every text file under ``root``, reusing cached unchanged files"""
+    started = time.perf_counter()
+    fingerprint = rules_fingerprint(CURSOR_RULES)
+    cached: Dict[str, Any] = {}
+    if cache_path and cache_path.exists():
+        try:
+            data = json.loads(cache_path.read_text())
+            current = data.get("version") == CACHE_VERSION
+            if current and data.get("rules") == fingerprint:
+                cached = data["files"]
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable cache {cache_path}")
+
+    entries: Dict[str, Any] = {}
+    stale: List[Tuple[str, List[int]]] = []
+    for path in iter_files(root):
+        if path == RULES_FILE:
+            continue  # The rules' own patterns and docs would all match
+        key = str(path.relative_to(root))
+        stat = path.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        entry = cached.get(key)
+        if entry and entry["stamp"] == stamp:
+            entries[key] = entry
+            continue
+        if entry:
+            # Touched (checkout, formatter) but possibly not changed
+            digest = hashlib.sha1(path.read_bytes()).hexdigest()
+            if digest == entry["hash"]:
+                entries[key] = {**entry, "stamp": stamp}
+                continue
+        stale.append((key, stamp))
+
+    paths = [str(root / key) for key, _ in stale]
+    if len(paths) >= PARALLEL_THRESHOLD and workers != 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(scan_file, paths, chunksize=32))
+    else:
+        results = list(map(scan_file, paths))
+    for (key, stamp), (digest, findings) in zip(stale, results):
+        if digest is not None:
+            entries[key] = {"stamp": stamp, "hash": digest, "findings": findings}
+
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": CACHE_VERSION, "rules": fingerprint, "files": entries}
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        tmp.replace(cache_path)
+
+    return build_report(entries, len(paths), time.perf_counter() - started)
+
+
+def suggestion_for(rule: Dict[str, Any], matched: str) -> Optional[Dict[str, str]]:
+    for suggestion in rule.get("suggestions", []):
+        if matched in suggestion["instead_of"]:
+            return suggestion
+    return None
+
+
+def build_report(
+    entries: Dict[str, Any], scanned: int, elapsed: float
+) -> Dict[str, Any]:
+    findings = []
+    summary: Dict[str, Dict[str, Any]] = {
+        name: {"priority": rule["priority"], "count": 0, "files": 0}
+        for name, rule in CURSOR_RULES.items()
+    }
+    for path, entry in sorted(entries.items()):
+        seen_rules = set()
+        for rule_name, index, line, column, matched in entry["findings"]:
+            rule = CURSOR_RULES[rule_name]
+            suggestion = suggestion_for(rule, matched)
+            findings.append(
+                {
+                    "rule": rule_name,
+                    "priority": rule["priority"],
+                    "pattern": rule["patterns"][index],
+                    "file": path,
+                    "line": line,
+                    "column": column,
+                    "match": matched,
+                    "preferred": suggestion["preferred"] if suggestion else None,
+                }
+            )
+            summary[rule_name]["count"] += 1
+            seen_rules.add(rule_name)
+        for rule_name in seen_rules:
+            summary[rule_name]["files"] += 1
+    return {
+        "rules": summary,
+        "findings": findings,
+        "stats": {
+            "files": len(entries),
+            "scanned": scanned,
+            "cached": len(entries) - scanned,
+            "seconds": round(elapsed, 3),
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Evaluate files against CURSOR_RULES")
+    parser.add_argument(
+        "root",
+        nargs="?",
+        type=Path,
+        default=Path(__file__).resolve().parents[2],
+        help="Directory to scan (default: the repository root)",
+    )
+    parser.add_argument("--json", type=Path, help="Write the report as JSON")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--fail-on",
+        choices=["high", "medium", "low"],
+        help="Exit non-zero if a rule of this priority (or higher) matches",
+    )
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    cache_path = None if args.no_cache else root / ".cache" / "cursor_rules.json"
+    report = evaluate(root, cache_path, args.workers)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    for finding in report["findings"]:
+        hint = f" (use: {finding['preferred']})" if finding["preferred"] else ""
+        print(
+            f"{finding['file']}:{finding['line']}:{finding['column']}: "
+            f"[{finding['rule']}] {finding['match']}{hint}"
+        )
+    stats = report["stats"]
+    logger.info(
+        f"{len(report['findings'])} findings in {stats['files']} files "
+        f"({stats['scanned']} scanned, {stats['cached']} cached) "
+        f"in {stats['seconds']}s"
+    )
+
+    if args.fail_on:
+        levels = ["high", "medium", "low"]
+        threshold = levels.index(args.fail_on)
+        if any(
+            levels.index(finding["priority"]) <= threshold
+            for finding in report["findings"]
+        ):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,23 @@
+import argparse
+import ast
+import hashlib
+import json
+import logging
 import os
+import subprocess
+import sys
+from collections import defaultdict
 from pathlib import Path
-import logging
-from typing import List, Dict
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CACHE_VERSION = 1
+# Below this many changed files a process pool costs more than it saves
+PARALLEL_THRESHOLD = 64
+
 REQUIRED_STRUCTURE = {
     "src/app": {
         "dirs": [
@@ -100,37 +111,251 @@ def verify_path(base_path: Path, structure: Dict) -> List[str]:
     return missing
 
 
-def verify_imports(file_path: Path) -> List[str]:
-    """Verify imports in a Python file use absolute paths"""
-    issues = []
+def module_name(src_dir: Path, file_path: Path) -> str:
+    """Dotted module name of a file under ``src``"""
+    parts = list(file_path.relative_to(src_dir).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def parse_file(src_dir: str, path: str) -> Dict[str, Any]:
+    """Hash and parse one file into its import statements"""
+    file_path = Path(path)
+    source = file_path.read_bytes()
+    result = {
+        "hash": hashlib.sha1(source).hexdigest(),
+        "lines": source.count(b"\n"),
+        "imports": [],
+        "error": None,
+    }
+    try:
+        tree = ast.parse(source, filename=path)
+    except SyntaxError as e:
+        result["error"] = f"{path}:{e.lineno} - Syntax error: {e.msg}"
+        return result
+
+    package = module_name(Path(src_dir), file_path)
+    if file_path.name != "__init__.py":
+        package = package.rpartition(".")[0]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                result["imports"].append([alias.name, node.lineno, 0, alias.name])
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                # Resolve against the importing package, as the interpreter would
+                anchor = package.split(".")
+                anchor = anchor[: len(anchor) - node.level + 1] if package else []
+                base = ".".join(filter(None, [*anchor, node.module or ""]))
+            text = "." * node.level + (node.module or "")
+            result["imports"].append([base, node.lineno, node.level, text])
+    return result
+
+
+class ImportIndex:
+    """Per-file parse results, reused across runs while files are unchanged
+
+    Entries are keyed by path and validated by mtime and size first, then by
+    content hash, so a warm run only stats the tree.
+    """
+
+    def __init__(self, src_dir: Path, cache_path: Optional[Path]):
+        self.src_dir = src_dir
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.parsed = 0
+        if cache_path and cache_path.exists():
+            try:
+                data = json.loads(cache_path.read_text())
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data["files"]
+            except (OSError, ValueError):
+                logger.warning(f"Ignoring unreadable cache {cache_path}")
+
+    def files(self) -> List[Path]:
+        found = []
+        for root, dirs, files in os.walk(self.src_dir):
+            dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith(".")]
+            found.extend(Path(root) / name for name in files if name.endswith(".py"))
+        return sorted(found)
+
+    def refresh(self, workers: Optional[int] = None) -> None:
+        fresh: Dict[str, Dict[str, Any]] = {}
+        stale: List[Tuple[str, Tuple[int, int]]] = []
+        for file_path in self.files():
+            key = str(file_path.relative_to(self.src_dir))
+            stat = file_path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            entry = self.entries.get(key)
+            if entry and tuple(entry["stamp"]) == stamp:
+                fresh[key] = entry
+                continue
+            if entry:
+                # Touched (checkout, formatter) but possibly not changed
+                digest = hashlib.sha1(file_path.read_bytes()).hexdigest()
+                if digest == entry["hash"]:
+                    fresh[key] = {**entry, "stamp": list(stamp)}
+                    continue
+            stale.append((key, stamp))
+
+        paths = [str(self.src_dir / key) for key, _ in stale]
+        src = [str(self.src_dir)] * len(paths)
+        if len(paths) >= PARALLEL_THRESHOLD and workers != 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(parse_file, src, paths, chunksize=16))
+        else:
+            results = list(map(parse_file, src, paths))
+        for (key, stamp), result in zip(stale, results):
+            result["stamp"] = list(stamp)
+            fresh[key] = result
+        self.parsed = len(results)
+        self.entries = fresh
 
-    if not file_path.exists() or not file_path.suffix == ".py":
-        return issues
-
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-
-    for i, line in enumerate(lines, 1):
-        if line.strip().startswith("from .") or line.strip().startswith("import ."):
-            issues.append(f"{file_path}:{i} - Relative import found: {line.strip()}")
-        elif line.strip().startswith("from") and not line.strip().startswith(
-            "from app."
-        ):
-            # Exclude standard library imports
-            if not any(
-                line.strip().startswith(f"from {lib}")
-                for lib in ["typing", "datetime", "pathlib", "logging", "os", "re"]
-            ):
+    def save(self) -> None:
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": CACHE_VERSION, "files": self.entries}
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        tmp.replace(self.cache_path)
+
+    def modules(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            module_name(self.src_dir, self.src_dir / key): entry
+            for key, entry in self.entries.items()
+        }
+
+
+def verify_imports(index: ImportIndex) -> List[str]:
+    """Flag relative imports and local packages imported without ``app.``"""
+    issues = []
+    local_roots = {
+        path.stem if path.suffix == ".py" else path.name
+        for path in (index.src_dir / "app").iterdir()
+        if path.suffix == ".py" or (path / "__init__.py").exists()
+    } - {"__init__"}
+    for key, entry in sorted(index.entries.items()):
+        file_path = index.src_dir / key
+        if entry["error"]:
+            issues.append(entry["error"])
+            continue
+        for _, lineno, level, text in entry["imports"]:
+            if level:
+                issues.append(f"{file_path}:{lineno} - Relative import found: {text}")
+            elif text.split(".")[0] in local_roots:
                 issues.append(
-                    f"{file_path}:{i} - Non-absolute import found: {line.strip()}"
+                    f"{file_path}:{lineno} - Non-absolute import found: {text}"
                 )
-
     return issues
 
 
+def import_graph(modules: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Internal module -> internal modules it imports"""
+    graph = {}
+    for name, entry in modules.items():
+        targets: Set[str] = set()
+        for base, _, _, _ in entry["imports"]:
+            # "from app.core import config" may name a submodule or an attribute
+            while base and base not in modules:
+                base = base.rpartition(".")[0]
+            if base and base != name:
+                targets.add(base)
+        graph[name] = sorted(targets)
+    return graph
+
+
+def hotspots(
+    graph: Dict[str, List[str]], modules: Dict[str, Dict[str, Any]], limit: int
+) -> List[Dict[str, Any]]:
+    """Modules whose import drags in the most internal code"""
+    fan_in: Dict[str, int] = defaultdict(int)
+    for targets in graph.values():
+        for target in targets:
+            fan_in[target] += 1
+    closure: Dict[str, Set[str]] = {}
+
+    def reach(name: str, stack: Set[str]) -> Set[str]:
+        if name in closure:
+            return closure[name]
+        stack.add(name)
+        seen = set(graph.get(name, ()))
+        for target in graph.get(name, ()):
+            if target not in stack:
+                seen |= reach(target, stack)
+        stack.discard(name)
+        # Members of an import cycle see a partial closure; good enough to rank
+        closure[name] = seen
+        return seen
+
+    rows = []
+    for name in graph:
+        pulled = reach(name, set())
+        rows.append(
+            {
+                "module": name,
+                "transitive_modules": len(pulled),
+                "transitive_lines": sum(modules[m]["lines"] for m in pulled),
+                "fan_in": fan_in[name],
+            }
+        )
+    rows.sort(key=lambda row: (row["transitive_lines"], row["fan_in"]), reverse=True)
+    return rows[:limit]
+
+
+def measure_import_time(src_dir: Path, module: str) -> List[Dict[str, Any]]:
+    """Real per-module import cost from ``python -X importtime``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=src_dir,
+        env={**os.environ, "PYTHONPATH": str(src_dir)},
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append(
+            {
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    if result.returncode:
+        logger.warning(f"Importing {module} failed; timings are partial")
+    return sorted(rows, key=lambda row: row["self_us"], reverse=True)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Verify backend structure")
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(__file__).resolve().parents[2] / "backend",
+        help="Backend directory (default: the repository's backend/)",
+    )
+    parser.add_argument("--graph", type=Path, help="Write the import graph as JSON")
+    parser.add_argument("--top", type=int, default=15, help="Hotspots to report")
+    parser.add_argument(
+        "--importtime",
+        metavar="MODULE",
+        help="Also measure real import cost of MODULE (e.g. app.main)",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
     # Get backend directory
-    backend_dir = Path(__file__).parent.parent
+    backend_dir = args.root.resolve()
+    src_dir = backend_dir / "src"
+    cache_path = None if args.no_cache else backend_dir / ".cache" / "structure.json"
 
     # Track all issues
     all_issues = []
@@ -144,12 +369,27 @@ def main():
 
     # Verify imports in Python files
     logger.info("Verifying imports...")
-    for root, _, files in os.walk(backend_dir / "src"):
-        for file in files:
-            if file.endswith(".py"):
-                file_path = Path(root) / file
-                import_issues = verify_imports(file_path)
-                all_issues.extend(import_issues)
+    index = ImportIndex(src_dir, cache_path)
+    index.refresh(args.workers)
+    index.save()
+    logger.info(f"Parsed {index.parsed} of {len(index.entries)} files")
+    all_issues.extend(verify_imports(index))
+
+    if args.graph:
+        modules = index.modules()
+        graph = import_graph(modules)
+        report = {"graph": graph, "hotspots": hotspots(graph, modules, args.top)}
+        if args.importtime:
+            report["import_time"] = measure_import_time(src_dir, args.importtime)[
+                : args.top
+            ]
+        args.graph.write_text(json.dumps(report, indent=2))
+        logger.info(f"Import graph written to {args.graph}")
+        for row in report["hotspots"]:
+            logger.info(
+                f"{row['module']}: {row['transitive_modules']} modules, "
+                f"{row['transitive_lines']} lines, imported by {row['fan_in']}"
+            )
 
     # Report results
     if all_issues: